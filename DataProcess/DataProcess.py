@@ -36,6 +36,33 @@ from Utilities.config import ConfigParser
 import warnings
 warnings.filterwarnings("ignore", category=RuntimeWarning)
 
+# Name of the binary file holding all derived parameters, and the
+# order of the columns within it:
+PROCESS_STORE = 'process.npy'
+PROCESS_FIELDS = ('lon', 'lat', 'lsflag', 'index',
+                  'bearing', 'bearingRate', 'speed', 'speedRate',
+                  'pressure', 'pressureRate', 'vmax',
+                  'rmax', 'rmaxRate')
+
+
+def loadProcessStore(processPath):
+    """
+    Memory-map the binary store of derived parameters written by
+    :meth:`DataProcess.processData`.
+
+    :param str processPath: Path to the process directory.
+
+    :returns: :class:`dict` of read-only 1-d arrays, keyed by the
+              names in :data:`PROCESS_FIELDS`, or ``None`` if the store
+              does not exist.
+
+    """
+    storeFile = pjoin(processPath, PROCESS_STORE)
+    if not os.path.isfile(storeFile):
+        return None
+    data = np.load(storeFile, mmap_mode='r')
+    return dict((name, data[:, i]) for i, name in enumerate(PROCESS_FIELDS))
+
 
 class DataProcess(object):
     """
@@ -53,14 +80,15 @@ class DataProcess(object):
                         STDOUT
 
     Internal Methods:
-    _lonLat(lon, lat, indicator) Extract longitudes and latitudes
-    _bearing(bear, indicator) Extract bearings
-    _speed(dist, dt, indicator) Extract speeds
-    _pressure(pressure, indicator) Extract pressures
-    _pressureRate(pressure, dt, indicator) Extract rate of presssure change
-    _speedRate(dist, dt, indicator) Extract the acceleration (rate of change of speed)
-    _bearingChange(bear, dt, indicator) Extract the rate of change of bearing
-    _windSpeed(vmax, indicator) Extract the maximum sustained wind speed
+    _deriveParameters(indicator, lon, lat, dt, pressure, vmax, rmax)
+        Calculate all parameters and their rates of change
+    _saveProcessStore(params) Save derived parameters to a binary file
+    _lonLat(params, indicator, initIndex) Extract longitudes and latitudes
+    _bearing(params, indicator, initIndex) Extract bearings and bearing rates
+    _speed(params, indicator, initIndex) Extract speeds and accelerations
+    _pressure(params, indicator) Extract pressures and pressure rates
+    _windSpeed(params) Extract the maximum sustained wind speed
+    _rmax(params, indicator) Extract radii to maximum wind and size rates
     
     """
 
@@ -292,23 +320,18 @@ class DataProcess(object):
         #assert vmax.size == indicator.size
 
         try:
-            rmax = np.array(inputData['rmax'])
+            rmax = np.array(inputData['rmax'], 'd')
+        except (ValueError, KeyError):
+            self.logger.warning("No rmax data available")
+            rmax = None
+        else:
             novalue_index = np.where(rmax == sys.maxint)
             rmax = metutils.convert(rmax, inputLengthUnits, "km")
             rmax[novalue_index] = sys.maxint
 
-            self._rmax(rmax, indicator)
-            self._rmaxRate(rmax, dt, indicator)
-        except (ValueError, KeyError):
-            self.logger.warning("No rmax data available")
-
         if self.ncflag:
             self.data['index'] = indicator
 
-        # ieast : parameter used in latLon2Azi
-        # FIXME: should be a config setting describing the input data.
-        ieast = 1
-
         # Determine the index of initial cyclone observations, excluding
         # those cyclones that have only one observation. This is used
         # for calculating initial bearing and speed
@@ -316,26 +339,20 @@ class DataProcess(object):
         initIndex = np.concatenate([np.where(np.diff(indicator2) ==
                                              -1, 1, 0), [0]])
 
-        # Calculate the bearing and distance (km) of every two
-        # consecutive records using ll2azi
-        bear_, dist_ = maputils.latLon2Azi(lat, lon, ieast, azimuth=0)
-        assert bear_.size == indicator.size - 1
-        assert dist_.size == indicator.size - 1
-        bear = np.empty(indicator.size, 'f')
-        bear[1:] = bear_
-        dist = np.empty(indicator.size, 'f')
-        dist[1:] = dist_
+        params = self._deriveParameters(indicator, lon, lat, dt,
+                                        pressure, vmax, rmax)
+        self._saveProcessStore(params)
 
-        self._lonLat(lon, lat, indicator, initIndex)
-        self._bearing(bear, indicator, initIndex)
-        self._bearingRate(bear, dt, indicator)
         if self.progressbar is not None:
             self.progressbar.update(0.375)
-        self._speed(dist, dt, indicator, initIndex)
-        self._speedRate(dist, dt, indicator)
-        self._pressure(pressure, indicator)
-        self._pressureRate(pressure, dt, indicator)
-        self._windSpeed(vmax)
+
+        self._lonLat(params, indicator, initIndex)
+        self._bearing(params, indicator, initIndex)
+        self._speed(params, indicator, initIndex)
+        self._pressure(params, indicator)
+        self._windSpeed(params)
+        if rmax is not None:
+            self._rmax(params, indicator)
 
         try:
             self._frequency(year, indicator)
@@ -347,14 +364,155 @@ class DataProcess(object):
         if self.progressbar is not None:
             self.progressbar.update(0.5)
 
-    def _lonLat(self, lon, lat, indicator, initIndex):
+    def _deriveParameters(self, indicator, lon, lat, dt, pressure,
+                          vmax, rmax=None):
+        """
+        Calculate all per-observation parameters and their rates of
+        change in a single pass over the input records.
+
+        Bearings, distances, speeds and the masks identifying the
+        first and second observations of each TC are evaluated once
+        and shared between all parameters. Undefined or non-physical
+        values are set to maxint.
+
+        :param indicator: array of ones/zeros representing initial TC
+                          observations (including TCs with a single
+                          observation)
+        :param lon: array of TC longitudes
+        :param lat: array of TC latitudes
+        :param dt: array of times between consecutive TC observations
+        :param pressure: array of central pressure observations (hPa)
+        :param vmax: array of maximum wind speed observations (m/s)
+        :param rmax: array of radii to maximum wind (km), or ``None``
+                     if not available in the input data
+
+        :returns: 2-d :class:`numpy.ndarray` of the parameters, with
+                  columns ordered as in :data:`PROCESS_FIELDS`
+
+        """
+        self.logger.info('Deriving track parameters')
+        nobs = indicator.size
+        params = np.empty((nobs, len(PROCESS_FIELDS)), 'd')
+        col = dict((name, params[:, i])
+                   for i, name in enumerate(PROCESS_FIELDS))
+
+        initMask = indicator.astype(bool)
+        secondMask = np.zeros(nobs, bool)
+        secondMask[1:] = initMask[:-1]
+
+        col['lon'][:] = lon
+        col['lat'][:] = lat
+        col['lsflag'][:] = self.landmask.sampleGrid(lon, lat) > 0
+        col['index'][:] = indicator
+
+        # Calculate the bearing and distance (km) of every two
+        # consecutive records using ll2azi
+        # ieast : parameter used in latLon2Azi
+        # FIXME: should be a config setting describing the input data.
+        ieast = 1
+        bear_, dist_ = maputils.latLon2Azi(lat, lon, ieast, azimuth=0)
+        assert bear_.size == nobs - 1
+        assert dist_.size == nobs - 1
+
+        bear = col['bearing']
+        bear[0] = sys.maxint
+        bear[1:] = bear_
+        np.putmask(bear, initMask, sys.maxint)
+
+        bearingChange = np.empty(nobs, 'd')
+        bearingChange[1:] = np.diff(bear)
+        bearingChange[bearingChange > 180.] -= 360.
+        bearingChange[bearingChange < -180.] += 360.
+        bearingRate = col['bearingRate']
+        bearingRate[:] = bearingChange / dt
+        np.putmask(bearingRate, initMask | secondMask |
+                   (np.abs(bearingRate) >= sys.maxint) |
+                   np.isnan(bearingRate), sys.maxint)
+
+        # Speeds are undefined for initial observations, and
+        # rejected if outside 0-200 km/h:
+        rawSpeed = np.empty(nobs, 'd')
+        rawSpeed[0] = 0.
+        rawSpeed[1:] = dist_
+        rawSpeed /= dt
+        badSpeed = (rawSpeed < 0) | (rawSpeed > 200)
+
+        speed = col['speed']
+        speed[:] = rawSpeed
+        np.putmask(speed, badSpeed | initMask | np.isnan(speed),
+                   sys.maxint)
+
+        speedInvalid = initMask | badSpeed
+        speedChange = np.empty(nobs, 'd')
+        speedChange[1:] = np.diff(rawSpeed)
+        speedRate = col['speedRate']
+        speedRate[:] = speedChange / dt
+        speedInvalid[1:] |= speedInvalid[:-1].copy()
+        np.putmask(speedRate, speedInvalid |
+                   (np.abs(speedRate) >= sys.maxint) |
+                   np.isnan(speedRate), sys.maxint)
+
+        # Mask pressure rates corresponding to initial times, times when
+        # the pressure is known to be missing, and when the
+        # pressure rate is greater than 10 hPa/hour (a sanity check).
+        # The highest rate of intensification on record is
+        # Typhoon Forrest (Sept 1983) 100 mb in 24 hrs.
+        col['pressure'][:] = pressure
+        pressureRate = col['pressureRate']
+        pressureRate[0] = sys.maxint
+        pressureRate[1:] = np.diff(pressure)
+        pressureRate /= dt
+        np.putmask(pressureRate, initMask | (pressure >= sys.maxint) |
+                   np.isnan(pressureRate) | (np.abs(pressureRate) > 10),
+                   sys.maxint)
+
+        col['vmax'][:] = vmax
+        np.putmask(col['vmax'], col['vmax'] > 200., sys.maxint)
+
+        if rmax is None:
+            col['rmax'][:] = sys.maxint
+            col['rmaxRate'][:] = sys.maxint
+        else:
+            col['rmax'][:] = rmax
+            rmaxRate = col['rmaxRate']
+            rmaxRate[0] = sys.maxint
+            rmaxRate[1:] = np.diff(rmax)
+            rmaxRate /= dt
+            np.putmask(rmaxRate, initMask | (rmax >= sys.maxint) |
+                       (np.abs(rmaxRate) >= sys.maxint) |
+                       np.isnan(rmaxRate), sys.maxint)
+
+        return params
+
+    def _saveProcessStore(self, params):
+        """
+        Save the derived parameters to a binary file in the process
+        directory. The file can be memory-mapped by later stages
+        through :func:`loadProcessStore`.
+
+        The longitudes and latitudes are rounded as in the text files,
+        so the statistics assign the observations to the same cells
+        whichever is read.
+
+        :param params: 2-d :class:`numpy.ndarray` of parameters
+                       returned by :meth:`_deriveParameters`
+
+        """
+        storeFile = pjoin(self.processPath, PROCESS_STORE)
+        self.logger.debug('Outputting data into %s' % storeFile)
+        params = params.copy()
+        for name in ('lon', 'lat'):
+            i = PROCESS_FIELDS.index(name)
+            params[:, i] = np.char.mod('%6.2f', params[:, i]).astype(float)
+        np.save(storeFile, params)
+
+    def _lonLat(self, params, indicator, initIndex):
         """
         Extract longitudes and latitudes for all obs, initial obs, TC
-        origins and determine a land/sea flag indicating if the TC
+        origins and the land/sea flag indicating if the TC
         position is over land or sea.
 
-        Input: lon - array of TC longitudes
-               lat - array of TC latitudes
+        Input: params - array of derived parameters
                indicator - array of ones/zeros representing initial TC
                            observations, including TCs with a single
                            observation
@@ -367,10 +525,9 @@ class DataProcess(object):
         """
 
         self.logger.info('Extracting longitudes and latitudes')
-        lsflag = np.zeros(len(lon))
-        for i, [x, y] in enumerate(zip(lon, lat)):
-            if self.landmask.sampleGrid(x, y) > 0:
-                lsflag[i] = 1
+        lon = params[:, PROCESS_FIELDS.index('lon')]
+        lat = params[:, PROCESS_FIELDS.index('lat')]
+        lsflag = params[:, PROCESS_FIELDS.index('lsflag')]
 
         lonOne = lon.compress(indicator)
         latOne = lat.compress(indicator)
@@ -412,10 +569,11 @@ class DataProcess(object):
                        np.transpose([indicator, lon, lat, lsflag]),
                        header, ',', fmt='%6.2f')
 
-    def _bearing(self, bear, indicator, initIndex):
+    def _bearing(self, params, indicator, initIndex):
         """
-        Extract bearings for all obs, initial obs and TC origins
-        Input: bear - array of bearing of TC observations
+        Extract bearings for all obs, initial obs and TC origins, and
+        the rate of bearing change.
+        Input: params - array of derived parameters
                indicator - array of ones/zeros representing initial TC
                            observations (including TCs with a single
                            observation)
@@ -426,9 +584,8 @@ class DataProcess(object):
         """
 
         self.logger.info('Extracting bearings')
-
-        # extract all bearings
-        np.putmask(bear, indicator, sys.maxint)
+        bear = params[:, PROCESS_FIELDS.index('bearing')]
+        bearingRate = params[:, PROCESS_FIELDS.index('bearingRate')]
 
         # extract initial bearings
         initBearingIndex = np.flatnonzero(initIndex[:-1]) + 1
@@ -443,6 +600,7 @@ class DataProcess(object):
             self.data['bearing'] = bear
             self.data['init_bearing'] = initBearing
             self.data['bearing_no_init'] = bearingNoInit
+            self.data['bearingRate'] = bearingRate
         else:
             all_bearing = pjoin(self.processPath, 'all_bearing')
             self.logger.debug('Outputting data into %s' % all_bearing)
@@ -458,12 +616,16 @@ class DataProcess(object):
             header = 'cyclone bearings without initial ones in degrees'
             flSaveFile(bearing_no_init, bearingNoInit, header, fmt='%6.2f')
 
-    def _speed(self, dist, dt, indicator, initIndex):
+            bearing_rate = pjoin(self.processPath, 'bearing_rate')
+            self.logger.debug('Outputting data into %s' % bearing_rate)
+            header = 'All bearing change rates (degrees/hr)'
+            flSaveFile(bearing_rate, bearingRate, header, fmt='%6.2f')
+
+    def _speed(self, params, indicator, initIndex):
         """
-        Extract speeds for all obs, initial obs and TC origins
-        Input: dist - array of distances between consecutive TC
-                      observations
-               dt - array of times between consecutive TC observations
+        Extract speeds for all obs, initial obs and TC origins, and
+        the rate of speed change.
+        Input: params - array of derived parameters
                indicator - array of ones/zeros representing initial TC
                            observations (including TCs with a single
                            observation)
@@ -473,12 +635,8 @@ class DataProcess(object):
         Output: None - data is written to file
         """
         self.logger.info('Extracting speeds')
-        speed = dist / dt
-        # Delete speeds less than 0, greated than 200,
-        # or where indicator == 1.
-        np.putmask(speed, (speed < 0) | (speed > 200) | indicator,
-                   sys.maxint)
-        np.putmask(speed, np.isnan(speed), sys.maxint)
+        speed = params[:, PROCESS_FIELDS.index('speed')]
+        speedRate = params[:, PROCESS_FIELDS.index('speedRate')]
 
         initSpeedIndex = np.flatnonzero(initIndex[:-1]) + 1
         initSpeed = speed.take(initSpeedIndex)
@@ -490,6 +648,7 @@ class DataProcess(object):
             self.data['speed'] = speed
             self.data['init_speed'] = initSpeed
             self.data['speed_no_init'] = speedNoInit
+            self.data['speedRate'] = speedRate
         else:
             init_speed = pjoin(self.processPath, 'init_speed')
             all_speed = pjoin(self.processPath, 'all_speed')
@@ -509,19 +668,24 @@ class DataProcess(object):
             header = 'cyclone speed without initial ones in km/hour'
             flSaveFile(speed_no_init, speedNoInit, header, fmt='%6.2f')
 
-    def _pressure(self, pressure, indicator):
-        """Extract pressure for all obs, initial obs and TC origins
-        Input: pressure - array of central pressure observations for TC
-                          observations
+            speed_rate = pjoin(self.processPath, 'speed_rate')
+            self.logger.debug('Outputting data into %s' % speed_rate)
+            header = 'All speed change rates (km/hr/hr)'
+            flSaveFile(speed_rate, speedRate, header, fmt='%6.2f')
+
+    def _pressure(self, params, indicator):
+        """Extract pressure for all obs, initial obs and TC origins, and
+        the rate of pressure change.
+        Input: params - array of derived parameters
                indicator - array of ones/zeros representing initial TC
                            observations (including TCs with a single
                            observation)
-               initIndex - array of ones/zeros representing initial TC
-                           observations (excluding TCs with a single
-                           observation)
         Output: None - data is written to file
         """
         self.logger.info('Extracting pressures')
+        pressure = params[:, PROCESS_FIELDS.index('pressure')]
+        pressureRate = params[:, PROCESS_FIELDS.index('pressureRate')]
+
         initPressure = pressure.compress(indicator)
         pressureNoInit = pressure.compress(indicator == 0)
         pressureNoInit = pressureNoInit.compress(pressureNoInit < sys.maxint)
@@ -530,6 +694,7 @@ class DataProcess(object):
             self.data['pressure'] = pressure
             self.data['init_pressure'] = initPressure
             self.data['pressure_no_init'] = pressureNoInit
+            self.data['pressureRate'] = pressureRate
         else:
             init_pressure = pjoin(self.processPath, 'init_pressure')
             all_pressure = pjoin(self.processPath, 'all_pressure')
@@ -549,143 +714,19 @@ class DataProcess(object):
             header = 'cyclone pressure without initial ones in hPa'
             flSaveFile(pressure_no_init, pressureNoInit, header, fmt='%7.2f')
 
-    def _pressureRate(self, pressure, dt, indicator):
-        """Extract the rate of pressure change from the pressure values.
-
-        Entries corresponding to initial cyclone reports are set to
-        maxint, as the change in pressure from the previous observation
-        is undefined. Entries corresponding to records with no pressure
-        observation are also set to maxint.
-        Input: pressure - array of central pressure observations for TC
-               observations
-               dt - array of times between consecutive TC observations
-               indicator - array of ones/zeros representing initial TC
-                           observations (including TCs with a single
-                           observation)
-        Output: None - data is written to file
-        """
-        self.logger.info('Extracting the rate of pressure change')
-
-        # Change in pressure:
-        pressureChange_ = np.diff(pressure)
-        pressureChange = np.empty(indicator.size, 'f')
-        pressureChange[1:] = pressureChange_
-
-        # Rate of pressure change:
-        pressureRate = pressureChange / dt
-
-        # Mask rates corresponding to initial times, times when
-        # the pressure is known to be missing, and when the
-        # pressure rate is greater than 10 hPa/hour (a sanity check).
-        # The highest rate of intensification on record is
-        # Typhoon Forrest (Sept 1983) 100 mb in 24 hrs.
-
-        np.putmask(pressureRate, indicator, sys.maxint)
-        np.putmask(pressureRate, pressure >= sys.maxint, sys.maxint)
-        np.putmask(pressureRate, np.isnan(pressureRate), sys.maxint)
-        np.putmask(pressureRate, np.abs(pressureRate) > 10, sys.maxint)
-
-        if self.ncflag:
-            self.data['pressureRate'] = pressureRate
-        else:
             pressure_rate = pjoin(self.processPath, 'pressure_rate')
             self.logger.debug('Outputting data into %s' % pressure_rate)
             header = 'All pressure change rates (hPa/hr)'
             flSaveFile(pressure_rate, pressureRate, header, fmt='%6.2f')
 
-    def _bearingRate(self, bear, dt, indicator):
-        """Extract the rate of bearing change for each cyclone:
-        Entries corresponding to initial position reports and the
-        second observation are set to maxint. The first entry is set
-        to maxint as there is no bearing associated with it and the
-        second entry is therefore non-sensical.
-        Input: bear - array of bearings between consecutive TC
-                      observations
-               dt - array of times between consecutive TC observations
-               indicator - array of ones/zeros representing initial TC
-                           observations (including TCs with a single
-                           observation)
-        Output: None - data is written to file
-        """
-        self.logger.info('Extracting the rate of bearing change')
-
-        bearingChange_ = np.diff(bear)
-        ii = np.where((bearingChange_ > 180.))
-        jj = np.where((bearingChange_ < -180.))
-        bearingChange_[ii] -= 360.
-        bearingChange_[jj] += 360.
-        bearingChange = np.empty(indicator.size, 'd')
-        bearingChange[1:] = bearingChange_
-
-        bearingRate = bearingChange / dt
-
-        np.putmask(bearingRate, indicator, sys.maxint)
-        np.putmask(bearingRate[1:], indicator[:-1], sys.maxint)
-        np.putmask(bearingRate, (bearingRate >= sys.maxint) |
-                   (bearingRate <= -sys.maxint),
-                   sys.maxint)
-
-        np.putmask(bearingRate, np.isnan(bearingRate), sys.maxint)
-
-        if self.ncflag:
-            self.data['bearingRate'] = bearingRate
-        else:
-            bearing_rate = pjoin(self.processPath, 'bearing_rate')
-            self.logger.debug('Outputting data into %s' % bearing_rate)
-            header = 'All bearing change rates (degrees/hr)'
-            flSaveFile(bearing_rate, bearingRate, header, fmt='%6.2f')
-
-    def _speedRate(self, dist, dt, indicator):
-        """Extract the rate of speed change for each cyclone:
-        Note this results in some odd values for the accelerations,
-        propagated from odd position reports. Entries corresponding to
-        initial position reports and the second observation are set to
-        maxint. The first entry is set to maxint as there is no speed
-        associated with it and the second is therefore non-sensical.
-        Input: dist - array of distances between consecutive TC
-                      observations
-               dt - array of times between consecutive TC observations
-               indicator - array of ones/zeros representing initial TC
-                           observations (including TCs with a single
-                           observation)
-        Output: None - data is written to file
-        """
-        self.logger.info(
-            'Extracting the rate of speed change for each cyclone')
-
-        speed = dist / dt
-        speedChange_ = np.diff(speed)
-        speedChange = np.empty(indicator.size, 'd')
-        speedChange[1:] = speedChange_
-
-        indicator_ = indicator.copy()
-        np.putmask(indicator_, (speed < 0) | (speed > 200), 1)
-
-        speedRate = speedChange / dt
-
-        np.putmask(speedRate, indicator_, sys.maxint)
-        np.putmask(speedRate[1:], indicator_[:-1], sys.maxint)
-        np.putmask(speedRate, (speedRate >= sys.maxint) |
-                   (speedRate <= -sys.maxint), sys.maxint)
-
-        np.putmask(speedRate, np.isnan(speedRate), sys.maxint)
-
-        if self.ncflag:
-            self.data['speedRate'] = speedRate
-        else:
-            speed_rate = pjoin(self.processPath, 'speed_rate')
-            self.logger.debug('Outputting data into %s' % speed_rate)
-            header = 'All speed change rates (km/hr/hr)'
-            flSaveFile(speed_rate, speedRate, header, fmt='%6.2f')
-
-    def _windSpeed(self, windSpeed):
+    def _windSpeed(self, params):
         """Extract maximum sustained wind speeds
-        Input: windSpeed - array of windspeeds for TC observations
+        Input: params - array of derived parameters
 
         Output: None - data is written to file
         """
         self.logger.info('Extracting maximum sustained wind speeds')
-        np.putmask(windSpeed, windSpeed > 200., sys.maxint)
+        windSpeed = params[:, PROCESS_FIELDS.index('vmax')]
         if self.ncflag:
             self.data['windspeed'] = windSpeed
         else:
@@ -694,16 +735,18 @@ class DataProcess(object):
             header = 'Maximum wind speed (m/s)'
             flSaveFile(wind_speed, windSpeed, header, fmt='%6.2f')
 
-    def _rmax(self, rmax, indicator):
-        """Extract radii to maximum wind:
-        Input: rmax - array of radii to maximum winds for TC
-                      observations
+    def _rmax(self, params, indicator):
+        """Extract radii to maximum wind, and the rate of size change.
+        Input: params - array of derived parameters
                indicator - array of ones/zeros representing initial TC
                            observations (including TCs with a single
                            observation)
         Output: None - data is written to file
         """
         self.logger.info("Extracting radii to maximum winds")
+        rmax = params[:, PROCESS_FIELDS.index('rmax')]
+        rmaxRate = params[:, PROCESS_FIELDS.index('rmaxRate')]
+
         initrmax = rmax.compress(indicator)
         rmaxNoInit = rmax.compress(indicator == 0)
         rmaxNoInit = rmaxNoInit.compress(rmaxNoInit < sys.maxint)
@@ -711,6 +754,7 @@ class DataProcess(object):
             self.data['rmax'] = rmax
             self.data['init_rmax'] = initrmax
             self.data['rmax_no_init'] = rmaxNoInit
+            self.data['rmaxRate'] = rmaxRate
         else:
             init_rmax = pjoin(self.processPath, 'init_rmax')
             all_rmax = pjoin(self.processPath, 'all_rmax')
@@ -730,46 +774,8 @@ class DataProcess(object):
             header = 'rmax excluding initial ones (km)'
             flSaveFile(rmax_no_init, rmaxNoInit, header, fmt='%6.2f')
 
-    def _rmaxRate(self, rmax, dt, indicator):
-        """Extract the rate of size change from the rmax values.
-
-        Entries corresponding to initial cyclone reports are set to
-        maxint, as the change in rmax from the previous observation is
-        undefined. Entries corresponding to records with no rmax
-        observation are also set to maxint.
-        Input: rmax - array of radii to maximum winds for TC
-                      observations
-               dt - array of times between consecutive TC observations
-               indicator - array of ones/zeros representing initial TC
-                           observations (including TCs with a single
-                           observation)
-        Output: None - data is written to file
-        
-        """
-        self.logger.info('Extracting the rate of size change')
-
-        # Change in rmax:
-        rmaxChange_ = np.diff(rmax)
-        rmaxChange = np.empty(indicator.size, 'f')
-        rmaxChange[1:] = rmaxChange_
-
-        # Rate of rmax change:
-        rmaxRate = rmaxChange / dt
-
-        # Mask rates corresponding to initial times and times when
-        # the rmax is known to be missing.
-        self.logger.debug('Outputting data into %s' %
-                          pjoin(self.processPath, 'rmax_rate'))
-        np.putmask(rmaxRate, indicator, sys.maxint)
-        np.putmask(rmaxRate, rmax >= sys.maxint, sys.maxint)
-        np.putmask(rmaxRate, (rmaxRate >= sys.maxint) |
-                   (rmaxRate <= -sys.maxint), sys.maxint)
-        np.putmask(rmaxRate, np.isnan(rmaxRate), sys.maxint)
-
-        if self.ncflag:
-            self.data['rmaxRate'] = rmaxRate
-        else:
             rmax_rate = pjoin(self.processPath, 'rmax_rate')
+            self.logger.debug('Outputting data into %s' % rmax_rate)
             header = 'All rmax change rates (km/hr)'
             flSaveFile(rmax_rate, rmaxRate, header, fmt='%6.2f')
 
@@ -807,9 +813,7 @@ class DataProcess(object):
         # Do a bodgy job of addressing 29th of February (there surely
         # must be a recommended way of accounting for leap years)
 
-        for i in range(len(jdays)):
-            if (years[i] % 4 == 0) and (jdays[i] >= 60):
-                jdays[i] -= 1
+        jdays[(years % 4 == 0) & (jdays >= 60)] -= 1
 
         bins = np.arange(1, 367)
         n, b = np.histogram(jdays.compress(indicator), bins)
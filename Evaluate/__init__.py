@@ -9,12 +9,6 @@
 
 """
 
-from pressureDistribution import PressureDistribution
-from trackDensity import TrackDensity
-from longitudeCrossing import LongitudeCrossing
-from landfallRates import LandfallRates
-from genesisDensity import GenesisDensity
-
 
 def run(configFile):
     """
@@ -24,6 +18,14 @@ def run(configFile):
     :param str configFile: path to the configuration file.
 
     """
+
+    # The evaluation modules need Basemap and matplotlib, so they are
+    # only imported when the evaluation is run
+    from pressureDistribution import PressureDistribution
+    from trackDensity import TrackDensity
+    from longitudeCrossing import LongitudeCrossing
+    from landfallRates import LandfallRates
+    from genesisDensity import GenesisDensity
     
     PD = PressureDistribution(configFile)
     TD = TrackDensity(configFile)
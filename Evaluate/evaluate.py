@@ -42,6 +42,7 @@ import interpolateTracks
 from Utilities.files import flConfigFile, flStartLog
 from Utilities.config import cnfGetIniValue, ConfigParser
 from Utilities.loadData import loadTrackFile
+from Utilities.track import TrackCollection
 from Utilities.nctools import ncSaveGrid
 from Utilities.metutils import convert
 from Utilities.maputils import bearing2theta
@@ -237,41 +238,6 @@ def plotDensity(x, y, data, llLon=None, llLat=None, urLon=None, urLat=None,
     return
 
 
-class Track(object):
-
-    """
-    A single tropical cyclone track.
-
-    The object exposes the track data through the object attributes.
-    For example, If `data` contains the tropical cyclone track data
-    (`numpy.array`) loaded with the :meth:`readTrackData` function,
-    then the central pressure column can be printed out with the
-    code::
-
-        t = Track(data)
-        print(t.CentralPressure)
-
-
-    :type  data: numpy.ndarray
-    :param data: the tropical cyclone track data.
-    """
-
-    def __init__(self, data):
-        self.data = data
-        self.trackId = None
-        self.trackfile = None
-
-    def __getattr__(self, key):
-        """
-        Get the `key` from the `data` object.
-
-        :type  key: str
-        :param key: the key to lookup in the `data` object.
-        """
-        if key.startswith('__') and key.endswith('__'):
-            return super(Track, self).__getattr__(key)
-        return self.data[key]
-
 class gridCell(object):
     def __init__(self, xmin, ymin, xmax, ymax, number, index):
         self.xmin = xmin
@@ -308,45 +274,19 @@ def readTrackData(trackfile):
                         'names': TRACKFILE_COLS,
                         'formats': TRACKFILE_FMTS})
 
-def readMultipleTrackData(trackfile):
-    """
-    Reads all the track datas from a .csv file into a list of numpy.ndarrays.
-    The tracks are seperated based in their cyclone id. This function calls
-    `readTrackData` to read the data from the file.
-
-    :type  trackfile: str
-    :param trackfile: the track data filename.
-    """
-    datas = []
-    data = readTrackData(trackfile)
-    if len(data) > 0:
-        cycloneId = data['CycloneNumber']
-        for i in range(1, np.max(cycloneId) + 1):
-            datas.append(data[cycloneId == i])
-    else:
-        datas.append(data)
-    return datas
-
 def loadTracks(trackfile):
     """
     Read tracks from a track .csv file and return a list of :class:`Track`
     objects.
 
-    This calls the function `readMultipleTrackData` to parse the track .csv
+    This calls the function `readTrackData` to parse the track .csv
     file.
 
     :type  trackfile: str
     :param trackfile: the track data filename.
     """
-    tracks = []
-    datas = readMultipleTrackData(trackfile)
-    n = len(datas)
-    for i, data in enumerate(datas):
-        track = Track(data)
-        track.trackfile = trackfile
-        track.trackId = (i, n)
-        tracks.append(track)
-    return tracks
+    return list(TrackCollection.fromCycloneNumbers(readTrackData(trackfile),
+                                                   trackfile))
 
 def loadTracksFromPath(path):
     """
@@ -7,6 +7,7 @@ from scipy.interpolate import interp1d, splev, splrep
 
 from Utilities.maputils import latLon2Azi
 from Utilities.loadData import loadTrackFile
+from Utilities.track import Track
 
 
 TRACKFILE_COLS = ('Indicator', 'CycloneNumber', 'Year', 'Month', 
@@ -31,18 +32,6 @@ OUTPUT_COLS = ('CycloneNumber', 'Datetime', 'TimeElapsed', 'Longitude',
 
 OUTPUT_FMTS = '%i,%s,%7.3f,%8.3f,%8.3f,%6.2f,%6.2f,%7.2f,%7.2f,%6.2f'
 
-class Track(object):
-    def __init__(self, data):
-        self.data = data
-        self.trackId = None
-        self.trackfile = None
-
-    def __getattr__(self, key):
-        if key.startswith('__') and key.endswith('__'):
-            return super(Track, self).__getattr__(key)
-        return self.data[key] 
-
-
 def interpolate(track, delta, interpolation_type=None):
     """
     Interpolate the records in time to have a uniform time difference between
@@ -88,7 +77,7 @@ def interpolate(track, delta, interpolation_type=None):
     # FIXME: Need to address the issue when the time between obs is less 
     # than delta (e.g. only two obs 5 hrs apart, but delta = 6 hrs). 
 
-    if len(track.data) <= 2:
+    if len(track) <= 2:
         # Use linear interpolation only (only a start and end point given):
         nLon = interp1d(timestep, track.Longitude, kind='linear')(newtime)
         nLat = interp1d(timestep, track.Latitude, kind='linear')(newtime)
@@ -274,7 +263,7 @@ def parseTracks(configFile, trackFile, source, delta, outputFile=None,
     results = []
 
     for track in tracks:
-        if len(track.data) == 1:
+        if len(track) == 1:
             results.append(track)
         else:
             newtrack = interpolate(track, delta, interpolation_type)
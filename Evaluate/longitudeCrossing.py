@@ -31,7 +31,7 @@ import interpolateTracks
 from Utilities.config import ConfigParser
 from Utilities.metutils import convert
 from Utilities.maputils import bearing2theta
-from Utilities.track import Track
+from Utilities.track import TrackCollection
 from Utilities.nctools import ncSaveGrid
 from Utilities.files import flProgramVersion
 from Utilities.parallel import attemptParallel, disableOnWorkers
@@ -88,45 +88,19 @@ def readTrackData(trackfile):
                         'names': TRACKFILE_COLS,
                         'formats': TRACKFILE_FMTS})
 
-def readMultipleTrackData(trackfile):
-    """
-    Reads all the track datas from a .csv file into a list of numpy.ndarrays.
-    The tracks are seperated based in their cyclone id. This function calls
-    `readTrackData` to read the data from the file.
-
-    :type  trackfile: str
-    :param trackfile: the track data filename.
-    """
-    datas = []
-    data = readTrackData(trackfile)
-    if len(data) > 0:
-        cycloneId = data['CycloneNumber']
-        for i in range(1, np.max(cycloneId) + 1):
-            datas.append(data[cycloneId == i])
-    else:
-        datas.append(data)
-    return datas
-
 def loadTracks(trackfile):
     """
     Read tracks from a track .csv file and return a list of :class:`Track`
     objects.
 
-    This calls the function `readMultipleTrackData` to parse the track .csv
+    This calls the function `readTrackData` to parse the track .csv
     file.
 
     :type  trackfile: str
     :param trackfile: the track data filename.
     """
-    tracks = []
-    datas = readMultipleTrackData(trackfile)
-    n = len(datas)
-    for i, data in enumerate(datas):
-        track = Track(data)
-        track.trackfile = trackfile
-        track.trackId = (i, n)
-        tracks.append(track)
-    return tracks
+    return list(TrackCollection.fromCycloneNumbers(readTrackData(trackfile),
+                                                   trackfile))
 
 class LongitudeCrossing(object):
     
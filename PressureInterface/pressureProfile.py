@@ -112,8 +112,8 @@ class PrsProfile:
         self.beta1 = beta1
         self.beta2 = beta2
         self.logger = logging.getLogger()
-        self.logger.debug("Storm centre: %3f %3f" %(self.cLon, self.cLat))
-        self.logger.debug("Coriolis parameter: %3f" % self.f)
+        self.logger.debug("Storm centre: %3f %3f", self.cLon, self.cLat)
+        self.logger.debug("Coriolis parameter: %3f", self.f)
 
 #    def rankine(self, vMaxType="willoughby"):
 #        """
@@ -152,8 +152,8 @@ class PrsProfile:
         t0 = time.time()
         P = numpy.zeros(self.R.shape)
         P = self.pCentre + self.dP*numpy.exp(-(self.rMax/self.R)**beta)
-        self.logger.debug("Timing for holland wind profile calculation: %.3f"
-                           % (time.time()-t0))
+        self.logger.debug("Timing for holland wind profile calculation: %.3f",
+                          time.time()-t0)
         return P
 
     def willoughby(self):
@@ -230,7 +230,7 @@ class PrsProfile:
 #        if self.dP >= 1500.:
 #            icore = where(self.R <= self.rMax)
 #            P[icore] = sign(self.f)*self.R[icore]*(self.R[icore]*(self.R[icore]*aa + bb) + cc)
-        self.logger.debug("Timing for doubleHolland wind profile calculation: %.3f" % (time.time()-t0))
+        self.logger.debug("Timing for doubleHolland wind profile calculation: %.3f", time.time()-t0)
         return P
 
     def powell(self):
@@ -136,8 +136,9 @@ class KDEParameters:
         self.pdf = self._generatePDF(self.grid, bw, self.parameters)
 
         if periodic:
-            self.pdf = 3.0*self.pdf[(periodic/kdeStep):2*(periodic/kdeStep)]
-            self.grid = self.grid[(periodic/kdeStep):2*(periodic/kdeStep)]
+            n = int(periodic/kdeStep)
+            self.pdf = 3.0*self.pdf[n:2*n]
+            self.grid = self.grid[n:2*n]
 
         self.cy = stats.cdf(self.grid, self.pdf)
         if kdeParameters is None:
@@ -14,11 +14,13 @@
 
 import sys
 import logging as log
+import numpy as np
 import KDEOrigin
 import KDEParameters
 
 from os.path import join as pjoin
 from Utilities.config import cnfGetIniValue, ConfigParser
+from DataProcess.DataProcess import loadProcessStore
 from GenerateDistributions import GenerateDistributions
 from generateStats import GenerateStats
 
@@ -217,18 +219,40 @@ class StatInterface(object):
         An optional :attr:`minSample` (default=100) can be given which
         sets the minimum number of observations in a given cell to
         calculate the statistics.
+
+        If the binary store of derived parameters is available in the
+        process directory, the parameters are memory-mapped from the
+        store rather than read from the text files.
         
         """
 
         path = self.processPath
 
+        store = loadProcessStore(path)
+        if store is not None:
+            log.debug('Reading parameters from binary process store')
+            lonLat = np.column_stack((store['lon'], store['lat'],
+                                      store['lsflag']))
+            columns = {'all_speed': 'speed',
+                       'speed_rate': 'speedRate',
+                       'all_pressure': 'pressure',
+                       'pressure_rate': 'pressureRate',
+                       'all_bearing': 'bearing',
+                       'bearing_rate': 'bearingRate'}
+        else:
+            lonLat = pjoin(path, 'all_lon_lat')
+
         def calculate(filename, angular=False):
             """
             Helper function to calculate the statistics.
             """
+            if store is not None:
+                parameter = store[columns[filename]]
+            else:
+                parameter = pjoin(path, filename)
             return GenerateStats(
-                pjoin(path, filename),
-                pjoin(path, 'all_lon_lat'),
+                parameter,
+                lonLat,
                 self.gridLimit,
                 self.gridSpace,
                 self.gridInc,
@@ -402,6 +402,7 @@ class GenerateStats:
         ncdf = Dataset(filename, 'r')
         for var in ncdf.variables.keys():
             setattr(self.coeffs, var, ncdf.variables[var][:].flatten())
+        ncdf.close()
         #TODO: maybe save and check grid settings?
 
     def save(self, filename, description=''):
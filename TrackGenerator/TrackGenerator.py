@@ -40,18 +40,21 @@ import Utilities.Cstats as Cstats
 import Utilities.maputils as maputils
 import Utilities.metutils as metutils
 import Utilities.tcrandom as random
+import Utilities.profiler as profiler
 from os.path import join as pjoin
 from netCDF4 import Dataset as netcdf_file
-from scipy.ndimage.interpolation import spline_filter
+from scipy.ndimage import correlate1d
+from scipy.ndimage.interpolation import spline_filter, map_coordinates
 
 from StatInterface.generateStats import GenerateStats
 from StatInterface.SamplingOrigin import SamplingOrigin
 from Utilities.files import flLoadFile, flSaveFile
+from Utilities.manifest import markComplete, isMarkedComplete
+from Utilities.arraycache import cacheKey, cachedArrays
 
 from DataProcess.CalcFrequency import CalcFrequency
 from DataProcess.CalcTrackDomain import CalcTrackDomain
 from Utilities.config import ConfigParser
-from Utilities.interp3d import interp3d
 from Utilities.parallel import attemptParallel
 
 class SamplePressure(object):
@@ -59,19 +62,190 @@ class SamplePressure(object):
     Provide a method to get a 3-d interpolated mean sea level
     pressure at a given location
 
+    By default, the pressure is evaluated from the cubic spline
+    representation of the data. If a time step ``dt`` is given, a
+    lookup table of the pressure is precomputed (in single precision)
+    at intervals of ``dt`` hours through the year, by evaluating the
+    spline at each time and grid point. Points are then sampled from
+    the table with trilinear interpolation, which is considerably
+    faster than evaluating the spline.
+
+    If a ``cachePath`` is given, the spline coefficients and lookup
+    table are saved there and opened as read-only memory maps (see
+    :mod:`Utilities.arraycache`), so that they are calculated once and
+    shared by all the processes on a node.
+
     :param str mslp_file: path to a 3-d (time, lat, lon) MSLP
                           netcdf file.
     :param str var: Variable name (assumed 'slp')
+    :param float dt: Optional time step (hours) of the lookup table.
+    :param str cachePath: Optional cache directory.
     
     """
-    def __init__(self, mslp_file, var='slp'):
+
+    scale = [365., 180., 360.]
+    offset = [0., -90., 0.]
+
+    def __init__(self, mslp_file, var='slp', dt=None, cachePath=None):
+        def load():
+            return {'data': self._load(mslp_file, var)}
+
+        def lookupTable():
+            return {'table': self._lookupTable(dt)}
+
+        if cachePath:
+            self.data = cachedArrays(cachePath, 'mslp.' + var,
+                                     cacheKey(mslp_file, var=var),
+                                     load)['data']
+        else:
+            self.data = load()['data']
+
+        self.table = None
+        if dt and cachePath:
+            self.table = cachedArrays(cachePath, 'mslp.%s.%g' % (var, dt),
+                                      cacheKey(mslp_file, var=var, dt=dt),
+                                      lookupTable)['table']
+        elif dt:
+            self.table = lookupTable()['table']
+
+    def _load(self, mslp_file, var):
+        """
+        Load the MSLP data and calculate the spline coefficients.
+
+        :returns: :class:`numpy.ndarray` (time, lat, lon) of spline
+                  coefficients of the MSLP (hPa).
+
+        """
         ncobj = nctools.ncLoadFile(mslp_file)
         data = nctools.ncGetData(ncobj, var)
         slpunits = getattr(ncobj.variables[var],'units')
+        ncobj.close()
 
         data = metutils.convert(data, slpunits, 'hPa')
-        self.data = spline_filter(data)
-        
+        return spline_filter(data)
+
+    def _lookupTable(self, dt, chunksize=240):
+        """
+        Evaluate the spline at each grid point, at intervals of ``dt``
+        hours through the year.
+
+        The spline is separable, so the spatial part is evaluated at
+        the grid points once, leaving a weighted sum of four time
+        slices (with periodic boundaries) for each time in the table.
+
+        :param float dt: Time step (hours) of the table.
+        :param int chunksize: Number of times to evaluate at once.
+
+        :returns: :class:`numpy.ndarray` (time, lat, lon) of MSLP values.
+
+        """
+        nt = self.data.shape[0]
+        ntimes = int(round(self.scale[0] * 24. / dt))
+        log.debug('Precomputing MSLP lookup table with %d times', ntimes)
+
+        # B-spline weights at the grid points:
+        weights = np.array([1., 4., 1.]) / 6.
+        coeffs = correlate1d(self.data, weights, axis=1, mode='wrap')
+        coeffs = correlate1d(coeffs, weights, axis=2, mode='wrap')
+
+        index = np.arange(ntimes) * float(nt) / ntimes
+        k = np.floor(index).astype(int)
+        f = index - k
+        w = [(1. - f) ** 3 / 6.,
+             (3. * f ** 3 - 6. * f ** 2 + 4.) / 6.,
+             (-3. * f ** 3 + 3. * f ** 2 + 3. * f + 1.) / 6.,
+             f ** 3 / 6.]
+
+        table = np.empty((ntimes,) + self.data.shape[1:], 'f')
+        for start in xrange(0, ntimes, chunksize):
+            s = slice(start, start + chunksize)
+            values = np.zeros((len(k[s]),) + self.data.shape[1:])
+            for m in range(4):
+                values += w[m][s, None, None] * coeffs[(k[s] + m - 1) % nt]
+            table[s] = values
+        return table
+
+    def _indices(self, shape, day, lat, lon):
+        """
+        Convert coordinates to (fractional) indices of an array.
+        """
+        return [d * (c - o) / s for d, c, o, s in
+                zip(shape, (day, lat, lon), self.offset, self.scale)]
+
+    def get_pressures(self, day, lat, lon):
+        """
+        Interpolate daily long term mean sea level pressure at a
+        set of points in one call.
+
+        :param day: Day of year of the points.
+        :param lat: Latitude of the points.
+        :param lon: Longitude of the points.
+        :type day: :class:`numpy.ndarray`
+        :type lat: :class:`numpy.ndarray`
+        :type lon: :class:`numpy.ndarray`
+
+        :returns: :class:`numpy.ndarray` of long term MSLP values.
+
+        """
+        if self.table is not None and np.isscalar(day) and \
+           np.isscalar(lat) and np.isscalar(lon):
+            # Avoid the overhead of array operations for a single point:
+            return np.array([self._tableValue(day, lat, lon)])
+
+        day = np.atleast_1d(np.asarray(day, float))
+        lat = np.atleast_1d(np.asarray(lat, float))
+        lon = np.atleast_1d(np.asarray(lon, float))
+
+        if self.table is None:
+            indices = self._indices(self.data.shape, day, lat, lon)
+            mslp = map_coordinates(self.data, indices, mode='wrap',
+                                   prefilter=False)
+            return np.array(mslp, self.data.dtype)
+
+        table = self.table
+        lower = []
+        upper = []
+        frac = []
+        for n, x in zip(table.shape,
+                        self._indices(table.shape, day, lat, lon)):
+            i = np.floor(x)
+            frac.append(x - i)
+            i = i.astype(int) % n
+            lower.append(i)
+            upper.append((i + 1) % n)
+
+        (t0, y0, x0), (t1, y1, x1), (ft, fy, fx) = lower, upper, frac
+        v0 = ((table[t0, y0, x0] * (1. - fx) + table[t0, y0, x1] * fx) *
+              (1. - fy) +
+              (table[t0, y1, x0] * (1. - fx) + table[t0, y1, x1] * fx) * fy)
+        v1 = ((table[t1, y0, x0] * (1. - fx) + table[t1, y0, x1] * fx) *
+              (1. - fy) +
+              (table[t1, y1, x0] * (1. - fx) + table[t1, y1, x1] * fx) * fy)
+        return v0 * (1. - ft) + v1 * ft
+
+    def _tableValue(self, day, lat, lon):
+        """
+        Trilinear interpolation of the lookup table at a single point.
+        """
+        table = self.table
+        lower = []
+        frac = []
+        for n, x in zip(table.shape,
+                        self._indices(table.shape, day, lat, lon)):
+            i = math.floor(x)
+            frac.append(x - i)
+            lower.append(int(i) % n)
+
+        value = 0.
+        for dt, wt in ((0, 1. - frac[0]), (1, frac[0])):
+            t = (lower[0] + dt) % table.shape[0]
+            for dy, wy in ((0, 1. - frac[1]), (1, frac[1])):
+                y = (lower[1] + dy) % table.shape[1]
+                for dx, wx in ((0, 1. - frac[2]), (1, frac[2])):
+                    x = (lower[2] + dx) % table.shape[2]
+                    value += wt * wy * wx * table.item(t, y, x)
+        return value
+
     def get_pressure(self, coords):
         """
         Interpolate daily long term mean sea level pressure at
@@ -83,10 +257,7 @@ class SamplePressure(object):
 
         """
         
-        scale = [365., 180., 360.]
-        offset = [0., -90., 0.]
-        mslp = interp3d(self.data, coords, scale, offset, prefilter=False)
-        return mslp
+        return self.get_pressures(*coords)
 
 class TrackGenerator(object):
 
@@ -325,6 +496,7 @@ class TrackGenerator(object):
         self.dpStats = init('pressure_rate')
         self.dpStats.load(pjoin(self.processPath, 'pressure_rate_stats.nc'))
 
+    @profiler.timed('trackgenerator.generateTracks')
     def generateTracks(self, nTracks, initLon=None, initLat=None,
                        initSpeed=None, initBearing=None,
                        initPressure=None, initEnvPressure=None,
@@ -450,9 +622,9 @@ class TrackGenerator(object):
             # provided - dependent on initial day of year:
 
             if not initEnvPressure:
-                initEnvPressure = self.mslp.get_pressure(np.array([[genesisDay],
-                                                          [genesisLat],
-                                                          [genesisLon]]))
+                initEnvPressure = self.mslp.get_pressures(genesisDay,
+                                                          genesisLat,
+                                                          genesisLon)[0]
                                                        
             # Sample an initial pressure if none is provided
 
@@ -502,73 +674,10 @@ class TrackGenerator(object):
 
             results.append(track)
 
-        # Define some filter functions
+        # Filter the generated tracks based on certain criteria, and
+        # return them as a stacked array
+        return filterTracks(results, self.innerGridLimit)
 
-        def empty(track):
-            """
-            :return: True if the track is empty. False, otherwise.
-            """
-            index, dates, age, lon, lat, speed, bearing, P, penv, rmax = track
-            return len(lon) == 0
-
-        def diedEarly(track, minAge=12):
-            """
-            :return: True if the track dies before `minAge`. False,
-            otherwise.
-            """
-            index, dates, age, lon, lat, speed, bearing, P, penv, rmax = track
-            return age[-1] < minAge
-
-        def insideDomain(track):
-            """
-            :return: True if the track stays inside the domain. False,
-            otherwise.
-            """
-            index, dates, age, lon, lat, speed, bearing, P, penv, rmax = track
-            inside = [lon[k] > self.innerGridLimit['xMin'] and
-                      lon[k] < self.innerGridLimit['xMax'] and
-                      lat[k] > self.innerGridLimit['yMin'] and
-                      lat[k] < self.innerGridLimit['yMax']
-                      for k in range(len(lon))]
-            return all(inside)
-
-        def validPressures(track):
-            """
-            :return: True if a valid pressure. False, otherwise.
-            """
-            index, dates, age, lon, lat, speed, bearing, P, eP, rmax = track
-            return all(np.round(P, 2) < np.round(eP, 2))
-
-        # Filter the generated tracks based on certain criteria
-        nbefore = len(results)
-        results = [track for track in results if not empty(track)]
-        log.debug('Removed %i empty tracks.', nbefore - len(results))
-
-        nbefore = len(results)
-        results = [track for track in results if not diedEarly(track)]
-        log.debug('Removed %i tracks that died early.',
-                  nbefore - len(results))
-
-        nbefore = len(results)
-        results = [track for track in results if validPressures(track)]
-        log.debug('Removed %i tracks that had incorrect pressures.',
-                  nbefore - len(results))
-
-        if self.innerGridLimit:
-            nbefore = len(results)
-            results = [track for track in results if insideDomain(track)]
-            log.debug('Removed %i tracks that do not pass inside' +
-                      ' domain.', nbefore - len(results))
-
-        # Return the tracks as a stacked array
-        
-        if len(results) > 1:
-            return np.hstack([np.vstack(r) for r in results]).T
-        else:
-            return np.array(results).T
-            
-        return results
-        
     def generateTracksToFile(self, outputFile, nTracks, initLon=None,
                              initLat=None, initSpeed=None,
                              initBearing=None, initPressure=None,
@@ -697,6 +806,7 @@ class TrackGenerator(object):
             fl = AsyncRun(flSaveFile, args)
             fl.start()
 
+    @profiler.timed('trackgenerator.track')
     def _singleTrack(self, cycloneNumber, initLon, initLat, initSpeed,
                      initBearing, initPressure, initEnvPressure,
                      initRmax, initTime):
@@ -816,9 +926,7 @@ class TrackGenerator(object):
             # Sample the environment pressure
 
             #penv[i] = self.mslp.sampleGrid(lon[i], lat[i])
-            penv[i] = self.mslp.get_pressure(np.array([[jday[i]],
-                                                      [lat[i]],
-                                                      [lon[i]]]))            
+            penv[i] = self.mslp.get_pressures(jday[i], lat[i], lon[i])[0]
 
             # Terminate and return the track if it steps out of the
             # domain
@@ -1506,6 +1614,88 @@ def logistic(loc=0., scale=1.0):
     return PRNG.logisticvariate(loc, scale)
 
 
+def filterTracks(tracks, innerGridLimit=None, minAge=12):
+    """
+    Remove the generated tracks that are empty, that die before
+    `minAge`, whose central pressure is not below the environmental
+    pressure, or (if `innerGridLimit` is given) that leave the inner
+    domain, and stack the points of the remaining tracks.
+
+    :param list tracks: the tracks, each a tuple of the arrays returned
+                        by :meth:`TrackGenerator._singleTrack`.
+    :param dict innerGridLimit: optional domain the tracks must stay
+                                inside.
+    :param int minAge: minimum age of the tracks (hours).
+
+    :returns: :class:`numpy.ndarray` of the points of the remaining
+              tracks, with a column for each of the arrays of a track.
+
+    """
+    # The criteria are evaluated for all the tracks at once: the
+    # points of the tracks are stacked end to end, and the points
+    # of each track are combined with `reduceat`.
+
+    if len(tracks) == 0:
+        return np.array([])
+
+    lengths = np.array([len(track[3]) for track in tracks], int)
+    nonEmpty = lengths > 0
+    log.debug('Removed %i empty tracks.',
+              len(lengths) - nonEmpty.sum())
+
+    columns = [np.concatenate([track[k] for track in tracks])
+               for k in range(10)]
+    index, dates, age, lon, lat, speed, bearing, P, eP, rmax = columns
+
+    # Index of the first and last points of each track:
+    first = np.cumsum(lengths) - lengths
+    last = first + lengths - 1
+    starts = first[nonEmpty]
+
+    def allPoints(valid):
+        """
+        :return: True for each non-empty track if `valid` is True
+                 at all its points.
+        """
+        result = np.zeros(len(lengths), bool)
+        if len(starts) > 0:
+            result[nonEmpty] = np.logical_and.reduceat(valid, starts)
+        return result
+
+    diedEarly = np.zeros(len(lengths), bool)
+    diedEarly[nonEmpty] = age[last[nonEmpty]] < minAge
+    nbefore = nonEmpty.sum()
+    keep = nonEmpty & ~diedEarly
+    log.debug('Removed %i tracks that died early.',
+              nbefore - keep.sum())
+
+    nbefore = keep.sum()
+    keep &= allPoints(np.round(P, 2) < np.round(eP, 2))
+    log.debug('Removed %i tracks that had incorrect pressures.',
+              nbefore - keep.sum())
+
+    if innerGridLimit:
+        nbefore = keep.sum()
+        keep &= allPoints((lon > innerGridLimit['xMin']) &
+                          (lon < innerGridLimit['xMax']) &
+                          (lat > innerGridLimit['yMin']) &
+                          (lat < innerGridLimit['yMax']))
+        log.debug('Removed %i tracks that do not pass inside' +
+                  ' domain.', nbefore - keep.sum())
+
+    # Return the points of the remaining tracks as a stacked array
+
+    if not keep.any():
+        return np.array([])
+
+    points = np.repeat(keep, lengths)
+    stacked = np.empty((points.sum(), len(columns)), dtype=object)
+    for k, column in enumerate(columns):
+        stacked[:, k] = column[points]
+    return stacked
+
+
+
 def ppf(q, cdf):
     """
     Percentage point function (aka. inverse CDF, quantile) of
@@ -1563,16 +1753,58 @@ class Simulation(object):
         self.outfile = outfile
 
 
-def run(configFile, callback=None):
+def simulationParams(sim):
     """
-    Run the tropical cyclone track generation.
+    :param sim: :class:`Simulation`.
+
+    :returns: :class:`dict` of the parameters that determine the tracks
+              of the simulation, recorded when its track file is
+              marked complete.
+
+    """
+    return {'seed': sim.seed, 'jumpahead': int(sim.jumpahead),
+            'ntracks': int(sim.ntracks)}
 
-    This will attempt to perform the simulation in parallel but also
-    provides a sane fallback mechanism.
+
+def simulations(configFile, callback=None, resume=False, writeTracks=True,
+                complete=None):
+    """
+    Set up the tropical cyclone track generation, and return a
+    generator running the simulations of this processor.
+
+    The settings are loaded (and the processors synchronised) when this
+    function is called; the tracks of each simulation are generated
+    as the generator is iterated over, so the generator can be run in
+    another thread (see :mod:`Utilities.prefetch`).
 
     :type  configFile: str
     :param configFile: the filename of the configuration file to load
                        the track generation configuration from.
+
+    :type  callback: function
+    :param callback: optional function called with the index of each
+                     simulation and the index of the last simulation.
+
+    :type  resume: bool
+    :param resume: if `True`, only run the simulations that are not
+                   complete, to complete an interrupted run. Each
+                   simulation has its own seed and jump ahead, so the
+                   tracks are the same as if all were run together.
+
+    :type  writeTracks: bool
+    :param writeTracks: if `True`, save the tracks of each simulation
+                        to its track file.
+
+    :type  complete: function
+    :param complete: function called with a :class:`Simulation` and the
+                     path of its track file, returning `True` if the
+                     simulation is complete. By default, a simulation
+                     is complete if its track file is marked complete.
+
+    :rtype: generator
+    :return: a generator yielding the :class:`Simulation`, the path of
+             its track file and the array of tracks generated for
+             each simulation of this processor.
     """
 
     log.info('Loading track generation settings')
@@ -1629,11 +1861,25 @@ def run(configFile, callback=None):
                      ' for parallel runs!')
         sys.exit(1)
 
-    mslp = SamplePressure(mslpFile)
-    
-    # Initialise the landfall tracking
+    # Load the MSLP climatology and initialise the landfall tracking.
+    # With the shared cache, the first processor builds the cache that
+    # the others then open.
+
+    cachePath = None
+    if config.getboolean('TrackGenerator', 'SharedCache'):
+        cachePath = pjoin(outputPath, 'cache')
+    lookup = dt if config.getboolean('TrackGenerator', 'MSLPLookup') else None
 
-    landfall = trackLandfall.LandfallDecay(configFile, dt)
+    def load():
+        return (SamplePressure(mslpFile, dt=lookup, cachePath=cachePath),
+                trackLandfall.LandfallDecay(configFile, dt, cachePath))
+
+    if pp.rank() == 0:
+        mslp, landfall = load()
+    if cachePath:
+        pp.barrier()
+    if pp.rank() > 0:
+        mslp, landfall = load()
 
     # Wait for configuration to be loaded by all processors
 
@@ -1690,21 +1936,62 @@ def run(configFile, callback=None):
 
     N = sims[-1].index
 
-    # Balance the simulations over the number of processors and do it
+    if resume and not (seasonSeed and trackSeed):
+        log.warning('SeasonSeed and TrackSeed are needed to resume '
+                    'track generation: all simulations will be run')
+        resume = False
+
+    # Only run the simulations that are not complete. All processors
+    # check the same files, so they agree on the remaining simulations
+    # before balancing them.
+
+    if resume:
+        if complete is None:
+            complete = lambda sim, trackFile: isMarkedComplete(
+                trackFile, **simulationParams(sim))
+        remaining = [sim for sim in sims if not
+                     complete(sim, pjoin(trackPath, sim.outfile))]
+        log.info('Resuming: %d of %d simulations are not complete',
+                 len(remaining), len(sims))
+        sims = remaining
+        pp.barrier()
+
+    # Balance the simulations over the number of processors
 
-    for sim in balanced(sims):
+    return _simulate(tg, balanced(sims), trackPath, N, callback,
+                     writeTracks)
+
+
+def _simulate(tg, sims, trackPath, N, callback=None, writeTracks=True):
+    """
+    Generate the tracks of each simulation and (optionally) save them.
+
+    :param tg: :class:`TrackGenerator` instance.
+    :param sims: iterable of the :class:`Simulation` objects to run.
+    :param str trackPath: path of the track files.
+    :param int N: index of the last simulation (of all processors).
+    :param callback: optional progress callback.
+    :param bool writeTracks: if `True`, save the tracks to the track
+                             file of each simulation.
+
+    :return: a generator yielding each :class:`Simulation`, the path
+             of its track file and the array of tracks.
+
+    """
+    for sim in sims:
         log.debug('Simulating tropical cyclone tracks:' +
                   ' %3.0f percent complete' % (sim.index / float(N)
                                                * 100.))
         if callback is not None:
             callback(sim.index, N)
 
+        trackFile = pjoin(trackPath, sim.outfile)
+
         if sim.seed:
             PRNG.seed(sim.seed)
             PRNG.jumpahead(sim.jumpahead)
             log.debug('seed %i jumpahead %i', sim.seed, sim.jumpahead)
 
-        trackFile = pjoin(trackPath, sim.outfile)
         tracks = tg.generateTracks(sim.ntracks)
 
         header = 'CycloneNumber,Datetime,TimeElapsed,Longitude,' + \
@@ -1720,15 +2007,51 @@ def run(configFile, callback=None):
                 if len(track) > 0:
                     np.savetxt(fp, np.array(track).T, fmt=fmt)
         """            
-        with open(trackFile, 'w') as fp:
-            fp.write('%' + header)
-            if len(tracks) > 0:
-                np.savetxt(fp, tracks, fmt=fmt)
+        if writeTracks:
+            # Write under a temporary name, so an interrupted run never
+            # leaves an incomplete track file
+            tmpFile = pjoin(trackPath, '.' + sim.outfile + '.tmp')
+            with profiler.span('trackgenerator.write'):
+                with open(tmpFile, 'w') as fp:
+                    fp.write('%' + header)
+                    if len(tracks) > 0:
+                        np.savetxt(fp, tracks, fmt=fmt)
+                os.rename(tmpFile, trackFile)
+            markComplete(trackFile, **simulationParams(sim))
+
+            if profiler.ENABLED:
+                profiler.addBytes('trackgenerator.write',
+                                  written=os.path.getsize(trackFile))
+
+        yield sim, trackFile, tracks
 
     log.info('Simulating tropical cyclone tracks:' +
              ' 100 percent complete')
 
 
+def run(configFile, callback=None, resume=False):
+    """
+    Run the tropical cyclone track generation, saving the tracks of
+    each simulation to a track file.
+
+    This will attempt to perform the simulation in parallel but also
+    provides a sane fallback mechanism.
+
+    :type  configFile: str
+    :param configFile: the filename of the configuration file to load
+                       the track generation configuration from.
+
+    :type  resume: bool
+    :param resume: if `True`, only run the simulations whose track
+                   file is not marked complete, to complete an
+                   interrupted run. Each simulation has its own seed
+                   and jump ahead, so the tracks are the same as if
+                   all were run together.
+    """
+    for _ in simulations(configFile, callback, resume):
+        pass
+
+
 if __name__ == "__main__":
     try:
         configFile = sys.argv[1]
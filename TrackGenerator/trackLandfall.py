@@ -39,6 +39,8 @@ class LandfallDecay:
 
     :param str configFile: Configuration file
     :param float dt: time step of the generated cyclone tracks
+    :param str cachePath: optional directory where the land mask is
+                          cached, to share it between processes
 
     Members:
     dt - time step of the generated cyclone tracks
@@ -54,7 +56,7 @@ class LandfallDecay:
 
     """
     
-    def __init__(self, configFile, dt):
+    def __init__(self, configFile, dt, cachePath=None):
         """
         Initialise required fields
 
@@ -67,7 +69,7 @@ class LandfallDecay:
 
         landMaskFile = config.get('Input', 'LandMask')
 
-        self.landMask = SampleGrid(landMaskFile)
+        self.landMask = SampleGrid(landMaskFile, cachePath)
         self.tol = 0 # Time over land
         self.dt = dt
 
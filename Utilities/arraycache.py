@@ -0,0 +1,172 @@
+"""
+:mod:`arraycache` - Share read-only arrays between processes
+============================================================
+
+.. module:: arraycache
+    :synopsis: Save arrays derived from input files to binary files,
+               and open them as read-only memory maps, so that all the
+               processes on a node share one copy of the data.
+
+Read-only datasets such as the land mask and the MSLP climatology are
+loaded (and processed) by every process of a parallel run. Instead,
+the arrays are built once and saved as ``.npy`` files in a cache
+directory, alongside a JSON file holding the key they were built
+with. Each process then opens the files with :func:`numpy.load` in
+read-only memory mapped mode: the pages are held once in the page
+cache of the operating system and shared by all the processes on the
+node.
+
+The key describes the source file (its size and modification time)
+and the parameters the arrays were derived with. If the key has
+changed, the arrays are built again. Files are written under a
+temporary name and renamed, so a process never opens a partly written
+cache.
+
+Example::
+
+    >>> def build():
+    ...     lon, lat, grid = grdRead('landmask.nc')
+    ...     return {'lon': lon, 'lat': lat, 'grid': grid}
+    >>> arrays = cachedArrays('output/cache', 'landmask',
+    ...                       cacheKey('landmask.nc'), build)
+    >>> arrays['grid']
+
+"""
+
+import os
+import json
+import logging
+import numpy as np
+
+from os.path import join as pjoin, isdir
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+def cacheKey(filename, **params):
+    """
+    :param str filename: Path of the source file.
+    :param params: Parameters the arrays are derived with. Values must
+                   be JSON types.
+
+    :returns: :class:`dict` describing the source file and parameters.
+
+    """
+    stat = os.stat(filename)
+    return {'file': os.path.abspath(filename), 'size': stat.st_size,
+            'mtime': stat.st_mtime, 'params': params}
+
+
+def _filenames(cachePath, name, fields):
+    """
+    :returns: Path of the key file and :class:`dict` of the path of the
+              file of each array.
+    """
+    prefix = pjoin(cachePath, name)
+    return (prefix + '.json',
+            dict((field, '%s.%s.npy' % (prefix, field)) for field in fields))
+
+
+def _rename(src, dst):
+    """Rename a file, replacing any existing file"""
+    if os.name == 'nt' and os.path.exists(dst):
+        os.unlink(dst)
+    os.rename(src, dst)
+
+
+def readCache(cachePath, name, key):
+    """
+    Open cached arrays if they were built with the same key.
+
+    :param str cachePath: Cache directory.
+    :param str name: Name of the cached arrays.
+    :param dict key: Key the arrays should have been built with.
+
+    :returns: :class:`dict` of read-only memory mapped arrays, or
+              `None` if the cache is missing or out of date.
+
+    """
+    keyFile, _ = _filenames(cachePath, name, [])
+    try:
+        with open(keyFile) as fh:
+            cached = json.load(fh)
+    except (IOError, OSError, ValueError):
+        return None
+    if cached.get('key') != key:
+        log.debug("Cache %s is out of date", keyFile)
+        return None
+
+    _, files = _filenames(cachePath, name, cached['fields'])
+    try:
+        return dict((field, np.load(filename, mmap_mode='r'))
+                    for field, filename in files.items())
+    except (IOError, OSError, ValueError):
+        log.warning("Cannot read cache %s", keyFile)
+        return None
+
+
+def writeCache(cachePath, name, key, arrays):
+    """
+    Save arrays to the cache. Failure to write the cache (e.g. a full
+    disk) is not an error.
+
+    :param str cachePath: Cache directory.
+    :param str name: Name of the cached arrays.
+    :param dict key: Key the arrays were built with.
+    :param dict arrays: :class:`numpy.ndarray` to save, keyed by name.
+
+    :returns: `True` if the cache was written.
+
+    """
+    keyFile, files = _filenames(cachePath, name, arrays.keys())
+    suffix = '.%d.tmp' % os.getpid()
+    try:
+        if not isdir(cachePath):
+            os.makedirs(cachePath)
+        for field, filename in files.items():
+            with open(filename + suffix, 'wb') as fh:
+                np.save(fh, np.ascontiguousarray(arrays[field]))
+            _rename(filename + suffix, filename)
+        with open(keyFile + suffix, 'w') as fh:
+            json.dump({'key': key, 'fields': sorted(arrays)}, fh,
+                      sort_keys=True)
+        _rename(keyFile + suffix, keyFile)
+    except (IOError, OSError):
+        log.info("Unable to write cache %s", keyFile)
+        for filename in files.values() + [keyFile]:
+            if os.path.isfile(filename + suffix):
+                os.unlink(filename + suffix)
+        return False
+    return True
+
+
+def cachedArrays(cachePath, name, key, build):
+    """
+    Open cached arrays, building them and saving them to the cache
+    first if they are missing or out of date.
+
+    :param str cachePath: Cache directory.
+    :param str name: Name of the cached arrays.
+    :param dict key: Key describing how the arrays are built (see
+                     :func:`cacheKey`).
+    :param build: Function with no arguments returning a :class:`dict`
+                  of :class:`numpy.ndarray` keyed by name.
+
+    :returns: :class:`dict` of read-only arrays. These are memory
+              mapped, unless the cache could not be written, in which
+              case the arrays returned by `build` are returned.
+
+    """
+    arrays = readCache(cachePath, name, key)
+    if arrays is not None:
+        log.debug("Loaded %s from cache", name)
+        return arrays
+
+    log.debug("Building cache %s", name)
+    arrays = build()
+    if writeCache(cachePath, name, key, arrays):
+        cached = readCache(cachePath, name, key)
+        if cached is not None:
+            return cached
+    return arrays
@@ -7,26 +7,196 @@
 
 .. moduleauthor:: Craig Arthur <craig.arthur@ga.gov.au>
 
+Input files are parsed in chunks with an explicit data type for each
+column, determined from the ``Columns`` option of the source format
+section of the configuration file. The parsed data are cached in a
+binary file alongside the input file, so later reads of an unchanged
+input file do not need to parse the text again.
+
 """
 
+import os
+import logging
 import numpy as np
+from itertools import islice
 from Utilities.config import ConfigParser
 
-def colReadCSV(configFile, dataFile, source):
+LOG = logging.getLogger(__name__)
+
+# Data types of known columns. Any other column is read as a
+# double-precision float. These can be overridden with the
+# ``ColumnTypes`` option in the source format section.
+COLTYPES = {
+    'index': 'i',
+    'tcserialno': '|S20',
+    'season': 'i',
+    'num': 'i',
+    'year': 'i',
+    'month': 'i',
+    'day': 'i',
+    'hour': 'i',
+    'minute': 'i',
+    'date': '|S24',
+    'basin': '|S4',
+    'tcname': '|S32',
+}
+
+# Number of lines to parse at a time:
+CHUNKSIZE = 100000
+
+CACHE_EXT = '.cache.npz'
+
+
+def colDtype(cols, types=None):
+    """
+    Determine the data type for the columns that will be read.
+
+    :param list cols: Names of the columns in the input file. Columns
+                      named 'skip' are not read.
+    :param list types: Optional list of data type codes, one for each
+                       entry in ``cols``. Empty entries take the
+                       default type for that column.
+
+    :returns: :class:`numpy.dtype` of the columns to be read.
+
+    """
+    if types is None:
+        types = [''] * len(cols)
+    if len(types) != len(cols):
+        raise ValueError("Number of column types does not match "
+                         "the number of columns")
+
+    names = []
+    formats = []
+    for col, fmt in zip(cols, types):
+        if col == 'skip':
+            continue
+        names.append(col)
+        formats.append(fmt.strip() or COLTYPES.get(col, 'f8'))
+
+    return np.dtype({'names': names, 'formats': formats})
+
+
+def _cacheKey(dataFile, delimiter, numHeadingLines, cols, dtype):
+    """
+    Build a key describing the input file and the format it is read
+    with. The key changes whenever the file is modified or the column
+    specification changes.
+
+    """
+    stat = os.stat(dataFile)
+    return "%r|%d|%s|%d|%s|%s" % (stat.st_mtime, stat.st_size, delimiter,
+                                  numHeadingLines, ','.join(cols),
+                                  dtype.descr)
+
+
+def _readCache(cacheFile, key):
+    """
+    Load data from a binary cache file, if it exists and was created
+    from the same input file and column specification.
+
+    :returns: :class:`numpy.ndarray` of cached data, or ``None``.
+
+    """
+    if not os.path.isfile(cacheFile):
+        return None
+    try:
+        with np.load(cacheFile) as cache:
+            if str(cache['key']) != key:
+                LOG.debug("Cache file %s is out of date", cacheFile)
+                return None
+            return cache['data']
+    except Exception:
+        # A damaged cache file (e.g. truncated) is re-parsed from the
+        # input file rather than being an error
+        LOG.warning("Cannot read cache file %s", cacheFile)
+        return None
+
+
+def _writeCache(cacheFile, key, data):
+    """
+    Save data to a binary cache file. Failure to write the cache
+    (e.g. a read-only input directory) is not an error.
+
+    The data are written to a temporary file that is then renamed, so
+    other processes never read a partly written cache file.
+
+    """
+    tmpFile = cacheFile + '.%d.tmp' % os.getpid()
+    try:
+        with open(tmpFile, 'wb') as fh:
+            np.savez(fh, key=np.array(key), data=data)
+        if os.name == 'nt' and os.path.exists(cacheFile):
+            os.unlink(cacheFile)
+        os.rename(tmpFile, cacheFile)
+    except (IOError, OSError):
+        LOG.info("Unable to write cache file %s", cacheFile)
+        if os.path.isfile(tmpFile):
+            os.unlink(tmpFile)
+
+
+def colReadChunks(dataFile, dtype, delimiter, usecols, numHeadingLines,
+                  chunksize=CHUNKSIZE):
+    """
+    Read delimited data in chunks of ``chunksize`` lines, with the
+    given data type. This avoids the overhead of type inference over
+    the entire input file.
+
+    :param str dataFile: Path to the input file to load.
+    :param dtype: :class:`numpy.dtype` of the columns to be read.
+    :param str delimiter: Field delimiter.
+    :param list usecols: Indices of the columns to read.
+    :param int numHeadingLines: Number of header lines to skip.
+    :param int chunksize: Number of lines to parse at a time.
+
+    :returns: A :class:`numpy.ndarray` that contains the input data.
+
+    """
+    chunks = []
+    with open(dataFile, 'r') as fh:
+        for _ in islice(fh, numHeadingLines):
+            pass
+        while True:
+            lines = list(islice(fh, chunksize))
+            if not lines:
+                break
+            lines = [line for line in lines if line.strip()]
+            if not lines:
+                continue
+            chunk = np.genfromtxt(lines, dtype=dtype, delimiter=delimiter,
+                                  usecols=usecols, comments=None,
+                                  autostrip=True)
+            chunks.append(np.atleast_1d(chunk))
+
+    if not chunks:
+        return np.empty(0, dtype=dtype)
+    if len(chunks) == 1:
+        return chunks[0]
+    return np.concatenate(chunks)
+
+
+def colReadCSV(configFile, dataFile, source, cache=True):
     """
     Loads a csv file containing 'column' data into a record (numpy)
     array with columns labelled by 'fields'. There must be a section in
     the ``configFile`` named ``source`` that sets out the format of the
     data file.
 
+    The data type of each column is determined by :func:`colDtype`.
+    The data are cached in a binary file alongside ``dataFile``, which
+    is used for subsequent calls provided the input file (modification
+    time and size) and column specification are unchanged.
+
     :param str configFile: Path to a configuration file that holds details
                            of the input data.
     :param str dataFile: Path to the input file to load.
     :param str source: Name of the source format. There must be a
                        corresponding section in the ``configFile``.
+    :param boolean cache: If ``True`` (default), read from and save to
+                          the binary cache file.
 
     :returns: A :class:`numpy.ndarray` that contains the input data.
-    
+
     """
     config = ConfigParser()
     config.read(configFile)
@@ -34,12 +204,25 @@ def colReadCSV(configFile, dataFile, source):
     numHeadingLines = config.getint(source, 'NumberOfHeadingLines')
     cols = config.get(source, 'Columns').split(delimiter)
 
-    usecols = [i for i,c in enumerate(cols) if c != 'skip']
+    types = None
+    if config.has_option(source, 'ColumnTypes'):
+        types = config.get(source, 'ColumnTypes').split(delimiter)
+
+    usecols = [i for i, c in enumerate(cols) if c != 'skip']
+    dtype = colDtype(cols, types)
+
+    if cache:
+        cacheFile = dataFile + CACHE_EXT
+        key = _cacheKey(dataFile, delimiter, numHeadingLines, cols, dtype)
+        data = _readCache(cacheFile, key)
+        if data is not None:
+            LOG.debug("Loading %s from cache", dataFile)
+            return data
 
-    data = np.genfromtxt(dataFile, dtype=None, delimiter=delimiter,
-            usecols=usecols, comments=None, skip_header=numHeadingLines, 
-            autostrip=True)
+    data = colReadChunks(dataFile, dtype, delimiter, usecols,
+                         numHeadingLines)
 
-    data.dtype.names = [c for c in cols if c != 'skip']
+    if cache:
+        _writeCache(cacheFile, key, data)
 
     return data
@@ -70,15 +70,22 @@ PARSERS = {
     'Actions_plothazard': parseBool,
     'Actions_downloaddata': parseBool,
     'Actions_executeevaluate': parseBool,
+    'Actions_resume': parseBool,
     'DataProcess_inputfile': str,
     'DataProcess_source': str,
     'DataProcess_startseason': int,
     'DataProcess_filterseasons': parseBool,
     'Hazard_calculateci': parseBool,
+    'Hazard_chunksize': parseList,
+    'Hazard_compressionlevel': int,
+    'Hazard_configattributes': parseBool,
+    'Hazard_leastsignificantdigit': str,
+    'Hazard_memorybudget': float,
     'Hazard_minimumrecords': int,
     'Hazard_plotspeedunits': str,
     'Hazard_years': parseList,
     'Hazard_samplesize': int,
+    'Hazard_shuffle': parseBool,
     'Hazard_percentilerange': int,
     'Input_landmask': str,
     'Input_mslpgrid': parseList,
@@ -87,7 +94,10 @@ PARSERS = {
     'Logging_progressbar': parseBool,
     'Logging_verbose': parseBool,
     'Logging_datestamp':parseBool,
+    'Logging_profile': parseBool,
+    'Logging_profilefile': str,
     'Output_path': str,
+    'Output_writerqueue': int,
     'Process_datfile': str,
     'Process_excludepastprocessed': parseBool,
     'RMW_getrmwdistfrominputdata': parseBool,
@@ -109,19 +119,37 @@ PARSERS = {
     'TCRM_numberofheadinglines': int,
     'TCRM_pressureunits': str,
     'TCRM_speedunits': str,
+    'Timeseries_extract': parseBool,
+    'Timeseries_syncinterval': int,
+    'Timeseries_windfield': parseBool,
     'TrackGenerator_numsimulations': int,
     'TrackGenerator_seasonseed': int,
     'TrackGenerator_trackseed': int,
     'TrackGenerator_yearspersimulation': int,
+    'TrackGenerator_mslplookup': parseBool,
     'TrackGenerator_numtimesteps': int,
     'TrackGenerator_timestep': float,
+    'TrackGenerator_stream': parseBool,
+    'TrackGenerator_writetracks': parseBool,
+    'TrackGenerator_streamqueue': int,
+    'TrackGenerator_sharedcache': parseBool,
     'WindfieldInterface_beta': float,
     'WindfieldInterface_beta1': float,
     'WindfieldInterface_beta2': float,
+    'WindfieldInterface_chunksize': parseList,
+    'WindfieldInterface_compressionlevel': int,
+    'WindfieldInterface_configattributes': parseBool,
     'WindfieldInterface_margin': float,
+    'WindfieldInterface_nestfactor': int,
+    'WindfieldInterface_nestradius': float,
+    'WindfieldInterface_precision': str,
+    'WindfieldInterface_profiletolerance': float,
     'WindfieldInterface_profiletype': str,
     'WindfieldInterface_resolution': float,
+    'WindfieldInterface_shuffle': parseBool,
     'WindfieldInterface_domain': str,
+    'WindfieldInterface_gustthreshold': float,
+    'WindfieldInterface_leastsignificantdigit': str,
     'WindfieldInterface_source': str,
     'WindfieldInterface_thetamax': float,
     'WindfieldInterface_trackfile': str,
@@ -139,6 +167,7 @@ ExecuteEvaluate=True
 PlotData=True
 PlotHazard=True
 DownloadData=True
+Resume=True
 
 [Region]
 gridSpace={'x':1.0,'y':1.0}
@@ -164,6 +193,11 @@ TimeStep=1.0
 Format=csv
 SeasonSeed=1
 TrackSeed=1
+MSLPLookup=False
+Stream=False
+WriteTracks=True
+StreamQueue=2
+SharedCache=True
 
 [WindfieldInterface]
 profileType=holland
@@ -176,6 +210,16 @@ Margin=2
 Resolution=0.05
 PlotOutput=False
 Domain=bounded
+ProfileTolerance=0
+Precision=float64
+GustThreshold=0
+NestRadius=0
+NestFactor=5
+CompressionLevel=4
+Shuffle=True
+ChunkSize=100,100
+LeastSignificantDigit=
+ConfigAttributes=True
 
 [Hazard]
 Years=2,5,10,20,25,50,100,200,250,500,1000
@@ -184,6 +228,12 @@ CalculateCI=True
 PercentileRange=90
 SampleSize=50
 PlotSpeedUnits=mps
+CompressionLevel=4
+Shuffle=True
+ChunkSize=0
+LeastSignificantDigit=
+ConfigAttributes=True
+MemoryBudget=1024
 
 [RMW]
 GetRMWDistFromInputData=False
@@ -195,6 +245,7 @@ Datasets=IBTRACS,LTMSLP
 
 [Output]
 Path=output
+WriterQueue=2
 Format=txt
 
 [Logging]
@@ -203,6 +254,8 @@ LogFile=main.log
 LogLevel=INFO
 Verbose=False
 Datestamp=False
+Profile=False
+ProfileFile=
 
 [Source]
 FieldDelimiter=,
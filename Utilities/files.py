@@ -72,12 +72,18 @@ def flProgramVersion(level=None):
     :returns: version string (defined as the ``__version__`` global variable)
 
     """
-    if not level:
-        import inspect
-        level = len(inspect.stack()) - 1
-    f = sys._getframe(level)
+    if level:
+        f = sys._getframe(level)
+    else:
+        # The outermost frame of the stack
+        f = sys._getframe()
+        while f.f_back is not None:
+            f = f.f_back
     if f.f_globals.has_key('__version__'):
         return f.f_globals['__version__']
+    elif not level and hasattr(sys.modules.get('__main__'), '__version__'):
+        # Called from a thread other than the main thread
+        return sys.modules['__main__'].__version__
     else:
         return ''
 
@@ -31,6 +31,7 @@ import threading
 from lat_long_UTM_conversion import LLtoUTM, UTMtoLL
 import metutils
 import nctools
+from arraycache import cacheKey, cachedArrays
 
 
 def grdSave(filename, data, lon, lat, delta, delimiter=' ', nodata=-9999,
@@ -221,7 +222,12 @@ class SampleGrid:
     method returns the value of the grid point closest to the given
     longitude and latitude.
 
+    If a ``cachePath`` is given, the grid is saved there and opened as
+    a read-only memory map (see :mod:`Utilities.arraycache`), so that
+    it is shared by all the processes on a node.
+
     :param str filename: Path to a file containing gridded data.
+    :param str cachePath: Optional cache directory.
 
     Example::
         
@@ -230,15 +236,41 @@ class SampleGrid:
 
     """
 
-    def __init__(self, filename):
+    def __init__(self, filename, cachePath=None):
         """
         Read in the data and ensure it's the right way around.
+        """
+        if cachePath:
+            name = os.path.basename(filename)
+            arrays = cachedArrays(cachePath, name, cacheKey(filename),
+                                  lambda: self._load(filename, True))
+        else:
+            arrays = self._load(filename)
+        self.lon = arrays['lon']
+        self.lat = arrays['lat']
+        self.grid = arrays['grid']
+
+    def _load(self, filename, filled=False):
+        """
+        Read the data from a file.
+
+        :param str filename: Path to a file containing gridded data.
+        :param bool filled: If `True`, masked values are replaced with
+                            NaN, so the grid can be saved to a cache.
+
+        :returns: :class:`dict` of the `lon`, `lat` and `grid` arrays.
+
         """
         if filename.endswith('nc'):
-            self.lon, self.lat, self.grid = grdReadFromNetcdf(filename)
+            lon, lat, grid = grdReadFromNetcdf(filename)
         else:
-            self.lon, self.lat, self.grid = grdRead(filename)
-        self.grid = numpy.flipud(self.grid)
+            lon, lat, grid = grdRead(filename)
+        grid = numpy.flipud(grid)
+        if filled:
+            if numpy.ma.is_masked(grid):
+                grid = numpy.ma.filled(grid.astype(float), numpy.nan)
+            lon, lat, grid = [numpy.ma.getdata(a) for a in (lon, lat, grid)]
+        return {'lon': lon, 'lat': lat, 'grid': grid}
 
     def sampleGrid(self, lon, lat):
         """
@@ -0,0 +1,149 @@
+"""
+:mod:`gridseries` - Write gridded wind fields at each timestep
+==============================================================
+
+Stream the wind field of each timestep of a simulation to a NetCDF
+file, giving the full evolution of the wind field over the region
+(e.g. for impact modelling of a scenario event).
+
+Each timestep is appended along an unlimited time dimension. Only the
+window evaluated around the eye at that time is written -- grid points
+outside the window are left as missing values. Variables are chunked
+with one timestep per chunk and compressed, so chunks that are never
+written take no space in the file, and the file is synchronised to
+disk at regular intervals so memory use is bounded for long events.
+
+"""
+
+import logging
+import numpy as np
+
+from netCDF4 import Dataset, date2num
+
+from Utilities.maputils import find_index
+from Utilities.nctools import ncCreateDim, ncCreateVar
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+TIME_UNITS = 'hours since 1900-01-01 00:00'
+
+# Maximum size of each chunk in the lat and lon dimensions:
+CHUNKSIZE = 64
+
+NODATA = -9999.
+
+VARIABLES = (
+    ('gust', {'long_name': '3-second gust wind speed',
+              'standard_name': 'wind_speed_of_gust',
+              'units': 'm/s'}),
+    ('ua', {'long_name': 'Eastward component of gust wind speed',
+            'standard_name': 'eastward_wind',
+            'units': 'm/s'}),
+    ('va', {'long_name': 'Northward component of gust wind speed',
+            'standard_name': 'northward_wind',
+            'units': 'm/s'}),
+    ('slp', {'long_name': 'Air pressure at sea level',
+             'standard_name': 'air_pressure_at_sea_level',
+             'units': 'Pa'}))
+
+
+class GridSeries(object):
+    """
+    Write the wind field of each timestep to a NetCDF file.
+
+    :param str filename: Path of the NetCDF file to create.
+    :param lon: :class:`numpy.ndarray` of longitudes of the region.
+    :param lat: :class:`numpy.ndarray` of latitudes of the region.
+    :param int syncInterval: Number of timesteps between writes of the
+                             data to disk.
+    :param int complevel: Compression level (1-9) of the variables.
+    :param dict gatts: Optional global attributes of the file.
+
+    """
+
+    def __init__(self, filename, lon, lat, syncInterval=24, complevel=4,
+                 gatts=None):
+
+        self.filename = filename
+        self.lon = np.asarray(lon)
+        self.lat = np.asarray(lat)
+        self.syncInterval = max(int(syncInterval), 1)
+        self.nsteps = 0
+
+        log.debug("Wind field time series will be written to %s" % filename)
+
+        try:
+            self.ncobj = Dataset(filename, 'w', format='NETCDF4',
+                                 clobber=True)
+        except (IOError, RuntimeError):
+            raise IOError("Cannot open {0} for writing".format(filename))
+
+        self.ncobj.createDimension('time', None)
+        self.times = ncCreateVar(self.ncobj, 'time', ('time',), 'f8',
+                                 atts={'long_name': 'Time',
+                                       'standard_name': 'time',
+                                       'units': TIME_UNITS,
+                                       'calendar': 'standard',
+                                       'axis': 'T'})
+        ncCreateDim(self.ncobj, 'lat', self.lat, 'f',
+                    {'long_name': 'Latitude',
+                     'standard_name': 'latitude',
+                     'units': 'degrees_north',
+                     'axis': 'Y'})
+        ncCreateDim(self.ncobj, 'lon', self.lon, 'f',
+                    {'long_name': 'Longitude',
+                     'standard_name': 'longitude',
+                     'units': 'degrees_east',
+                     'axis': 'X'})
+
+        chunksizes = (1, min(len(self.lat), CHUNKSIZE),
+                      min(len(self.lon), CHUNKSIZE))
+        self.variables = []
+        for name, atts in VARIABLES:
+            var = ncCreateVar(self.ncobj, name, ('time', 'lat', 'lon'), 'f',
+                              atts=atts, zlib=True, complevel=complevel,
+                              chunksizes=chunksizes, fill_value=NODATA)
+            self.variables.append(var)
+
+        if gatts:
+            self.ncobj.setncatts(gatts)
+
+    def extract(self, dt, spd, uu, vv, prs, gridx, gridy):
+        """
+        Append the wind field of one timestep to the file. This has
+        the same signature as
+        :meth:`Utilities.timeseries.Timeseries.extract`, so either can
+        be used as the timestep callback of the wind field calculation.
+
+        :param dt: :class:`datetime.datetime` of the timestep.
+        :param spd: :class:`numpy.ndarray` of speed values.
+        :param uu: :class:`numpy.ndarray` of eastward wind speed values.
+        :param vv: :class:`numpy.ndarray` of northward wind speed values.
+        :param prs: :class:`numpy.ndarray` of pressure values.
+        :param gridx: :class:`numpy.ndarray` of grid longitudes.
+        :param gridy: :class:`numpy.ndarray` of grid latitudes.
+
+        """
+        n = self.nsteps
+        self.times[n] = date2num(dt, TIME_UNITS)
+
+        # Place the window in the regional grid
+        imin = find_index(self.lon, float(gridx[0]))
+        jmin = find_index(self.lat, float(gridy[0]))
+        nx = min(len(gridx), spd.shape[1], len(self.lon) - imin)
+        ny = min(len(gridy), spd.shape[0], len(self.lat) - jmin)
+
+        for var, data in zip(self.variables, (spd, uu, vv, prs)):
+            var[n, jmin:jmin + ny, imin:imin + nx] = data[:ny, :nx]
+
+        self.nsteps += 1
+        if self.nsteps % self.syncInterval == 0:
+            self.ncobj.sync()
+
+    def shutdown(self):
+        """
+        Write any remaining data to disk and close the file.
+        """
+        self.ncobj.close()
+        log.info("Wind field time series written to %s" % self.filename)
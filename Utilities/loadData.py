@@ -34,7 +34,7 @@ import interp3d
 from datetime import datetime, timedelta
 from columns import colReadCSV
 from Utilities.config import ConfigParser, cnfGetIniValue
-from Utilities.track import Track, trackFields, trackTypes
+from Utilities.track import Track, TrackCollection, trackFields, trackTypes
 
 import warnings
 warnings.filterwarnings("ignore", category=RuntimeWarning)
@@ -152,6 +152,41 @@ tcrm = {
 
 """
 
+def _speedBearing(index, lon, lat, deltatime, ieast=1):
+    """
+    Calculate the speed and bearing of all TCs in a set of observations,
+    along with a mask of the observations where the speed is undefined
+    or unrealistic.
+
+    :param index: Array of 0/1 indicating start of new TC (1)
+    :param lon: Longitudes of TC positions.
+    :param lat: Latitudes of TC positions.
+    :param deltatime: Time difference (hours) between
+                      consecutive TC observations.
+    :param int ieast: Indicate which direction has positive
+                      longitude.
+
+    :returns: speed (km/h), bearing (degrees) and the invalid speed
+              mask : :class:`numpy.ndarray`
+
+    """
+    bear_, dist_ = maputils.latLon2Azi(lat, lon, ieast, azimuth=0)
+    assert bear_.size == index.size - 1
+    assert dist_.size == index.size - 1
+    bearing = np.zeros(index.size, 'f')
+    bearing[1:] = bear_
+
+    dist = np.zeros(index.size, 'f')
+    dist[1:] = dist_
+    speed = dist / deltatime
+    # Speeds less than 0, greater than 200, or where indicator == 1
+    # are invalid:
+    invalid = (speed < 0) | (speed > 200) | np.isnan(speed) | \
+        np.asarray(index, bool)
+
+    return speed, bearing, invalid
+
+
 def getSpeedBearing(index, lon, lat, deltatime, ieast=1,
                     missingValue=sys.maxint):
     """
@@ -182,30 +217,22 @@ def getSpeedBearing(index, lon, lat, deltatime, ieast=1,
     
     """
     
-    bear_, dist_ = maputils.latLon2Azi(lat, lon, ieast, azimuth=0)
-    assert bear_.size == index.size - 1
-    assert dist_.size == index.size - 1
-    bearing = np.zeros(index.size, 'f')
-    bearing[1:] = bear_
+    speed, bearing, invalid = _speedBearing(index, lon, lat, deltatime,
+                                            ieast)
     np.putmask(bearing, index, missingValue)
-
-    dist = np.zeros(index.size, 'f')
-    dist[1:] = dist_
-    speed = dist / deltatime
-    # Delete speeds less than 0, greated than 200,
-    # or where indicator == 1.
-    np.putmask(speed, (speed < 0) | (speed > 200) | index, missingValue)
-    np.putmask(speed, np.isnan(speed), missingValue)
+    np.putmask(speed, invalid, missingValue)
 
     return speed, bearing
 
 
 def maxWindSpeed(index, deltatime, lon, lat, pressure, penv,
-                 gustfactor=0.9524):
+                 gustfactor=0.9524, speed=None):
     """
     Calculate the 10-minute-mean maximum wind speed from the central
     pressure deficit, using the method described in Holland et al. (2010).
 
+    All observations (of all TCs) are processed at once.
+
     :param indicator: Array (values of 1 or 0) indicating the beginning of
                       a new TC in the input dataset.
     :param deltatime: Time difference (in hours) between each point in the
@@ -217,6 +244,9 @@ def maxWindSpeed(index, deltatime, lon, lat, pressure, penv,
     :param float gf: Gust factor - default value represents converting from a
                      1-minute sustained wind speed to a 10-minute mean wind
                      speed. Based on Harper et al. 2010, WMO-TD1555.
+    :param speed: Optional forward speed of the TCs (km/h), with invalid
+                  values set to `sys.maxint` (as returned by
+                  :func:`getSpeedBearing`). Calculated if not given.
     :type indicator: :class:`numpy.ndarray`
     :type deltatime: :class:`numpy.ndarray`
     :type lon: :class:`numpy.ndarray`
@@ -234,7 +264,8 @@ def maxWindSpeed(index, deltatime, lon, lat, pressure, penv,
     """
 
     # Speed and bearing:
-    speed, bearing = getSpeedBearing(index, lon, lat, deltatime)
+    if speed is None:
+        speed, bearing = getSpeedBearing(index, lon, lat, deltatime)
     speed = metutils.convert(speed, 'kmh', 'mps')
     np.putmask(speed, speed > 10e+3, 0)
 
@@ -354,10 +385,182 @@ def getInitialPositions(data):
     raise ValueError('Insufficient input file columns have been specified')
 
 
+# Length of each fixed-width date/time directive that can be parsed
+# directly from the character codes of the date strings:
+FIXED_DIRECTIVES = {'Y': 4, 'm': 2, 'd': 2, 'H': 2, 'M': 2, 'S': 2}
+
+# Ordinal (days since 0001-01-01 + 1) of the numpy datetime64 epoch:
+EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+
+def _fixedWidthLayout(datefmt):
+    """
+    Determine the position of each date/time component in strings
+    formatted with `datefmt`, provided the format only contains
+    fixed-width numeric directives (%Y, %m, %d, %H, %M and %S).
+
+    :param str datefmt: Format string of the date values.
+
+    :returns: Tuple of the total string length, a :class:`dict` of
+              (start, end) positions of each directive and a list of
+              (position, character) pairs for the literal characters,
+              or ``None`` if the format is not fixed-width.
+
+    """
+    fields = {}
+    literals = []
+    pos = 0
+    i = 0
+    while i < len(datefmt):
+        if datefmt[i] == '%':
+            if i + 1 >= len(datefmt):
+                return None
+            directive = datefmt[i + 1]
+            if directive == '%':
+                literals.append((pos, '%'))
+                pos += 1
+            elif directive in FIXED_DIRECTIVES and directive not in fields:
+                width = FIXED_DIRECTIVES[directive]
+                fields[directive] = (pos, pos + width)
+                pos += width
+            else:
+                return None
+            i += 2
+        else:
+            literals.append((pos, datefmt[i]))
+            pos += 1
+            i += 1
+
+    if not all(k in fields for k in 'Ymd'):
+        return None
+    return pos, fields, literals
+
+
+def _parseFixedWidth(dates, datefmt):
+    """
+    Parse date strings with a fixed-width format using integer
+    operations on the character codes of the strings.
+
+    :param dates: Array of str objects that describe a date.
+    :param str datefmt: Format string of the date values.
+
+    :returns: :class:`numpy.ndarray` of `datetime64[s]` values, or
+              ``None`` if the format is not fixed-width or any of the
+              date strings do not conform to the format (in which case
+              the dates need to be parsed individually).
+
+    """
+    layout = _fixedWidthLayout(datefmt)
+    if layout is None:
+        return None
+    width, fields, literals = layout
+
+    try:
+        dates = np.char.strip(np.asarray(dates).astype('S'))
+    except (UnicodeEncodeError, ValueError):
+        return None
+    if dates.ndim != 1 or dates.size == 0:
+        return None
+    if np.any(np.char.str_len(dates) != width):
+        return None
+
+    chars = dates.astype('S%d' % width).view(np.uint8).reshape(-1, width)
+    for pos, char in literals:
+        if np.any(chars[:, pos] != ord(char)):
+            return None
+
+    values = {}
+    for directive, (first, last) in fields.items():
+        digits = chars[:, first:last].astype('i8') - ord('0')
+        if np.any((digits < 0) | (digits > 9)):
+            return None
+        scale = 10 ** np.arange(last - first - 1, -1, -1)
+        values[directive] = np.dot(digits, scale)
+
+    nobs = len(dates)
+    zeros = np.zeros(nobs, 'i8')
+    try:
+        return _toDatetime64(values['Y'], values['m'], values['d'],
+                             values.get('H', zeros), values.get('M', zeros),
+                             values.get('S', zeros))
+    except ValueError:
+        return None
+
+
+def _toDatetime64(year, month, day, hour, minute, second=None):
+    """
+    Convert arrays of date/time components to an array of
+    :class:`numpy.datetime64` values.
+
+    :raises ValueError: if any of the components are out of range
+                        (e.g. a day that does not exist in the month).
+
+    :returns: :class:`numpy.ndarray` of `datetime64[s]` values.
+
+    """
+    year = np.asarray(year, 'i8')
+    month = np.asarray(month, 'i8')
+    day = np.asarray(day, 'i8')
+    hour = np.asarray(hour, 'i8')
+    minute = np.asarray(minute, 'i8')
+    if second is None:
+        second = np.zeros(year.shape, 'i8')
+    else:
+        second = np.asarray(second, 'i8')
+
+    if np.any((year < 1) | (year > 9999)):
+        raise ValueError("year is out of range")
+    if np.any((month < 1) | (month > 12)):
+        raise ValueError("month must be in 1..12")
+    if np.any((hour < 0) | (hour > 23)):
+        raise ValueError("hour must be in 0..23")
+    if np.any((minute < 0) | (minute > 59)):
+        raise ValueError("minute must be in 0..59")
+    if np.any((second < 0) | (second > 59)):
+        raise ValueError("second must be in 0..59")
+
+    months = ((year - 1970) * 12 + month - 1).astype('datetime64[M]')
+    days = months.astype('datetime64[D]') + \
+        (day - 1).astype('timedelta64[D]')
+    if np.any((day < 1) | (days.astype('datetime64[M]') != months)):
+        raise ValueError("day is out of range for month")
+
+    return days.astype('datetime64[s]') + \
+        (hour * 3600 + minute * 60 + second).astype('timedelta64[s]')
+
+
+def _fromDatetime64(dt64):
+    """
+    Extract the year, month, day, hour and minute components of an
+    array of :class:`numpy.datetime64` values.
+
+    :returns: :class:`numpy.ndarray`s of year, month, day, hour and
+              minute.
+
+    """
+    months = dt64.astype('datetime64[M]')
+    days = dt64.astype('datetime64[D]')
+    hours = dt64.astype('datetime64[h]')
+    minutes = dt64.astype('datetime64[m]')
+
+    year = (dt64.astype('datetime64[Y]').astype('i8') + 1970).astype('i')
+    month = (months.astype('i8') % 12 + 1).astype('i')
+    day = ((days - months.astype('datetime64[D]')).astype('i8') + 1)
+    hour = (hours - days.astype('datetime64[h]')).astype('i8')
+    minute = (minutes - hours.astype('datetime64[m]')).astype('i8')
+
+    return year, month, day.astype('i'), hour.astype('i'), \
+        minute.astype('i')
+
+
 def date2ymdh(dates, datefmt='%Y-%m-%d %H:%M:%S'):
     """
     Convert date strings to arrays for date components.
 
+    Dates in a fixed-width numeric format (e.g. '%Y-%m-%d %H:%M:%S' or
+    '%Y%m%d%H') are parsed in bulk; any other format falls back to
+    parsing each date with :meth:`datetime.strptime`.
+
     :param dates: Array of str objects that describe a date.
     :type  dates: :class:`numpy.ndarray`
 
@@ -375,6 +578,11 @@ def date2ymdh(dates, datefmt='%Y-%m-%d %H:%M:%S'):
     if pattern.search(datefmt):
         raise ValueError("Cannot use 2-digit year formats in date format")
 
+    dt64 = _parseFixedWidth(dates, datefmt)
+    if dt64 is not None:
+        year, month, day, hour, minute = _fromDatetime64(dt64)
+        return year, month, day, hour, minute, dt64.astype(datetime)
+
     year = np.empty(len(dates), 'i')
     month = np.empty(len(dates), 'i')
     day = np.empty(len(dates), 'i')
@@ -428,13 +636,11 @@ def parseDates(data, indicator, datefmt='%Y-%m-%d %H:%M:%S'):
         except (ValueError, KeyError):
             # Create dummy variable year - applicable for datasets
             # such as WindRiskTech which contain no year information.
-            year = np.zeros(month.size, 'i')
-            for i in range(len(year)):
-                if indicator[i] > 0:
-                    fill_year = 2000
-                if month[i] == 1:
-                    fill_year = 2001
-                year[i] = fill_year
+            # Each TC starts in 2000, and moves to 2001 from January:
+            fill_year = np.where(month == 1, 2001,
+                                 np.where(indicator > 0, 2000, 0))
+            last = np.where(fill_year > 0, np.arange(month.size), 0)
+            year = fill_year[np.maximum.accumulate(last)].astype('i')
 
         try:
             minute = np.array(data['minute'], 'i')
@@ -447,8 +653,8 @@ def parseDates(data, indicator, datefmt='%Y-%m-%d %H:%M:%S'):
                                "- setting minutes to 00 for all times")
                 minute = np.zeros((hour.size), 'i')
 
-        datetimes = np.array([datetime(y, m, d, h, mn) for y, m, d, h, mn 
-                                in zip(year, month, day, hour, minute)])
+        datetimes = _toDatetime64(year, month, day, hour,
+                                  minute).astype(datetime)
 
     return year, month, day, hour, minute, datetimes
 
@@ -470,23 +676,12 @@ def parseAge(data, indicator):
               and :class:`datetime.datetime` objects.
     """
 
-    start_time = datetime(2000, 1, 1, 0, 0)
-    delta = np.array([timedelta(i) for i in data['age']/24.])
-    times_ = start_time + delta
-    year = np.ones(indicator.size, 'i')
-    month = np.ones(indicator.size, 'i')
-    day = np.ones(indicator.size, 'i')
-    hour = np.ones(indicator.size, 'i')
-    minute = np.zeros(indicator.size, 'i')
-
-    for i, dt in enumerate(times_):
-        year[i] = dt.year
-        month[i] = dt.month
-        day[i] = dt.day
-        hour[i] = dt.hour
-        minute[i] = dt.minute
+    start_time = np.datetime64('2000-01-01T00:00', 'us')
+    delta = np.round(np.asarray(data['age'], 'd') * 3600.e6)
+    times_ = start_time + delta.astype('i8').astype('timedelta64[us]')
+    year, month, day, hour, minute = _fromDatetime64(times_)
 
-    return year, month, day, hour, minute, times_
+    return year, month, day, hour, minute, times_.astype(datetime)
 
 
 def getTimeDelta(year, month, day, hour, minute):
@@ -504,10 +699,11 @@ def getTimeDelta(year, month, day, hour, minute):
               observations in hours.
     
     """
-    dates = [datetime(*x) for x in zip(year, month, day, hour, minute)]
-    diffs = [d1 - d0 for d0, d1 in zip(dates[:-1], dates[1:])]
-    return np.array([0.0] + [round(d.days * 24. + d.seconds / 3600.)
-                             for d in diffs], 'f')
+    dates = _toDatetime64(year, month, day, hour, minute)
+    diffs = np.diff(dates).astype('i8') / 3600.
+    # Round half away from zero, as for the builtin round():
+    diffs = np.sign(diffs) * np.floor(np.abs(diffs) + 0.5)
+    return np.concatenate([[0.0], diffs]).astype('f')
 
 def getTimeElapsed(indicator, year, month, day, hour, minute):
     """
@@ -526,18 +722,14 @@ def getTimeElapsed(indicator, year, month, day, hour, minute):
     :returns: :class:`numpy.ndarray` of time since the initial observation
               for each TC (in hours).
     """
-    dates = [datetime(*x) for x in zip(year, month, day, hour, minute)]
+    dates = _toDatetime64(year, month, day, hour, minute)
+    indicator = np.asarray(indicator)
 
-    timeElapsed = []
-    for i, d in zip(indicator, dates):
-        if i == 1:
-            start = d
-            timeElapsed.append(0.0)
-        else:
-            delta = d - start
-            timeElapsed.append(delta.total_seconds()/3600.)
-            
-    return np.array(timeElapsed)
+    # Index of the initial observation of the TC for each record:
+    start = np.where(indicator == 1, np.arange(indicator.size), 0)
+    start = np.maximum.accumulate(start)
+
+    return (dates - dates[start]).astype('i8') / 3600.
 
 
 def getTime(year, month, day, hour, minute):
@@ -559,8 +751,9 @@ def getTime(year, month, day, hour, minute):
     :return: :class:`numpy.ndarray` of days since 0001-01-01 00:00:00 UTC + 1
     
     """
-    dates = [datetime(*x) for x in zip(year, month, day, hour, minute)]
-    return np.array([d.toordinal() + d.hour / 24. for d in dates], 'f')
+    dates = _toDatetime64(year, month, day, hour, minute)
+    days = dates.astype('datetime64[D]').astype('i8') + EPOCH_ORDINAL
+    return np.array(days + np.asarray(hour) / 24., 'f')
 
 
 def julianDays(year, month, day, hour, minute):
@@ -592,17 +785,15 @@ def julianDays(year, month, day, hour, minute):
         raise ValueError(
             "Error in input minute information - check input file")
 
-    # set all years prior to 1900 to 1904 - strftime() requires year >=1900;
-    # and in the Gregorian calendar, 1900 is not a leap year (and there are
-    # many years prior to 1900 that are!).
-    second = np.zeros((hour.size), 'i')
+    # set all years prior to 1900 to 1904 - this retains the
+    # behaviour of earlier versions, which used strftime() (requiring
+    # year >=1900); and in the Gregorian calendar, 1900 is not a leap
+    # year (and there are many years prior to 1900 that are!).
     jyear = np.copy(year)
     jyear[np.where(jyear < 1900)] = 1904
-    day = [datetime(jyear[i], month[i], day[i], hour[i], minute[i],
-                    second[i]) for i in xrange(year.size)]
-
-    jdays = np.array([int(day[i].strftime("%j")) for
-                      i in xrange(year.size)])
+    dates = _toDatetime64(jyear, month, day, hour, minute)
+    days = dates.astype('datetime64[D]')
+    jdays = (days - days.astype('datetime64[Y]')).astype('i8') + 1
     return jdays
 
 
@@ -840,11 +1031,16 @@ def loadTrackFile(configFile, trackFile, source, missingValue=0,
         time = getTime(year, month, day, hour, minute)
         penv = ltmPressure(jdays, time, lon, lat, ncfile)
 
-    speed, bearing = getSpeedBearing(indicator, lon, lat, dt,
-                                     missingValue=missingValue)
+    # Speed and bearing are calculated once, and shared with the
+    # wind speed calculation:
+    speed, bearing, invalid = _speedBearing(indicator, lon, lat, dt)
 
     if calculateWindSpeed:
-        windspeed = maxWindSpeed(indicator, dt, lon, lat, pressure, penv)
+        windspeed = maxWindSpeed(indicator, dt, lon, lat, pressure, penv,
+                                 speed=np.where(invalid, sys.maxint, speed))
+
+    np.putmask(bearing, indicator, missingValue)
+    np.putmask(speed, invalid, missingValue)
 
     TCID = np.cumsum(indicator)
 
@@ -859,14 +1055,13 @@ def loadTrackFile(configFile, trackFile, source, missingValue=0,
                                            pressure, windspeed, rmax, penv]):
         data[key] = value
         
-    tracks = []
-    n = np.max(TCID)
-    for i in range(1, n + 1):
-        track = Track(data[TCID == i])
+    # Split the data into individual tracks at the initial positions.
+    # Any records before the first initial position are discarded.
+    tracks = list(TrackCollection.fromIndicator(data, indicator, trackFile))
+    n = len(tracks)
+    for i, track in enumerate(tracks, 1):
         track.trackId = (i, n)
-        track.trackfile = trackFile
         getMinPressure(track, missingValue)
         getMaxWind(track, missingValue)
-        tracks.append(track)
 
     return tracks
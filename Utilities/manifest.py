@@ -0,0 +1,337 @@
+"""
+:mod:`manifest` - Track the inputs and outputs of each stage of a run
+=====================================================================
+
+.. module:: manifest
+    :synopsis: Record the configuration, input files and output files
+               of each stage of the model, so a later run can skip
+               stages whose outputs are up to date, or resume a stage
+               that did not complete.
+
+A stage is identified by a signature: a hash of the version of the
+code, the configuration sections the stage uses, the MD5 checksums of
+its input files and the digests of the outputs of the stages it
+depends on. When a stage starts, its signature is recorded in the
+manifest file with the status ``started``; when it completes, the
+status is set to ``complete`` and the outputs of the stage (the files
+created or modified under the output path, with their size and
+modification time) are recorded.
+
+A stage is up to date if it completed with the same signature and its
+outputs are unchanged. A stage that started with the same signature
+but did not complete can be resumed.
+
+Within a stage, each output file of a simulation is marked complete by
+a hidden sidecar file, written once the output file is closed::
+
+    tracks/tracks.00012.csv
+    tracks/.tracks.00012.csv.done
+
+The marker records the size of the output file and the parameters it
+was produced from (e.g. the seed of the simulation), so a resumed stage
+only repeats the simulations whose output is missing, incomplete or
+was produced with different parameters.
+
+The manifest is a JSON file::
+
+    {"TrackGenerator": {"signature": "5b0e...", "status": "complete",
+                        "started": 1400000000.0, "completed": ...,
+                        "record": {"config": {...}, "inputs": {...},
+                                   "upstream": {...}},
+                        "outputs": {"tracks/tracks.00000.csv":
+                                    [20340, 1400000100.0], ...},
+                        "digest": "a2c4..."},
+     ...}
+
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+
+from os.path import join as pjoin, relpath, isfile, split as psplit
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+STARTED = 'started'
+COMPLETE = 'complete'
+
+
+def fileChecksum(filename, blocksize=2 ** 20):
+    """
+    :param str filename: Path of the file.
+    :param int blocksize: Number of bytes read at a time.
+
+    :returns: The MD5 checksum of the file, or `None` if it does not
+              exist.
+
+    """
+    if not isfile(filename):
+        return None
+    md5 = hashlib.md5()
+    with open(filename, 'rb') as fh:
+        block = fh.read(blocksize)
+        while block:
+            md5.update(block)
+            block = fh.read(blocksize)
+    return md5.hexdigest()
+
+
+def markerFilename(filename):
+    """
+    :param str filename: Path of an output file.
+
+    :returns: Path of the hidden file marking it complete.
+
+    """
+    path, basename = psplit(filename)
+    return pjoin(path, '.' + basename + '.done')
+
+
+def markComplete(filename, **params):
+    """
+    Mark an output file as complete.
+
+    :param str filename: Path of the output file, which has been
+                         closed.
+    :param params: Parameters the file was produced from. Values must
+                   be JSON types (convert numpy scalars first).
+
+    """
+    marker = {'size': os.path.getsize(filename), 'params': params}
+    with open(markerFilename(filename), 'w') as fh:
+        json.dump(marker, fh, sort_keys=True)
+
+
+def isMarkedComplete(filename, **params):
+    """
+    :param str filename: Path of an output file.
+    :param params: Parameters the file should have been produced from.
+
+    :returns: `True` if the file is marked complete, still has the
+              recorded size and was produced from the same parameters.
+
+    """
+    try:
+        with open(markerFilename(filename)) as fh:
+            marker = json.load(fh)
+        size = os.path.getsize(filename)
+    except (IOError, OSError, ValueError):
+        return False
+    return marker.get('size') == size and marker.get('params') == params
+
+
+def configSubset(config, sections):
+    """
+    :param config: :class:`Utilities.config.ConfigParser` of the run.
+    :param list sections: Names of the sections to include.
+
+    :returns: :class:`dict` of the unparsed options of each section
+              that is in the configuration.
+
+    """
+    subset = {}
+    for section in sections:
+        if config.has_section(section):
+            subset[section] = dict((option, config.get(section, option))
+                                   for option in config.options(section))
+    return subset
+
+
+def snapshot(path, exclude=()):
+    """
+    List the files under a directory, with their size and modification
+    time.
+
+    :param str path: Directory to list.
+    :param exclude: Paths (relative to `path`) of files or directories
+                    to leave out.
+
+    :returns: :class:`dict` of [size, mtime] keyed by the path of each
+              file relative to `path`.
+
+    """
+    files = {}
+    exclude = set(os.path.normpath(e) for e in exclude)
+    for root, dirs, filenames in os.walk(path):
+        rel = relpath(root, path)
+        dirs[:] = [d for d in dirs
+                   if os.path.normpath(pjoin(rel, d)) not in exclude]
+        for filename in filenames:
+            name = os.path.normpath(pjoin(rel, filename))
+            if name in exclude:
+                continue
+            try:
+                stat = os.stat(pjoin(root, filename))
+            except OSError:
+                continue
+            files[name] = [stat.st_size, stat.st_mtime]
+    return files
+
+
+def digest(data):
+    """
+    :returns: SHA1 hash of the JSON representation of `data`.
+    """
+    return hashlib.sha1(json.dumps(data, sort_keys=True)).hexdigest()
+
+
+class Manifest(object):
+    """
+    The record of the stages of a run.
+
+    :param str filename: Path of the manifest file. It is read if it
+                         exists.
+    :param str outputPath: Output path of the run. Outputs are recorded
+                           relative to this path.
+    :param exclude: Paths (relative to `outputPath`) that are not
+                    outputs of any stage, e.g. the log directory.
+
+    """
+
+    def __init__(self, filename, outputPath, exclude=()):
+        self.filename = filename
+        self.outputPath = outputPath
+        self.exclude = list(exclude) + [relpath(filename, outputPath)]
+        self.stages = {}
+        self._before = {}
+        if isfile(filename):
+            try:
+                with open(filename) as fh:
+                    self.stages = json.load(fh)
+            except ValueError:
+                log.warning("Cannot read manifest %s, all stages will "
+                            "be run", filename)
+
+    def save(self):
+        """Write the manifest file"""
+        tmpfile = self.filename + '.tmp'
+        with open(tmpfile, 'w') as fh:
+            json.dump(self.stages, fh, indent=1, sort_keys=True)
+        os.rename(tmpfile, self.filename)
+
+    def record(self, config, sections, inputs, upstream):
+        """
+        Describe a stage from its configuration and inputs.
+
+        :param config: :class:`Utilities.config.ConfigParser` of the run.
+        :param list sections: Configuration sections used by the stage.
+        :param list inputs: Paths of the input files of the stage.
+        :param list upstream: Names of the stages it depends on.
+
+        :returns: :class:`dict` of the configuration subset, checksum
+                  of each input and digest of the outputs of each
+                  upstream stage.
+
+        """
+        return {'config': configSubset(config, sections),
+                'inputs': dict((path, fileChecksum(path))
+                               for path in inputs),
+                'upstream': dict((name, self.stages.get(name, {}).get(
+                    'digest')) for name in upstream)}
+
+    def signature(self, version, record):
+        """
+        :param str version: Version of the code.
+        :param dict record: Description of the stage from
+                            :meth:`record`.
+
+        :returns: The signature of the stage.
+        """
+        return digest({'version': version, 'record': record})
+
+    def status(self, name, signature):
+        """
+        :param str name: Name of the stage.
+        :param str signature: Current signature of the stage.
+
+        :returns: ``complete`` if the stage completed with this
+                  signature and its outputs are unchanged, ``started``
+                  if it started with this signature but did not
+                  complete, otherwise `None`.
+
+        """
+        entry = self.stages.get(name)
+        if entry is None or entry['signature'] != signature:
+            return None
+        if entry['status'] == COMPLETE:
+            if self.isComplete(name):
+                return COMPLETE
+            log.info("Outputs of %s have changed", name)
+            return None
+        return entry['status']
+
+    def isComplete(self, name):
+        """
+        :param str name: Name of the stage.
+
+        :returns: `True` if the stage has completed and its outputs
+                  are unchanged.
+
+        """
+        entry = self.stages.get(name)
+        return (entry is not None and entry['status'] == COMPLETE and
+                self.unchanged(entry['outputs']))
+
+    def unchanged(self, outputs):
+        """
+        :param dict outputs: Recorded [size, mtime] of output files.
+
+        :returns: `True` if all the files exist with the recorded size
+                  and modification time.
+
+        """
+        for name, (size, mtime) in outputs.items():
+            try:
+                stat = os.stat(pjoin(self.outputPath, name))
+            except OSError:
+                return False
+            if stat.st_size != size or stat.st_mtime != mtime:
+                return False
+        return True
+
+    def start(self, name, signature, record, resume=False):
+        """
+        Record that a stage has started.
+
+        :param str name: Name of the stage.
+        :param str signature: Signature of the stage.
+        :param dict record: Description of the stage.
+        :param bool resume: `True` if resuming an earlier attempt, which
+                            keeps its start time.
+
+        """
+        self._before[name] = snapshot(self.outputPath, self.exclude)
+        started = time.time()
+        if resume:
+            started = self.stages[name].get('started', started)
+        self.stages[name] = {'signature': signature, 'status': STARTED,
+                             'started': started, 'record': record}
+
+    def complete(self, name, owned=()):
+        """
+        Record that a stage has completed, with the files it created or
+        modified as its outputs.
+
+        :param str name: Name of the stage.
+        :param owned: Directories (relative to the output path) that
+                      only this stage writes to. All the files in them
+                      are outputs of the stage, including those written
+                      by an earlier attempt that is being resumed.
+
+        """
+        before = self._before.pop(name, {})
+        after = snapshot(self.outputPath, self.exclude)
+        outputs = dict((path, stat) for path, stat in after.items()
+                       if before.get(path) != stat)
+        for directory in owned:
+            prefix = os.path.normpath(directory) + os.sep
+            outputs.update((path, stat) for path, stat in after.items()
+                           if path.startswith(prefix))
+
+        entry = self.stages[name]
+        entry.update(status=COMPLETE, completed=time.time(),
+                     outputs=outputs, digest=digest(outputs))
@@ -83,11 +83,11 @@ def latLon2Azi(lat, lon, ieast=1, azimuth=0, wantdeg=True):
     ###      Rule -1* + 5pi/2 maps to: 2pi               3pi/2
     ####################################################################
     angle = np.arctan2(yn, xe) # yes, in that order
-    bearing = [theta2bearing(i) for i in angle]
+    bearing = theta2bearing(angle)
 
     # If bearing in degrees isexpected on return:
     if wantdeg:
-        bearing = np.array([math.degrees(i) for i in bearing], 'f')
+        bearing = np.array(np.degrees(bearing), 'f')
 
     return bearing, length
 
@@ -196,7 +196,7 @@ def distGC(lat, lon):
 
 
 
-def gridLatLonDist(cLon, cLat, lonArray, latArray, units=None):
+def gridLatLonDist(cLon, cLat, lonArray, latArray, units=None, dtype=float):
     """
     Generate a grid containing the spherical earth distance
     of the points defined by (lonarray, latarray) from the
@@ -216,6 +216,9 @@ def gridLatLonDist(cLon, cLat, lonArray, latArray, units=None):
     :param latArray: 1-d array of latitude values that will define the
                      grid over which distances will be calculated.
     :param str units: Units of distance to be returned (default is kilometre)
+    :param dtype: Floating point type of the returned grid. The
+                  differences from the reference point are calculated in
+                  double precision before conversion.
 
     :returns: 2-d array containing the distance of the points defined in
              ``lonArray`` and ``latArray`` from the point
@@ -297,21 +300,21 @@ def gridLatLonDist(cLon, cLat, lonArray, latArray, units=None):
 
     cLon = math.radians(cLon)
     cLat = math.radians(cLat)
-    lon_, lat_ = np.meshgrid(lon, lat)
-
-    dLon = lon_ - cLon
-    dLat = lat_ - cLat
+    dLon, dLat = np.meshgrid((lon - cLon).astype(dtype),
+                             (lat - cLat).astype(dtype))
+    cosLat = np.cos(lat).astype(dtype)[:, np.newaxis]
 
     a = np.square(np.sin(dLat / 2.0)) + \
-        np.cos(cLat) * np.cos(lat_) * np.square(np.sin(dLon / 2.0))
+        np.cos(cLat) * cosLat * np.square(np.sin(dLon / 2.0))
     c = 2.0 * np.arctan2(np.sqrt(np.absolute(a)), np.sqrt(1 - a))
     dist = radius * c
 
-    dist = metutils.convert(dist, "km", units)
+    if units not in (None, "km"):
+        dist = metutils.convert(dist, "km", units).astype(dtype)
 
     return dist
 
-def gridLatLonBear(cLon, cLat, lonArray, latArray):
+def gridLatLonBear(cLon, cLat, lonArray, latArray, dtype=float):
     """
     Generate a grid containing the bearing of the points defined by
     (lonArray,latArray) from the point defined by (cLon,cLat).
@@ -324,6 +327,7 @@ def gridLatLonBear(cLon, cLat, lonArray, latArray):
                      grid over which distances will be calculated.
     :param latArray: 1-d array of latitude values that will define the
                      grid over which distances will be calculated.
+    :param dtype: Floating point type of the returned grid.
     :returns: 2-d array containing the bearing (direction) of the points
               defined in ``lonArray`` and ``latArray`` from the point
               (``cLon``, ``cLat``)
@@ -414,9 +418,7 @@ def gridLatLonBear(cLon, cLat, lonArray, latArray):
 
     cLon = math.radians(cLon)
     cLat = math.radians(cLat)
-    lon_, lat_ = np.meshgrid(lon, lat)
-
-    dLon = lon_ - cLon
+    dLon, lat_ = np.meshgrid((lon - cLon).astype(dtype), lat.astype(dtype))
     #dLat= lat_ - cLat
 
     alpha = np.sin(dLon) * np.cos(lat_)
@@ -462,7 +464,7 @@ def theta2bearing(theta):
     return bearing
 
 def makeGrid(cLon, cLat, margin=2, resolution=0.01, minLon=None, maxLon=None,
-             minLat=None, maxLat=None):
+             minLat=None, maxLat=None, dtype=float):
     """
     Generate a grid of the distance and angle of a grid of points
     surrounding a storm centre given the location of the storm. The
@@ -478,6 +480,7 @@ def makeGrid(cLon, cLat, margin=2, resolution=0.01, minLon=None, maxLon=None,
     :param float maxLon: Maximum longitude of points to include in the grid.
     :param float minLat: Minimum latitude of points to include in the grid.
     :param float maxLat: Maximum latitude of points to include in the grid.
+    :param dtype: Floating point type of the returned grids.
 
     :returns: 2 2-d arrays containing the distance (km) and bearing (azimuthal)
               of all points in a grid from the ``cLon``, ``cLat``. 
@@ -486,31 +489,35 @@ def makeGrid(cLon, cLat, margin=2, resolution=0.01, minLon=None, maxLon=None,
         type(cLon)==np.ndarray or type(cLat)==np.ndarray):
         raise TypeError, "Input values must be scalar values"
 
-    gridSize = int(resolution * 1000)
+    gridSize = int(round(resolution * 1000))
 
     if minLon:
-        minLon_ = int(1000 * (minLon)) - int(1000 * margin)
+        minLon_ = int(1000 * (minLon)) - int(round(1000 * margin))
     else:
-        minLon_ = int(1000 * (cLon)) - int(1000 * margin)
+        minLon_ = int(1000 * (cLon)) - int(round(1000 * margin))
     if maxLon:
-        maxLon_ = int(1000 * (maxLon)) + int(1000 * margin) + 1
+        maxLon_ = int(1000 * (maxLon)) + int(round(1000 * margin)) + 1
     else:
-        maxLon_ = int(1000 * (cLon)) + int(1000 * margin) + 1
+        maxLon_ = int(1000 * (cLon)) + int(round(1000 * margin)) + 1
     if minLat:
-        minLat_ = int(1000 * (minLat)) - int(1000 * margin)
+        minLat_ = int(1000 * (minLat)) - int(round(1000 * margin))
     else:
-        minLat_ = int(1000 * (cLat)) - int(1000 * margin)
+        minLat_ = int(1000 * (cLat)) - int(round(1000 * margin))
     if maxLat:
-        maxLat_ = int(1000 * (maxLat)) + int(1000 * margin) + 1
+        maxLat_ = int(1000 * (maxLat)) + int(round(1000 * margin)) + 1
     else:
-        maxLat_ = int(1000 * (cLat)) + int(1000 * margin) + 1
+        maxLat_ = int(1000 * (cLat)) + int(round(1000 * margin)) + 1
 
     xGrid = np.array(np.arange(minLon_, maxLon_, gridSize), dtype=int)
     yGrid = np.array(np.arange(minLat_, maxLat_, gridSize), dtype=int)
 
-    R = gridLatLonDist(cLon, cLat, xGrid / 1000., yGrid / 1000.)
-    np.putmask(R, R==0, 1e-30)
-    theta = np.pi/2. - gridLatLonBear(cLon, cLat, xGrid / 1000., yGrid / 1000.)
+    R = gridLatLonDist(cLon, cLat, xGrid / 1000., yGrid / 1000., dtype=dtype)
+    # Powers of 1/R in the wind profiles overflow at 1e-30 in single
+    # precision, so use the machine epsilon as the minimum distance
+    rMin = 1e-30 if np.dtype(dtype) == np.float64 else np.finfo(dtype).eps
+    np.putmask(R, R==0, rMin)
+    theta = np.pi/2. - gridLatLonBear(cLon, cLat, xGrid / 1000., yGrid / 1000.,
+                                      dtype=dtype)
 
     return R, theta
 
@@ -539,10 +546,10 @@ def makeGridDomain(cLon, cLat, minLon, maxLon, minLat, maxLat,
         type(cLon)==np.ndarray or type(cLat)==np.ndarray):
         raise TypeError, "Input values must be scalar values"
     gridSize = int(resolution * 1000)
-    minLon_ = int(1000 * (minLon)) - int(1000 * margin)
-    maxLon_ = int(1000 * (maxLon)) + int(1000 * margin) + 1
-    minLat_ = int(1000 * (minLat)) - int(1000 * margin)
-    maxLat_ = int(1000 * (maxLat)) + int(1000 * margin) + 1
+    minLon_ = int(1000 * (minLon)) - int(round(1000 * margin))
+    maxLon_ = int(1000 * (maxLon)) + int(round(1000 * margin)) + 1
+    minLat_ = int(1000 * (minLat)) - int(round(1000 * margin))
+    maxLat_ = int(1000 * (maxLat)) + int(round(1000 * margin)) + 1
 
     xGrid = np.array(np.arange(minLon_, maxLon_, gridSize), dtype=int)
     yGrid = np.array(np.arange(minLat_, maxLat_, gridSize), dtype=int)
@@ -252,9 +252,63 @@ def ncCreateVar(ncobj, name, dimensions, dtype, data=None, atts=None, **kwargs):
             
     return var
 
+def ncChunkSizes(ncobj, dims, chunksizes):
+    """
+    Determine the chunk sizes of a variable, given the chunk sizes of
+    its trailing dimensions.
+
+    :param ncobj: :class:`netCDF4.Dataset` or :class:`netCDF4.Group` instance.
+    :param tuple dims: Dimension names of the variable.
+    :param tuple chunksizes: Chunk sizes of the trailing dimensions.
+
+    :returns: Chunk sizes of all dimensions of the variable, each no
+              larger than the size of the dimension.
+    :rtype: list
+
+    """
+    chunksizes = list(chunksizes)[-len(dims):]
+    chunksizes = [1] * (len(dims) - len(chunksizes)) + chunksizes
+    sizes = [len(ncobj.dimensions[d]) for d in dims]
+    return [max(1, min(c, n)) for c, n in zip(chunksizes, sizes)]
+
+def ncSaveOptions(config, section):
+    """
+    Read the compression and chunking settings for a gridded output
+    from a section of the configuration file. The options are
+    ``CompressionLevel`` (0 for no compression), ``Shuffle``,
+    ``ChunkSize`` (the lat, lon shape of each chunk, or 0 for the
+    library default) and ``LeastSignificantDigit`` (empty for no
+    quantisation).
+
+    :param config: :class:`Utilities.config.ConfigParser` instance.
+    :param str section: Name of the configuration section.
+
+    :returns: Keyword arguments for :func:`ncSaveGrid`.
+    :rtype: dict
+
+    """
+    options = {}
+    if config.has_option(section, 'CompressionLevel'):
+        complevel = config.getint(section, 'CompressionLevel')
+        options['zlib'] = complevel > 0
+        options['complevel'] = max(complevel, 1)
+    if config.has_option(section, 'Shuffle'):
+        options['shuffle'] = config.getboolean(section, 'Shuffle')
+    if config.has_option(section, 'ChunkSize'):
+        chunks = [int(c) for c in
+                  config.get(section, 'ChunkSize').split(',') if c.strip()]
+        if chunks and min(chunks) > 0:
+            options['chunksizes'] = tuple(chunks)
+    if config.has_option(section, 'LeastSignificantDigit'):
+        lsd = config.get(section, 'LeastSignificantDigit').strip()
+        if lsd:
+            options['lsd'] = int(lsd)
+    return options
+
 def ncSaveGrid(filename, dimensions, variables, nodata=-9999,
                 datatitle=None, gatts={}, writedata=True, 
-                keepfileopen=False, zlib=True, complevel=4, lsd=None):
+                keepfileopen=False, zlib=True, complevel=4, lsd=None,
+                shuffle=True, chunksizes=None):
     """
     Save a gridded dataset to a netCDF file using NetCDF4.
     
@@ -322,6 +376,16 @@ def ncSaveGrid(filename, dimensions, variables, nodata=-9999,
 
     :param integer lsd: Variable data will be truncated to this number of significant digits.
 
+    :param bool shuffle: If true, apply the shuffle filter before
+         compression. Ignored if zlib=False.
+
+    :param tuple chunksizes: Chunk sizes for the trailing dimensions of
+         each variable (e.g. the (lat, lon) shape of a chunk). Leading
+         dimensions have a chunk size of 1, and chunks are limited to the
+         size of each dimension. If not given, the library default
+         chunking is used. A variable dict can also set
+         'chunksizes' for that variable.
+
     :return: `netCDF4.Dataset` object (if keepfileopen=True)
     :rtype: :class:`netCDF4.Dataset`
 
@@ -368,10 +432,18 @@ def ncSaveGrid(filename, dimensions, variables, nodata=-9999,
         else:
             varlsd = lsd
 
+        varchunks = v.get('chunksizes', chunksizes)
+        if varchunks is not None and len(v['dims']) > 0:
+            varchunks = ncChunkSizes(ncobj, v['dims'], varchunks)
+        else:
+            varchunks = None
+
         var = ncobj.createVariable(v['name'], v['dtype'],
                                    v['dims'], 
                                    zlib=zlib,
                                    complevel=complevel,
+                                   shuffle=shuffle,
+                                   chunksizes=varchunks,
                                    least_significant_digit=varlsd,
                                    fill_value=nodata)
 
@@ -0,0 +1,125 @@
+"""
+:mod:`prefetch` - Produce the items of an iterator in a background thread
+=========================================================================
+
+.. module:: prefetch
+    :synopsis: Run an iterator in a background thread and pass its
+               items through a bounded queue, so that producing items
+               overlaps with consuming them.
+
+The background thread takes items from the iterator and puts them in
+a queue holding at most `maxsize` items: when it is full, the thread
+waits for the consumer to catch up, so the memory held by items that
+have been produced but not consumed is bounded. An exception raised by
+the iterator is re-raised in the consuming thread when it reaches that
+point of the iteration.
+
+With `maxsize` 0, items are produced in the consuming thread as they
+are requested.
+
+Example::
+
+    >>> with Prefetch(generateTracks(), 2) as tracks:
+    ...     for track in tracks:
+    ...         calculateWindfield(track)
+
+"""
+
+import sys
+import logging
+import threading
+import Queue
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+_END = object()
+
+
+class Prefetch(object):
+    """
+    Iterate over the items of an iterator produced in a background
+    thread.
+
+    :param iterable: the iterable producing the items.
+    :param int maxsize: Maximum number of items produced ahead of the
+                        consumer. If 0, no thread is used.
+
+    """
+
+    def __init__(self, iterable, maxsize=2):
+        self.iterator = iter(iterable)
+        self.maxsize = maxsize
+        self.thread = None
+        self.stopped = threading.Event()
+        if maxsize > 0:
+            self.queue = Queue.Queue(maxsize)
+            self.thread = threading.Thread(target=self._worker,
+                                           name='Prefetch')
+            self.thread.daemon = True
+            self.thread.start()
+
+    def _put(self, item):
+        """
+        Put an item in the queue, waiting while it is full unless the
+        consumer has stopped.
+
+        :returns: `False` if the consumer has stopped.
+
+        """
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except Queue.Full:
+                continue
+        return False
+
+    def _worker(self):
+        """
+        Produce items until the iterator is exhausted, it raises an
+        exception or the consumer stops.
+        """
+        try:
+            for item in self.iterator:
+                if not self._put((item, None)):
+                    return
+        except Exception:
+            log.exception("Producing items failed")
+            self._put((_END, sys.exc_info()))
+            return
+        self._put((_END, None))
+
+    def __iter__(self):
+        if self.thread is None:
+            for item in self.iterator:
+                yield item
+            return
+
+        while True:
+            item, error = self.queue.get()
+            if item is _END:
+                break
+            yield item
+
+        self.thread.join()
+        self.thread = None
+        if error is not None:
+            raise error[0], error[1], error[2]
+
+    def close(self):
+        """
+        Stop producing items and wait for the background thread to
+        finish the item it is producing.
+        """
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
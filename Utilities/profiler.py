@@ -0,0 +1,249 @@
+"""
+:mod:`profiler` - Named timing spans for profiling a model run
+==============================================================
+
+.. module:: profiler
+    :synopsis: Record the time spent in named sections of code, and
+               the bytes read and written, and save a summary of them.
+
+Code to be profiled is wrapped in a named span::
+
+    >>> from Utilities import profiler
+    >>> with profiler.span('wind.timestep'):
+    ...     calculate()
+
+or a function is decorated with :func:`timed`. Input and output is
+counted with :func:`addBytes`, and the largest amount of memory used
+by a span with :func:`addMemory`. Spans and byte counts are only recorded
+once profiling is turned on with :func:`enable`; until then
+:func:`span` returns a shared object that does nothing, so the
+instrumentation can be left in the code.
+
+Each process (MPI worker) records its own spans. At the end of a run,
+:func:`report` writes the count, total, mean, 95th percentile and
+maximum time of each span, the bytes read and written, and the peak
+memory, to a JSON file.
+
+"""
+
+import json
+import time
+import logging
+import platform
+import threading
+import numpy as np
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from functools import wraps
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+ENABLED = False
+
+_durations = {}
+_bytes = {}
+_memory = {}
+_lock = threading.Lock()
+
+
+class _NullSpan(object):
+    """A span that records nothing, used when profiling is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+NULLSPAN = _NullSpan()
+
+
+class Span(object):
+    """
+    Context manager recording the time spent in a named section of
+    code. Time is recorded whether or not the section raises an
+    exception.
+
+    :param str name: Name of the span.
+
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = time.time() - self.start
+        with _lock:
+            _durations.setdefault(self.name, []).append(duration)
+        return False
+
+
+def enable(flag=True):
+    """
+    Turn recording of spans on or off.
+
+    :param bool flag: `True` to record spans.
+
+    """
+    global ENABLED
+    ENABLED = flag
+
+
+def reset():
+    """Discard all recorded spans and byte counts"""
+    with _lock:
+        _durations.clear()
+        _bytes.clear()
+        _memory.clear()
+
+
+def span(name):
+    """
+    :param str name: Name of the span.
+
+    :returns: A context manager recording the time spent in it as
+              `name`, or one that does nothing if profiling is off.
+
+    """
+    if not ENABLED:
+        return NULLSPAN
+    return Span(name)
+
+
+def timed(name=None):
+    """
+    Decorator recording each call of a function as a span.
+
+    :param str name: Name of the span. Defaults to the name of the
+                     function.
+
+    """
+    def decorator(f):
+        spanName = name or f.__name__
+
+        @wraps(f)
+        def wrap(*args, **kwargs):
+            if not ENABLED:
+                return f(*args, **kwargs)
+            with Span(spanName):
+                return f(*args, **kwargs)
+        return wrap
+    return decorator
+
+
+def addBytes(name, read=0, written=0):
+    """
+    Count bytes read or written by the span `name`.
+
+    :param str name: Name of the span.
+    :param int read: Number of bytes read.
+    :param int written: Number of bytes written.
+
+    """
+    if not ENABLED:
+        return
+    with _lock:
+        counts = _bytes.setdefault(name, [0, 0])
+        counts[0] += read
+        counts[1] += written
+
+
+def peakMemory():
+    """
+    :returns: The peak resident memory of this process in bytes, or
+              `None` if it is not available on this platform.
+
+    """
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if platform.system() == 'Darwin':
+        return maxrss
+    return maxrss * 1024
+
+
+def addMemory(name, nbytes, process=None):
+    """
+    Record the memory used by the span `name`. The largest value
+    recorded for each span is kept.
+
+    :param str name: Name of the span.
+    :param int nbytes: Number of bytes held by the arrays of the span.
+    :param int process: Peak resident memory of the process in bytes
+                        (see :func:`peakMemory`).
+
+    """
+    if not ENABLED:
+        return
+    with _lock:
+        peaks = _memory.setdefault(name, [0, 0])
+        peaks[0] = max(peaks[0], nbytes)
+        peaks[1] = max(peaks[1], process or 0)
+
+
+def summary():
+    """
+    Summarise the spans recorded by this process.
+
+    :returns: :class:`dict` of the statistics of each span, keyed by
+              name: `count`, `total`, `mean`, `p95` and `max` time
+              (seconds), `bytesRead` and `bytesWritten`, and
+              `peakBytes` and `peakProcessBytes` from
+              :func:`addMemory`.
+
+    """
+    with _lock:
+        names = set(_durations) | set(_bytes) | set(_memory)
+        result = {}
+        for name in sorted(names):
+            durations = np.array(_durations.get(name, []))
+            read, written = _bytes.get(name, (0, 0))
+            peak, processPeak = _memory.get(name, (0, 0))
+            stats = {'count': len(durations), 'total': 0., 'mean': 0.,
+                     'p95': 0., 'max': 0.,
+                     'bytesRead': read, 'bytesWritten': written,
+                     'peakBytes': peak, 'peakProcessBytes': processPeak}
+            if len(durations) > 0:
+                stats.update(total=float(durations.sum()),
+                             mean=float(durations.mean()),
+                             p95=float(np.percentile(durations, 95)),
+                             max=float(durations.max()))
+            result[name] = stats
+    return result
+
+
+def report(filename, rank=0, size=1):
+    """
+    Write the summary of the spans recorded by this process to a JSON
+    file. Workers other than the first append their rank to the
+    filename, as for the log file.
+
+    :param str filename: Path of the report.
+    :param int rank: Rank of this process.
+    :param int size: Number of processes.
+
+    :returns: The path of the report written.
+
+    """
+    if rank > 0:
+        filename += '-' + str(rank)
+
+    data = {'rank': rank,
+            'size': size,
+            'host': platform.node(),
+            'spans': summary()}
+    with open(filename, 'w') as fh:
+        json.dump(data, fh, indent=2, sort_keys=True)
+
+    log.info("Profile report written to %s", filename)
+    return filename
@@ -413,7 +413,7 @@ def tracks2line(tracks, outputFile, dissolve=False):
 
     for track in tracks:
         if dissolve:
-            if len(track.data) > 1:
+            if len(track) > 1:
                 dlon = np.diff(track.Longitude)
                 if dlon.min() < -180:
                     # Track crosses 0E longitude - split track
@@ -452,13 +452,14 @@ def tracks2line(tracks, outputFile, dissolve=False):
             sf.record(*record)
 
         else:
-            if len(track.data) == 1:
+            data = track.data
+            if len(data) == 1:
                 line = [[[track.Longitude, track.Latitude],
                         [track.Longitude, track.Latitude]]]
                 sf.line(line)
-                sf.record(*track.data[0])
+                sf.record(*data[0])
             else:
-                for n in range(len(track.data) - 1):
+                for n in range(len(data) - 1):
                     dlon = track.Longitude[n + 1] - track.Longitude[n]
                     if dlon < -180.:
                         # case where the track crosses 0E:
@@ -470,14 +471,14 @@ def tracks2line(tracks, outputFile, dissolve=False):
                                     [track.Longitude[n + 1],
                                      track.Latitude[n + 1]]]]
                     sf.line(segment)
-                    sf.record(*track.data[n])
+                    sf.record(*data[n])
 
                 # Last point in the track:
                 sf.line([[[track.Longitude[n + 1],
                            track.Latitude[n + 1]],
                               [track.Longitude[n + 1],
                                track.Latitude[n + 1]]]])
-                sf.record(*track.data[n+1])
+                sf.record(*data[n+1])
 
     try:
         sf.save(outputFile)
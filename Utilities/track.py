@@ -1,5 +1,20 @@
 """
 Track-related attributes
+
+The tracks of a track file are held in a :class:`TrackCollection`,
+which stores each field of all the tracks in one contiguous array (a
+column), with the offset of the first record of each track. A
+:class:`Track` is a lightweight view of one track: each field is an
+attribute holding a slice of its column, so reading
+``track.Longitude[i]`` neither copies the data nor looks up the field.
+Operations on all the tracks (e.g. their bounds) are evaluated over
+the columns at once::
+
+    >>> tracks = TrackCollection.fromCycloneNumbers(data, trackfile)
+    >>> inside = tracks.inRegion(gridLimit)
+    >>> for track in tracks.select(inside):
+    ...     print(track.CentralPressure.min())
+
 """
 
 import numpy as np
@@ -19,7 +34,6 @@ trackFormats = ('%i, %i, %i, %i,'
                 '%i, %i, %i, %5.1f,' '%s',
                 '%8.3f, %8.3f, %6.2f, %6.2f, %7.2f,'
                 '%6.2f, %6.2f, %7.2f')
-                
 
 
 class Track(object):
@@ -36,33 +50,65 @@ class Track(object):
         t = Track(data)
         print(t.CentralPressure)
 
+    A track is a view of one track of a :class:`TrackCollection`; the
+    fields are slices of the columns of the collection, and must not be
+    modified. `Track(data)` creates a collection of the single track.
+
     :type  data: numpy.ndarray
     :param data: the tropical cyclone track data.
     """
 
-    def __init__(self, data):
+    __slots__ = ('collection', 'index', 'trackId', 'trackfile', 'params',
+                 'trackMinPressure', 'trackMaxWind')
+
+    def __new__(cls, data=None):
+        if cls is Track and data is not None:
+            cls = viewClass(data.dtype.names)
+        return object.__new__(cls)
+
+    def __init__(self, data=None):
         """
         :type  data: numpy.ndarray
         :param data: the tropical cyclone track data.
         """
-        self.data = data
-        self.trackId = None
-        self.trackfile = None
+        if data is not None:
+            collection = TrackCollection(data, [0, len(data)])
+            self._bind(collection, 0, 0, len(data))
+            self.trackId = None
+
+    def _bind(self, collection, index, start, end):
+        """
+        Make the track a view of track `index` of `collection`, which
+        holds records `start` to `end` of its columns.
+        """
+        self.collection = collection
+        self.index = index
+        for name, column in collection.columns.iteritems():
+            setattr(self, name, column[start:end])
+        self.trackId = (index, len(collection))
+        self.trackfile = collection.trackfile
+        self.params = None
         self.trackMinPressure = None
         self.trackMaxWind = None
 
-
-    def __getattr__(self, key):
+    @property
+    def data(self):
         """
-        Get the `key` from the `data` object.
-
-        :type  key: str
-        :param key: the key to lookup in the `data` object.
+        A copy of the records of the track, as a structured array.
+        Each access builds a new copy, so read it once rather than
+        record by record (or use the field attributes).
         """
-        if (key.startswith('__') and key.endswith('__')) or (key == 'data'):
-            return super(Track, self).__getattr__(key)
+        return self.collection.records(self.index)
 
-        return self.data[key]
+    def __len__(self):
+        offsets = self.collection.offsets
+        return int(offsets[self.index + 1] - offsets[self.index])
+
+    def __reduce__(self):
+        state = dict((key, getattr(self, key)) for key in
+                     ('trackId', 'trackfile', 'params', 'trackMinPressure',
+                      'trackMaxWind'))
+        return (_unpickleTrack, (self.data, state))
 
     def inRegion(self, gridLimit):
         """
@@ -73,8 +119,8 @@ class Track(object):
                           The :class:`dict` should contain the keys
                           :attr:`xMin`, :attr:`xMax`, :attr:`yMin` and
                           :attr:`yMax`. The *x* variable bounds the
-                          latitude and the *y* variable bounds the
-                          longitude.
+                          longitude and the *y* variable bounds the
+                          latitude.
 
         """
         xMin = gridLimit['xMin']
@@ -83,8 +129,257 @@ class Track(object):
         yMax = gridLimit['yMax']
 
         return ((xMin <= np.min(self.Longitude)) and
-                (np.max(self.Latitude) <= xMax) and
+                (np.max(self.Longitude) <= xMax) and
                 (yMin <= np.min(self.Latitude)) and
                 (np.max(self.Latitude) <= yMax))
-                
 
+
+def _unpickleTrack(data, state):
+    """
+    Recreate a pickled :class:`Track`.
+    """
+    track = Track(data)
+    for key, value in state.items():
+        setattr(track, key, value)
+    return track
+
+
+_viewClasses = {}
+
+def viewClass(names):
+    """
+    The subclass of :class:`Track` for tracks with the given fields,
+    with a slot for each field.
+
+    :param tuple names: names of the fields of the track data.
+
+    :returns: subclass of :class:`Track`.
+
+    """
+    names = tuple(names)
+    cls = _viewClasses.get(names)
+    if cls is None:
+        clash = set(names) & (set(dir(Track)) | set(Track.__slots__))
+        if clash:
+            raise ValueError("Track fields %s are reserved" %
+                             ', '.join(sorted(clash)))
+        cls = type('Track', (Track,), {'__slots__': names,
+                                       '__module__': __name__})
+        _viewClasses[names] = cls
+    return cls
+
+
+class TrackCollection(object):
+
+    """
+    The tropical cyclone tracks of a track file, stored as contiguous
+    columns with the offset of each track.
+
+    Iterating over the collection (or indexing it) gives a
+    :class:`Track` view of each track. The views share the columns of
+    the collection, so creating them copies no data.
+
+    :type  data: numpy.ndarray
+    :param data: the records of all the tracks (a structured array),
+                 with the records of each track together and in order.
+
+    :type  offsets: sequence of int
+    :param offsets: index of the first record of each track, followed
+                    by the total number of records.
+
+    :type  trackfile: str
+    :param trackfile: optional path of the track file.
+    """
+
+    def __init__(self, data, offsets, trackfile=None):
+        self.dtype = data.dtype
+        self.names = data.dtype.names
+        self.columns = dict((name, np.ascontiguousarray(data[name]))
+                            for name in self.names)
+        self.offsets = np.asarray(offsets, dtype=int)
+        self.trackfile = trackfile
+        self._view = viewClass(self.names)
+
+    @classmethod
+    def fromCycloneNumbers(cls, data, trackfile=None):
+        """
+        Collect the tracks numbered by the `CycloneNumber` field.
+
+        Tracks are numbered from 1; records with other numbers are
+        discarded. A number with no records gives an empty track, and
+        if there are no records, the collection holds one empty track.
+
+        :type  data: numpy.ndarray
+        :param data: the track data, e.g. from a track file.
+        :param str trackfile: optional path of the track file.
+
+        :rtype: :class:`TrackCollection`
+        """
+        if len(data) == 0:
+            return cls(data, [0, 0], trackfile)
+
+        number = data['CycloneNumber']
+        valid = number >= 1
+        if not valid.all():
+            data = data[valid]
+            number = number[valid]
+        if np.any(np.diff(number) < 0):
+            order = np.argsort(number, kind='mergesort')
+            data = data[order]
+            number = number[order]
+
+        counts = np.bincount(number)[1:]
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        return cls(data, offsets, trackfile)
+
+    @classmethod
+    def fromIndicator(cls, data, indicator, trackfile=None):
+        """
+        Collect tracks that start at each record where the indicator
+        is set. Records before the first track are discarded.
+
+        :type  data: numpy.ndarray
+        :param data: the track data.
+        :type  indicator: numpy.ndarray
+        :param indicator: 1 for the first record of each track, else 0.
+        :param str trackfile: optional path of the track file.
+
+        :rtype: :class:`TrackCollection`
+        """
+        starts = np.flatnonzero(indicator)
+        if len(starts) == 0:
+            return cls(data[:0], [0], trackfile)
+        data = data[starts[0]:]
+        offsets = np.append(starts - starts[0], len(data))
+        return cls(data, offsets, trackfile)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("Track index out of range")
+        track = object.__new__(self._view)
+        track._bind(self, index, self.offsets[index],
+                    self.offsets[index + 1])
+        return track
+
+    def __iter__(self):
+        offsets = self.offsets.tolist()
+        for index in xrange(len(self)):
+            track = object.__new__(self._view)
+            track._bind(self, index, offsets[index], offsets[index + 1])
+            yield track
+
+    def lengths(self):
+        """
+        :returns: :class:`numpy.ndarray` of the number of records of
+                  each track.
+        """
+        return np.diff(self.offsets)
+
+    def trackIndex(self):
+        """
+        :returns: :class:`numpy.ndarray` of the index of the track of
+                  each record.
+        """
+        return np.repeat(np.arange(len(self)), self.lengths())
+
+    def records(self, index=None):
+        """
+        A copy of the records of the tracks as a structured array.
+
+        :param int index: optional index of a single track.
+
+        :returns: :class:`numpy.ndarray` with the dtype of the track
+                  data.
+        """
+        if index is None:
+            start, end = 0, self.offsets[-1]
+        else:
+            start, end = self.offsets[index], self.offsets[index + 1]
+        data = np.empty(end - start, dtype=self.dtype)
+        for name in self.names:
+            data[name] = self.columns[name][start:end]
+        return data
+
+    def reduce(self, ufunc, name, empty=np.nan):
+        """
+        Reduce a field over the records of each track.
+
+        :param ufunc: binary :class:`numpy.ufunc`, e.g. `numpy.minimum`.
+        :param str name: name of the field.
+        :param float empty: value for tracks with no records.
+
+        :returns: :class:`numpy.ndarray` of the reduced value of each
+                  track.
+        """
+        result = np.empty(len(self))
+        result.fill(empty)
+        lengths = self.lengths()
+        nonEmpty = lengths > 0
+        if nonEmpty.any():
+            result[nonEmpty] = ufunc.reduceat(self.columns[name],
+                                              self.offsets[:-1][nonEmpty])
+        return result
+
+    def bounds(self):
+        """
+        The bounding box of each track. Tracks with no records have
+        NaN bounds.
+
+        :returns: `xMin`, `xMax`, `yMin`, `yMax` :class:`numpy.ndarray`
+                  of the longitude and latitude limits of each track.
+        """
+        return (self.reduce(np.minimum, 'Longitude'),
+                self.reduce(np.maximum, 'Longitude'),
+                self.reduce(np.minimum, 'Latitude'),
+                self.reduce(np.maximum, 'Latitude'))
+
+    def inRegion(self, gridLimit):
+        """
+        Check which tracks fall within a region (see
+        :meth:`Track.inRegion`). Tracks with no records are not in the
+        region.
+
+        :type  gridLimit: :class:`dict`
+        :param gridLimit: the region to check, with keys :attr:`xMin`,
+                          :attr:`xMax`, :attr:`yMin` and :attr:`yMax`.
+
+        :returns: :class:`numpy.ndarray` of `bool` for each track.
+        """
+        xMin, xMax, yMin, yMax = self.bounds()
+        with np.errstate(invalid='ignore'):
+            return ((gridLimit['xMin'] <= xMin) & (xMax <= gridLimit['xMax']) &
+                    (gridLimit['yMin'] <= yMin) & (yMax <= gridLimit['yMax']))
+
+    def select(self, tracks):
+        """
+        A collection of some of the tracks.
+
+        :param tracks: :class:`numpy.ndarray` of `bool` for each track,
+                       or of the indices of the tracks to keep.
+
+        :rtype: :class:`TrackCollection`
+        """
+        tracks = np.asarray(tracks)
+        if tracks.dtype == bool:
+            tracks = np.flatnonzero(tracks)
+        lengths = self.lengths()[tracks]
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        # Index of each selected record in the columns:
+        shift = np.repeat(self.offsets[tracks] - offsets[:-1], lengths)
+        records = np.arange(offsets[-1]) + shift
+
+        subset = object.__new__(TrackCollection)
+        subset.dtype = self.dtype
+        subset.names = self.names
+        subset.columns = dict((name, column[records])
+                              for name, column in self.columns.items())
+        subset.offsets = offsets
+        subset.trackfile = self.trackfile
+        subset._view = self._view
+        return subset
@@ -12,6 +12,7 @@
 
 import os
 import subprocess
+from os.path import join as pjoin, dirname, abspath, isfile
 from files import flModulePath, flModDate
 
 # Monkey patch check_output into subprocess for python 2.6.X
@@ -20,6 +21,11 @@ if 'check_output' not in dir(subprocess):
     subprocess.check_output = py26compat.check_output
 
 
+# The TCRM root directory
+ROOT = dirname(dirname(abspath(__file__)))
+
+_version = None
+
 UPDATE_MSG = """
 ----------------------------------------------------------
 Your TCRM version is not up-to-date. The last 3 things that
@@ -71,30 +77,73 @@ def status():
 
     return msg
 
+def headCommit(path=ROOT):
+    """
+    Read the commit hash of the current HEAD from the git metadata,
+    without running git.
+
+    :param str path: Root directory of the git checkout.
+
+    :returns: The commit hash, or `None` if it cannot be read (e.g.
+              `path` is not a git checkout).
+    :rtype: str
+
+    """
+    gitdir = pjoin(path, '.git')
+    try:
+        with open(pjoin(gitdir, 'HEAD')) as fh:
+            head = fh.read().strip()
+        if not head.startswith('ref: '):
+            # Detached HEAD
+            return head or None
+
+        ref = head[5:]
+        if isfile(pjoin(gitdir, ref)):
+            with open(pjoin(gitdir, ref)) as fh:
+                return fh.read().strip() or None
+
+        with open(pjoin(gitdir, 'packed-refs')) as fh:
+            for line in fh:
+                fields = line.split()
+                if len(fields) == 2 and fields[1] == ref:
+                    return fields[0]
+    except IOError:
+        pass
+    return None
+
+
 def version():
     """
     Check version of TCRM code.
 
-    :returns: Current git commit hash and the date/time
-             of the commit.
+    The commit hash is read from the git metadata of the TCRM
+    directory, falling back to running ``git``, then to the
+    modification date of the main script. The result is cached, so
+    only the first call does any work.
+
+    :returns: Current git commit hash, or the name and modification
+              date of the main script if it is not in a git checkout.
 
     :rtype: str
-    :raises: :mod:`subprocess.CalledProcessError` if the git
-             command fails.
-             
-    .. note:: This requires ``git`` to be installed to execute.
     """
-    
-    vers = ''
-
-    try:
-        vers = git('log -1 --date=iso --pretty=format:"%H"')
-    except subprocess.CalledProcessError:
-        # Case for missing git:
-        import inspect
-        path, name, ext = flModulePath(len(inspect.stack()))
-        fname = os.path.join(path, name+ext)
-        fdate = flModDate(fname)
-        vers = '{0} modified {1}'.format(fname, fdate)
-    
+    global _version
+    if _version is not None:
+        return _version
+
+    vers = headCommit()
+    if vers is None:
+        try:
+            with open(os.devnull, 'w') as devnull:
+                vers = subprocess.check_output(
+                    ['git', 'log', '-1', '--pretty=format:%H'],
+                    cwd=ROOT, stderr=devnull)
+        except (OSError, subprocess.CalledProcessError):
+            # Case for missing git:
+            import inspect
+            path, name, ext = flModulePath(len(inspect.stack()))
+            fname = os.path.join(path, name+ext)
+            fdate = flModDate(fname)
+            vers = '{0} modified {1}'.format(fname, fdate)
+
+    _version = vers
     return vers
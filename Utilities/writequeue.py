@@ -0,0 +1,124 @@
+"""
+:mod:`writequeue` - Write output files in a background thread
+=============================================================
+
+.. module:: writequeue
+    :synopsis: A bounded queue of output tasks, executed in a
+               background thread so that writing (and compressing)
+               output files overlaps with the calculations.
+
+A single writer thread executes the tasks in the order they are
+submitted. The queue holds at most `maxsize` pending tasks: when it is
+full, :meth:`WriteQueue.submit` blocks until the writer catches up, so
+the memory held by pending outputs is bounded. An exception raised by
+a task is re-raised in the submitting thread at the next call to
+:meth:`WriteQueue.submit` or :meth:`WriteQueue.shutdown`.
+
+With `maxsize` 0, tasks are executed immediately in the calling thread.
+
+Example::
+
+    >>> with WriteQueue(2) as writeQueue:
+    ...     for filename, data in outputs:
+    ...         writeQueue.submit(saveData, filename, data)
+
+"""
+
+import sys
+import logging
+import threading
+import Queue
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class WriteQueue(object):
+    """
+    A bounded queue of tasks executed in a background thread.
+
+    :param int maxsize: Maximum number of tasks waiting to be
+                        executed. If 0, tasks are executed
+                        synchronously by :meth:`submit`.
+
+    """
+
+    def __init__(self, maxsize=2):
+        self.maxsize = maxsize
+        self.error = None
+        self.thread = None
+        if maxsize > 0:
+            self.queue = Queue.Queue(maxsize)
+            self.thread = threading.Thread(target=self._worker,
+                                           name='WriteQueue')
+            self.thread.daemon = True
+            self.thread.start()
+
+    def _worker(self):
+        """
+        Execute tasks from the queue until the shutdown sentinel is
+        received. Once a task fails, later tasks are discarded.
+        """
+        while True:
+            task = self.queue.get()
+            try:
+                if task is None:
+                    return
+                if self.error is None:
+                    function, args, kwargs = task
+                    function(*args, **kwargs)
+            except Exception:
+                log.exception("Writing output failed")
+                self.error = sys.exc_info()
+            finally:
+                self.queue.task_done()
+
+    def _raise(self):
+        """Re-raise the exception of a failed task"""
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error[0], error[1], error[2]
+
+    def submit(self, function, *args, **kwargs):
+        """
+        Queue a call to `function` with the given arguments. Blocks
+        while the queue is full.
+
+        :param function: the function to call.
+
+        :raises: The exception of any earlier task that failed.
+
+        """
+        self._raise()
+        if self.thread is None:
+            function(*args, **kwargs)
+        else:
+            self.queue.put((function, args, kwargs))
+
+    def shutdown(self):
+        """
+        Wait for all queued tasks to complete and stop the writer
+        thread.
+
+        :raises: The exception of any task that failed.
+
+        """
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        self._raise()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.shutdown()
+        else:
+            # Don't mask the original exception
+            try:
+                self.shutdown()
+            except Exception:
+                pass
+        return False
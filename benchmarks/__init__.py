@@ -0,0 +1,16 @@
+"""
+:mod:`benchmarks` -- performance benchmarks for TCRM
+====================================================
+
+.. module:: benchmarks
+    :synopsis: Time the main components of TCRM on synthetic input
+               data, and record the results for comparison between
+               revisions.
+
+The benchmarks run the stages of the model in order on a synthetic
+workspace (track database, land mask and MSLP climatology) created by
+:mod:`benchmarks.fixtures`, at one of the sizes in
+:data:`benchmarks.fixtures.SIZES`. The results are saved as JSON by
+:mod:`benchmarks.run`, which can also compare two sets of results.
+
+"""
@@ -0,0 +1,280 @@
+"""
+:mod:`fixtures` -- synthetic input data for the benchmarks
+==========================================================
+
+.. module:: fixtures
+    :synopsis: Create a workspace of synthetic input data and a
+               configuration file to run the benchmarks.
+
+The workspace contains a track database of synthetic cyclones moving
+west-south-west then poleward off the north-west coast of Australia,
+a land mask with a rectangular continent, and a daily MSLP climatology
+with a seasonal cycle. The data are random but repeatable (each
+function takes a seed), so results at a given size are comparable
+between revisions.
+
+"""
+
+import os
+import numpy as np
+
+from datetime import datetime, timedelta
+from os.path import join as pjoin
+
+from Utilities.nctools import ncSaveGrid
+
+# Scale of each benchmark size:
+#   seasons, stormsPerSeason -- size of the historical track database
+#   simulations -- number of simulated years of tracks
+#   tracks -- number of tracks generated by the track generator kernel
+#   resolution -- wind field grid spacing (degrees)
+#   timesteps -- number of time steps of the wind field track
+#   hazardGrid -- (lat, lon) size of the hazard fitting grid
+#   records -- number of wind speed records at each hazard grid point
+SIZES = {
+    'small': dict(seasons=10, stormsPerSeason=10, simulations=5,
+                  tracks=20, resolution=0.1, timesteps=12,
+                  hazardGrid=(20, 20), records=50),
+    'medium': dict(seasons=30, stormsPerSeason=15, simulations=50,
+                   tracks=100, resolution=0.05, timesteps=48,
+                   hazardGrid=(50, 50), records=200),
+    'large': dict(seasons=60, stormsPerSeason=20, simulations=500,
+                  tracks=500, resolution=0.02, timesteps=96,
+                  hazardGrid=(100, 100), records=1000),
+}
+
+GRID_LIMIT = {'xMin': 110., 'xMax': 130., 'yMin': -25., 'yMax': -10.}
+
+# Land is the region within these limits:
+LAND_LIMIT = {'xMin': 113., 'xMax': 154., 'yMin': -39., 'yMax': -18.}
+
+SOURCE = 'SYNTHETIC'
+
+CONFIG = """[Actions]
+DataProcess=True
+ExecuteStat=True
+ExecuteTrackGenerator=True
+ExecuteWindfield=True
+ExecuteHazard=True
+ExecuteEvaluate=True
+PlotData=False
+PlotHazard=False
+DownloadData=False
+
+[DataProcess]
+InputFile={inputFile}
+Source={source}
+StartSeason=1900
+FilterSeasons=False
+
+[Region]
+gridLimit={gridLimit}
+gridSpace={{'x':2.0,'y':2.0}}
+gridInc={{'x':1.0,'y':1.0}}
+
+[StatInterface]
+kdeType=Biweight
+kde2DType=Gaussian
+kdeStep=0.2
+minSamplesCell=20
+
+[TrackGenerator]
+NumSimulations={simulations}
+YearsPerSimulation=1
+NumTimeSteps=240
+TimeStep=1.0
+SeasonSeed=1
+TrackSeed=1
+
+[WindfieldInterface]
+profileType=powell
+windFieldType=kepert
+Margin=2
+Resolution={resolution}
+
+[Hazard]
+Years=5,10,20,50,100,200,500
+MinimumRecords=10
+CalculateCI=False
+
+[Input]
+LandMask={landmask}
+MSLPFile={mslp}
+
+[Output]
+Path={outputPath}
+
+[Logging]
+ProgressBar=False
+LogFile={outputPath}/log/benchmark.log
+LogLevel=WARNING
+Verbose=False
+
+[RMW]
+GetRMWDistFromInputData=False
+mean=50.0
+sigma=0.6
+
+[{source}]
+Path={inputPath}
+Filename={inputName}
+Columns=tcserialno,season,num,date,lat,lon,pressure
+FieldDelimiter=,
+NumberOfHeadingLines=1
+DateFormat=%Y-%m-%d %H:%M:%S
+PressureUnits=hPa
+LengthUnits=km
+SpeedUnits=kph
+"""
+
+
+def writeTrackDatabase(filename, seasons, stormsPerSeason, seed=1):
+    """
+    Write a database of synthetic cyclone tracks, with 6-hourly
+    observations of position and central pressure.
+
+    :param str filename: Path of the csv file to create.
+    :param int seasons: Number of seasons in the database.
+    :param int stormsPerSeason: Number of cyclones in each season.
+    :param int seed: Seed of the random number generator.
+
+    :returns: Number of observations written.
+
+    """
+    rng = np.random.RandomState(seed)
+    nobs = 0
+    with open(filename, 'w') as fh:
+        fh.write('Serial_Num,Season,Num,ISO_time,Latitude,Longitude,'
+                 'Pressure\n')
+        for season in range(1981, 1981 + seasons):
+            for num in range(1, stormsPerSeason + 1):
+                start = datetime(season - 1, 11, 1) + \
+                    timedelta(hours=6 * rng.randint(0, 600))
+                serial = '%d%03dS%03d' % (start.year,
+                                          start.timetuple().tm_yday, num)
+                nsteps = rng.randint(16, 60)
+                lon = rng.uniform(105., 135.)
+                lat = rng.uniform(-18., -8.)
+                bearing = rng.uniform(230., 260.)
+                speed = rng.uniform(0.6, 1.2)
+                minPressure = rng.uniform(930., 995.)
+                peak = rng.randint(nsteps // 3, 2 * nsteps // 3 + 1)
+                for i in range(nsteps):
+                    # Deepen to the minimum pressure, then fill
+                    pressure = 1005. - (1005. - minPressure) * \
+                        np.exp(-((i - peak) / (0.3 * nsteps)) ** 2)
+                    fh.write('%s,%d,%d,%s,%.2f,%.2f,%.1f\n' %
+                             (serial, season, num,
+                              (start + timedelta(hours=6 * i)).strftime(
+                                  '%Y-%m-%d %H:%M:%S'),
+                              lat, lon, pressure))
+                    # Recurve towards the south-east
+                    bearing = bearing - rng.uniform(0., 6.)
+                    theta = np.radians(bearing)
+                    lon += speed * np.sin(theta)
+                    lat += speed * np.cos(theta)
+                nobs += nsteps
+    return nobs
+
+
+def writeLandmask(filename, resolution=0.5):
+    """
+    Write a global land mask, with land inside :data:`LAND_LIMIT`.
+
+    :param str filename: Path of the netcdf file to create.
+    :param float resolution: Grid spacing (degrees).
+
+    """
+    lon = np.arange(0., 360., resolution)
+    lat = np.arange(-90., 90., resolution)
+    land = np.zeros((len(lat), len(lon)), 'i')
+    land[np.ix_((lat >= LAND_LIMIT['yMin']) & (lat <= LAND_LIMIT['yMax']),
+                (lon >= LAND_LIMIT['xMin']) &
+                (lon <= LAND_LIMIT['xMax']))] = 1
+
+    dimensions = {
+        0: {'name': 'lat', 'values': lat, 'dtype': 'f',
+            'atts': {'units': 'degrees_north'}},
+        1: {'name': 'lon', 'values': lon, 'dtype': 'f',
+            'atts': {'units': 'degrees_east'}}}
+    variables = {
+        0: {'name': 'landmask', 'dims': ('lat', 'lon'), 'values': land,
+            'dtype': 'i', 'atts': {'long_name': 'Land mask'}}}
+    ncSaveGrid(filename, dimensions, variables, nodata=-1)
+
+
+def writeMSLP(filename, ntimes=73, resolution=2.5):
+    """
+    Write a global daily MSLP climatology, with a subtropical ridge
+    that moves with the seasons.
+
+    :param str filename: Path of the netcdf file to create.
+    :param int ntimes: Number of times through the year.
+    :param float resolution: Grid spacing (degrees).
+
+    """
+    time = np.arange(ntimes) * 365. / ntimes
+    lat = np.arange(-90., 90. + resolution / 2., resolution)
+    lon = np.arange(0., 360., resolution)
+    season = np.cos(2. * np.pi * time / 365.)
+    ridge = -30. - 5. * season
+    slp = 101000. + 1200. * np.exp(-((lat[None, :] - ridge[:, None]) /
+                                     15.) ** 2)
+    slp = slp[:, :, None] + 200. * np.cos(np.radians(lon))[None, None, :]
+
+    dimensions = {
+        0: {'name': 'time', 'values': time, 'dtype': 'f',
+            'atts': {'units': 'days since 0001-01-01 00:00:00'}},
+        1: {'name': 'lat', 'values': lat, 'dtype': 'f',
+            'atts': {'units': 'degrees_north'}},
+        2: {'name': 'lon', 'values': lon, 'dtype': 'f',
+            'atts': {'units': 'degrees_east'}}}
+    variables = {
+        0: {'name': 'slp', 'dims': ('time', 'lat', 'lon'), 'values': slp,
+            'dtype': 'f', 'atts': {'units': 'Pa'}}}
+    ncSaveGrid(filename, dimensions, variables)
+
+
+def createWorkspace(path, size='small', seed=1):
+    """
+    Create the input data, output directories and configuration file
+    of a benchmark workspace.
+
+    :param str path: Directory of the workspace.
+    :param str size: Benchmark size, one of the keys of :data:`SIZES`.
+    :param int seed: Seed of the random number generator.
+
+    :returns: Path to the configuration file.
+
+    """
+    scale = SIZES[size]
+    inputPath = pjoin(path, 'input')
+    outputPath = pjoin(path, 'output')
+    for subdir in [inputPath, outputPath] + \
+        [pjoin(outputPath, d) for d in ['tracks', 'hazard', 'windfield',
+                                        'plots', 'plots/hazard',
+                                        'plots/stats', 'log', 'process',
+                                        'process/timeseries',
+                                        'process/dat']]:
+        if not os.path.isdir(subdir):
+            os.makedirs(subdir)
+
+    inputFile = pjoin(inputPath, 'tracks.csv')
+    landmask = pjoin(inputPath, 'landmask.nc')
+    mslp = pjoin(inputPath, 'slp.nc')
+    writeTrackDatabase(inputFile, scale['seasons'],
+                       scale['stormsPerSeason'], seed)
+    writeLandmask(landmask)
+    writeMSLP(mslp)
+
+    configFile = pjoin(path, 'benchmark.ini')
+    with open(configFile, 'w') as fh:
+        fh.write(CONFIG.format(inputFile=inputFile, source=SOURCE,
+                               inputPath=inputPath,
+                               inputName=os.path.basename(inputFile),
+                               gridLimit=repr(GRID_LIMIT),
+                               simulations=scale['simulations'],
+                               resolution=scale['resolution'],
+                               landmask=landmask, mslp=mslp,
+                               outputPath=outputPath))
+    return configFile
@@ -0,0 +1,269 @@
+"""
+:mod:`run` -- run the benchmarks and compare results
+====================================================
+
+.. module:: run
+    :synopsis: Run the benchmark suite on a synthetic workspace and
+               save the timings as JSON, or compare two sets of
+               saved timings.
+
+Run from the TCRM root directory::
+
+    python -m benchmarks.run --size small --repeat 3 --output base.json
+    python -m benchmarks.run --only wind.powell --output new.json
+    python -m benchmarks.run --compare base.json new.json --threshold 0.1
+
+The results contain the revision (if run in a git checkout), the
+versions of Python and numpy, the platform and the benchmark size,
+and for each case the time of each repetition, the minimum and the
+mean. Cases that need a missing optional dependency, or a model
+method that is not implemented (e.g. the pressure profile of some wind
+profiles), are reported as ``skipped``, and cases that fail are
+reported as ``error`` (the
+traceback is written to the workspace log file), without stopping the
+remaining cases.
+
+When comparing, a case is a regression if its minimum time increased
+by more than the threshold fraction, and the exit status is 1 if there
+are any regressions.
+
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import platform
+import argparse
+import tempfile
+import warnings
+import subprocess
+import timeit
+
+from os.path import join as pjoin, dirname, abspath
+
+if __name__ == '__main__' and __package__ is None:
+    sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+import numpy as np
+
+from benchmarks.fixtures import SIZES, createWorkspace
+from benchmarks.suite import Workspace, cases
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+def revision():
+    """
+    :returns: The git commit of the TCRM code, or `None` if it is not
+              in a git checkout.
+    """
+    try:
+        with open(os.devnull, 'w') as devnull:
+            commit = subprocess.check_output(
+                ['git', 'rev-parse', 'HEAD'],
+                cwd=dirname(dirname(abspath(__file__))), stderr=devnull)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit.strip()
+
+
+def metadata(size, repeat):
+    """
+    :returns: :class:`dict` describing the benchmark run.
+    """
+    return {'commit': revision(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'size': size,
+            'scale': SIZES[size],
+            'repeat': repeat}
+
+
+def runCase(case, workspace, repeat):
+    """
+    Time a benchmark case.
+
+    :param case: :class:`benchmarks.suite.Case` to run.
+    :param workspace: :class:`benchmarks.suite.Workspace` to run it in.
+    :param int repeat: Number of repetitions.
+
+    :returns: :class:`dict` of the status and timings of the case.
+
+    """
+    times = []
+    try:
+        for _ in range(repeat):
+            args = case.arguments(workspace)
+            start = timeit.default_timer()
+            case.function(*args)
+            times.append(timeit.default_timer() - start)
+    except ImportError as e:
+        return {'status': 'skipped', 'message': str(e)}
+    except NotImplementedError:
+        return {'status': 'skipped', 'message': 'Not implemented'}
+    except Exception as e:  # pylint: disable=W0703
+        log.exception("Benchmark %s failed", case.name)
+        return {'status': 'error',
+                'message': '{0}: {1}'.format(type(e).__name__, e)}
+
+    return {'status': 'ok', 'times': times,
+            'min': min(times), 'mean': float(np.mean(times))}
+
+
+def runSuite(size='small', repeat=1, workdir=None, only=None,
+             stream=sys.stdout):
+    """
+    Create a synthetic workspace and run the benchmark cases.
+
+    :param str size: Benchmark size, one of the keys of
+                     :data:`benchmarks.fixtures.SIZES`.
+    :param int repeat: Number of repetitions of each case.
+    :param str workdir: Directory of the workspace. If `None`, a
+                        temporary directory is used and removed
+                        afterwards.
+    :param list only: If given, run only the cases with a name
+                      starting with one of these prefixes, and the
+                      stages before them (reported as ``setup``).
+    :param stream: File to report progress to, or `None`.
+
+    :returns: :class:`dict` of the metadata and results of each case.
+
+    """
+    from Utilities.files import flStartLog
+
+    cleanup = workdir is None
+    if cleanup:
+        workdir = tempfile.mkdtemp(prefix='tcrm-benchmark-')
+
+    try:
+        configFile = createWorkspace(workdir, size)
+        flStartLog(pjoin(workdir, 'output', 'log', 'benchmark.log'),
+                   'WARNING')
+        workspace = Workspace(configFile, SIZES[size])
+
+        suite = cases()
+        if only:
+            selected = [case for case in suite
+                        if any(case.name.startswith(prefix)
+                               for prefix in only)]
+            # Stages before the last selected case provide its input
+            last = suite.index(selected[-1]) if selected else -1
+            suite = [case for i, case in enumerate(suite)
+                     if case in selected or (case.stage and i < last)]
+        else:
+            selected = suite
+
+        results = {}
+        for case in suite:
+            if case in selected:
+                result = runCase(case, workspace, repeat)
+            else:
+                result = runCase(case, workspace, 1)
+                if result['status'] == 'ok':
+                    result['status'] = 'setup'
+            results[case.name] = result
+            if stream is not None:
+                stream.write(formatResult(case.name, result) + '\n')
+                stream.flush()
+    finally:
+        if cleanup:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {'metadata': metadata(size, repeat), 'results': results}
+
+
+def formatResult(name, result):
+    """
+    :returns: A line reporting the result of the case `name`.
+    """
+    if result['status'] in ('ok', 'setup'):
+        return '{0:<40s} {1:>10.4f} {2:>10.4f}  {3}'.format(
+            name, result['min'], result['mean'], result['status'])
+    return '{0:<40s} {1:>10s} {1:>10s}  {2}: {3}'.format(
+        name, '-', result['status'], result['message'])
+
+
+def compare(base, new, threshold=0.1):
+    """
+    Compare the minimum times of the cases in two sets of results.
+
+    :param dict base: Results of the reference run.
+    :param dict new: Results of the run to compare.
+    :param float threshold: Fractional increase in time above which
+                            a case is a regression.
+
+    :returns: list of (name, base time, new time, ratio) of the cases
+              that are `ok` in both results, sorted by name, and the
+              list of names of the regressions.
+
+    """
+    rows = []
+    regressions = []
+    for name in sorted(set(base['results']) & set(new['results'])):
+        old, now = base['results'][name], new['results'][name]
+        if old['status'] != 'ok' or now['status'] != 'ok':
+            continue
+        ratio = now['min'] / old['min'] if old['min'] > 0 else np.inf
+        rows.append((name, old['min'], now['min'], ratio))
+        if ratio > 1. + threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def main(argv=None):
+    """
+    Parse the command line and run the benchmarks or the comparison.
+
+    :returns: The exit status.
+
+    """
+    parser = argparse.ArgumentParser(description='Run TCRM benchmarks')
+    parser.add_argument('-s', '--size', choices=sorted(SIZES),
+                        default='small', help='Size of the workspace')
+    parser.add_argument('-r', '--repeat', type=int, default=1,
+                        help='Number of repetitions of each case')
+    parser.add_argument('-o', '--output', help='JSON file of results')
+    parser.add_argument('-k', '--only', action='append',
+                        help='Run only the cases starting with this name')
+    parser.add_argument('-w', '--workdir',
+                        help='Directory of the workspace (kept after '
+                             'the run)')
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'NEW'),
+                        help='Compare two JSON files of results')
+    parser.add_argument('-t', '--threshold', type=float, default=0.1,
+                        help='Fractional slowdown reported as a '
+                             'regression')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as fh:
+            base = json.load(fh)
+        with open(args.compare[1]) as fh:
+            new = json.load(fh)
+        rows, regressions = compare(base, new, args.threshold)
+        print 'Comparing {0} ({1}) with {2} ({3})'.format(
+            args.compare[0], base['metadata']['commit'],
+            args.compare[1], new['metadata']['commit'])
+        for name, old, now, ratio in rows:
+            flag = '  REGRESSION' if name in regressions else ''
+            print '{0:<40s} {1:>10.4f} {2:>10.4f} {3:>7.2f}x{4}'.format(
+                name, old, now, ratio, flag)
+        return 1 if regressions else 0
+
+    warnings.filterwarnings('ignore')
+    results = runSuite(args.size, args.repeat, args.workdir, args.only)
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
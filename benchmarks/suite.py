@@ -0,0 +1,284 @@
+"""
+:mod:`suite` -- benchmark cases
+===============================
+
+.. module:: suite
+    :synopsis: The benchmark cases, in the order they are run.
+
+Each :class:`Case` has an optional `setup` function, which is not
+timed, and a `function` that is timed. The setup function is given the
+:class:`Workspace` and returns the arguments of the timed function.
+
+The kernel cases (``wind.<profile>.<field>``, ``hazard.calculate``
+and ``trackgenerator.generateTracks``) time the core calculation of a
+stage on a fixed amount of work. The ``wind.<profile>.<field>.lookup``
+cases interpolate the profile from radial lookup tables. The stage cases (``dataprocess``,
+``statistics.*``, ``trackgenerator``, ``windfield`` and ``hazard``)
+run the stages of the model in order, each using the output of the
+previous stages, as :mod:`tcrm` does. The ``evaluate.*`` cases use
+the historical and synthetic tracks from the stages.
+
+"""
+
+import numpy as np
+
+from datetime import datetime, timedelta
+from os.path import join as pjoin
+
+from Utilities.config import ConfigParser
+from Utilities.parallel import attemptParallel
+
+
+class Workspace(object):
+    """
+    The configuration and scale of a benchmark run.
+
+    :param str configFile: Path to the configuration file.
+    :param dict scale: Scale parameters (one of the values of
+                       :data:`benchmarks.fixtures.SIZES`).
+
+    """
+
+    def __init__(self, configFile, scale):
+        self.configFile = configFile
+        self.scale = scale
+
+
+class Case(object):
+    """
+    A benchmark case.
+
+    :param str name: Name of the case.
+    :param function: The function to time.
+    :param setup: Optional function called with the :class:`Workspace`
+                  before each repetition, returning a tuple of the
+                  arguments of `function`.
+    :param bool stage: `True` if later cases use the output of this
+                       case.
+
+    """
+
+    def __init__(self, name, function, setup=None, stage=False):
+        self.name = name
+        self.function = function
+        self.setup = setup
+        self.stage = stage
+
+    def arguments(self, workspace):
+        """
+        :returns: The arguments of the timed function.
+        """
+        if self.setup is None:
+            return (workspace.configFile,)
+        return self.setup(workspace)
+
+
+def noProgress(done, total):
+    """Progress callback that does nothing"""
+    pass
+
+
+def syntheticTrack(n, dt=1.):
+    """
+    A track of a mature cyclone moving south-west at about 5 m/s
+    across the benchmark domain.
+
+    :param int n: Number of time steps.
+    :param float dt: Time step (hours).
+
+    :returns: :class:`wind.Track`
+
+    """
+    import wind
+    data = np.empty(n, dtype={'names': wind.TRACKFILE_COLS,
+                              'formats': wind.TRACKFILE_FMTS})
+    hours = dt * np.arange(n)
+    data['CycloneNumber'] = 1
+    data['Datetime'] = [datetime(2000, 1, 1) + timedelta(hours=h)
+                        for h in hours]
+    data['TimeElapsed'] = hours
+    data['Longitude'] = 122. - 0.035 * hours
+    data['Latitude'] = -14. - 0.035 * hours
+    data['Speed'] = 5.
+    data['Bearing'] = np.radians(225.)
+    data['CentralPressure'] = 95000. + 50. * hours
+    data['EnvPressure'] = 101000.
+    data['rMax'] = 30.
+    return wind.Track(data)
+
+
+# Stage cases
+
+
+def runDataProcess(configFile):
+    from DataProcess.DataProcess import DataProcess
+    DataProcess(configFile).processData()
+
+
+def setupStatInterface(workspace):
+    from DataProcess.CalcTrackDomain import CalcTrackDomain
+    from StatInterface.StatInterface import StatInterface
+    domain = CalcTrackDomain(workspace.configFile).calcDomainFromFile()
+    return (StatInterface(workspace.configFile,
+                          autoCalc_gridLimit=domain),)
+
+
+def statisticsCase(method):
+    """
+    :returns: :class:`Case` calling `method` of
+              :class:`StatInterface.StatInterface.StatInterface`.
+    """
+    def function(statInterface):
+        getattr(statInterface, method)()
+    return Case('statistics.' + method, function, setupStatInterface,
+                stage=True)
+
+
+def runTrackGenerator(configFile):
+    import TrackGenerator
+    TrackGenerator.run(configFile, noProgress)
+
+
+def runWindfield(configFile):
+    import wind
+    wind.run(configFile, noProgress)
+
+
+def runStreamedWindfield(configFile):
+    import wind
+    wind.run(configFile, noProgress, stream=True)
+
+
+def runHazard(configFile):
+    import hazard
+    hazard.run(configFile)
+
+
+# Kernel cases
+
+
+def setupTrackGenerator(workspace):
+    """
+    Load a :class:`TrackGenerator.TrackGenerator.TrackGenerator` as
+    :func:`TrackGenerator.run` does, and seed the random number
+    generator.
+    """
+    import TrackGenerator.TrackGenerator as trackgen
+    from TrackGenerator.trackLandfall import LandfallDecay
+    from DataProcess.CalcTrackDomain import CalcTrackDomain
+
+    configFile = workspace.configFile
+    config = ConfigParser()
+    config.read(configFile)
+    dt = config.getfloat('TrackGenerator', 'TimeStep')
+    processPath = pjoin(config.get('Output', 'Path'), 'process')
+    gridLimit = CalcTrackDomain(configFile).calcDomainFromFile()
+
+    tg = trackgen.TrackGenerator(processPath, gridLimit,
+                                 config.geteval('Region', 'GridSpace'),
+                                 config.geteval('Region', 'GridInc'),
+                                 trackgen.SamplePressure(
+                                     config.get('Input', 'MSLPFile')),
+                                 LandfallDecay(configFile, dt), dt=dt,
+                                 maxTimeSteps=config.getint(
+                                     'TrackGenerator', 'NumTimeSteps'))
+    tg.loadInitialConditionDistributions()
+    tg.loadCellStatistics()
+    trackgen.PRNG.seed(config.getint('TrackGenerator', 'TrackSeed'))
+    return tg, workspace.scale['tracks']
+
+
+def generateTracks(tg, ntracks):
+    tg.generateTracks(ntracks)
+
+
+def windCase(profileType, windFieldType, profileTolerance=0.):
+    """
+    :returns: :class:`Case` calculating the regional extremes of
+              a synthetic track with the given profile and field. If
+              `profileTolerance` is set, the profile is interpolated
+              from radial lookup tables (the ``.lookup`` cases).
+    """
+    def setup(workspace):
+        import wind
+        track = syntheticTrack(workspace.scale['timesteps'])
+        wfg = wind.WindfieldGenerator(None, margin=2.,
+                                      resolution=workspace.scale[
+                                          'resolution'],
+                                      profileType=profileType,
+                                      windFieldType=windFieldType,
+                                      profileTolerance=profileTolerance)
+        wfg.setGridLimit(track)
+        return (wfg.windfieldAroundTrack(track), wfg.gridLimit)
+
+    def function(wt, gridLimit):
+        wt.regionalExtremes(gridLimit)
+
+    name = 'wind.%s.%s' % (profileType, windFieldType)
+    if profileTolerance > 0:
+        name += '.lookup'
+    return Case(name, function, setup)
+
+
+def setupHazard(workspace):
+    """
+    Gumbel distributed wind speeds at each point of the hazard grid.
+    """
+    ny, nx = workspace.scale['hazardGrid']
+    nrecords = workspace.scale['records']
+    rng = np.random.RandomState(1)
+    Vr = rng.gumbel(25., 5., (nrecords, ny, nx)).astype('f')
+    years = np.array([5, 10, 20, 50, 100, 200, 500, 1000])
+    return (Vr, years, -9999., 10, 1)
+
+
+def calculateHazard(Vr, years, nodata, minRecords, yrsPerSim):
+    import hazard
+    hazard.calculate(Vr, years, nodata, minRecords, yrsPerSim)
+
+
+def evaluateCase(name):
+    """
+    :returns: :class:`Case` running the historic and synthetic
+              calculations of the :mod:`Evaluate` class `name`.
+    """
+    def setup(workspace):
+        # Each class is in the module of the same name, e.g.
+        # Evaluate.trackDensity.TrackDensity
+        module = __import__('Evaluate.' + name[0].lower() + name[1:],
+                            fromlist=[name])
+        module.pp = attemptParallel()
+        return (getattr(module, name)(workspace.configFile),)
+
+    def function(evaluation):
+        evaluation.historic()
+        evaluation.synthetic()
+
+    return Case('evaluate.' + name, function, setup)
+
+
+def cases():
+    """
+    :returns: list of all :class:`Case`, in the order they are run.
+    """
+    from wind.windmodels import PROFILES, FIELDS
+
+    suite = [windCase(profileType, windFieldType, profileTolerance)
+             for profileType in sorted(PROFILES)
+             for windFieldType in sorted(FIELDS)
+             for profileTolerance in [0., 1e-3]]
+    suite += [Case('hazard.calculate', calculateHazard, setupHazard),
+              Case('dataprocess', runDataProcess, stage=True)]
+    suite += [statisticsCase(method) for method in
+              ['kdeGenesisDate', 'kdeOrigin', 'cdfCellBearing',
+               'cdfCellSpeed', 'cdfCellPressure', 'calcCellStatistics']]
+    suite += [Case('trackgenerator.generateTracks', generateTracks,
+                   setupTrackGenerator),
+              Case('trackgenerator', runTrackGenerator, stage=True),
+              Case('windfield', runWindfield, stage=True),
+              Case('windfield.stream', runStreamedWindfield),
+              Case('hazard', runHazard, stage=True)]
+    suite += [evaluateCase(name) for name in
+              ['PressureDistribution', 'TrackDensity', 'LongitudeCrossing',
+               'LandfallRates', 'GenesisDensity']]
+    return suite
@@ -37,6 +37,7 @@ from Utilities.files import flProgramVersion
 from Utilities.config import ConfigParser
 from Utilities.parallel import attemptParallel, disableOnWorkers
 import Utilities.nctools as nctools
+import Utilities.profiler as profiler
 import evd
 
 import pdb
@@ -44,6 +45,114 @@ import pdb
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
+def windfieldFiles(inputPath):
+    """
+    List the wind field files in a folder. Hidden files (such as
+    files being written by the wind field calculations) are excluded.
+
+    :param str inputPath: path of folder containing wind field files
+
+    :returns: sorted list of paths to the wind field files.
+
+    """
+    files = [pjoin(inputPath, f) for f in os.listdir(inputPath)
+             if not f.startswith('.')]
+    return sorted(f for f in files if os.path.isfile(f))
+
+def pointBytes(numFiles, numYears, calcCI=False):
+    """
+    Estimate the memory needed to calculate the hazard at one grid
+    point: the wind speeds from each file, and the return period wind
+    speeds and distribution parameters calculated from them. The
+    results are counted twice, as workers send a copy of them to the
+    master process.
+
+    :param int numFiles: number of wind field files.
+    :param int numYears: number of return periods.
+    :param bool calcCI: whether confidence ranges are calculated.
+
+    :returns: `int` number of bytes per grid point.
+
+    """
+    itemsize = np.dtype('f').itemsize
+    results = numYears + 3
+    if calcCI:
+        results += 2 * numYears
+    return itemsize * (numFiles + 2 * results)
+
+def tileSize(budget, numFiles, numYears, xdim, ydim, calcCI=False,
+             workers=1, chunks=None):
+    """
+    Calculate the size of the tiles so the memory used for each tile
+    fits in a budget. Tiles span as many whole rows of the domain as
+    possible, so each tile is read from the wind field files as a
+    contiguous block. There are at least as many tiles as workers.
+
+    If the wind field files are chunked and at least one chunk fits in
+    the budget, the tiles are rounded down to whole chunks. With the
+    same `chunks`, :class:`TileGrid` then starts the tiles on the chunk
+    boundaries, so each chunk is decompressed for one tile only.
+
+    :param float budget: memory available to each worker (bytes).
+    :param int numFiles: number of wind field files.
+    :param int numYears: number of return periods.
+    :param int xdim: number of grid points in the x-direction.
+    :param int ydim: number of grid points in the y-direction.
+    :param bool calcCI: whether confidence ranges are calculated.
+    :param int workers: number of workers processing tiles.
+    :param tuple chunks: optional (y, x) chunk size of the wind field
+                         files.
+
+    :returns: `xstep`, `ystep` size of the tiles.
+
+    """
+    points = int(budget // pointBytes(numFiles, numYears, calcCI))
+    if points < 1:
+        log.warning("A memory budget of %d bytes is too small for %d "
+                    "wind field files, using single point tiles",
+                    budget, numFiles)
+        points = 1
+    points = min(points, int(np.ceil(xdim * ydim / float(workers))))
+    xstep = min(xdim, points)
+    ystep = max(1, min(ydim, points // xstep))
+
+    if chunks:
+        ychunk, xchunk = min(chunks[0], ydim), min(chunks[1], xdim)
+        if points >= ychunk * xchunk:
+            if xstep < xdim or ystep < ychunk:
+                # Tiles of one band of chunks:
+                ystep = ychunk
+                xstep = min(xdim, (points // ychunk) // xchunk * xchunk)
+            elif ystep < ydim:
+                ystep = ystep // ychunk * ychunk
+    return xstep, ystep
+
+
+def tileBounds(start, size, step, chunk=None):
+    """
+    Calculate the boundaries of the tiles along one dimension of the
+    wind field grid.
+
+    If the tiles are whole chunks of the wind field files, they start
+    on the chunk boundaries, so the first tile is shorter when `start`
+    is not on a boundary.
+
+    :param int start: index of the first point of the domain.
+    :param int size: number of points in the domain.
+    :param int step: size of the tiles.
+    :param int chunk: optional chunk size of the wind field files.
+
+    :returns: `list` of the index of the first point of each tile,
+              followed by the index after the last point.
+
+    """
+    first = start
+    if chunk and step < size and step % chunk == 0:
+        first -= start % chunk
+    return ([start] + range(first + step, start + size, step) +
+            [start + size])
+
+
 def setDomain(inputPath):
     """
     Establish the full extent of input wind field files
@@ -55,8 +164,8 @@ def setDomain(inputPath):
 
     """
 
-    fileList = os.listdir(inputPath)
-    inputFile = pjoin(inputPath, fileList[0])
+    fileList = windfieldFiles(inputPath)
+    inputFile = fileList[0]
     ncobj = nctools.ncLoadFile(inputFile)
     wf_lon = nctools.ncGetDims(ncobj, 'lon')
     wf_lat = nctools.ncGetDims(ncobj, 'lat')
@@ -101,7 +210,8 @@ class TileGrid(object):
 
     """
 
-    def __init__(self, gridLimit, wf_lon, wf_lat, xstep=100, ystep=100):
+    def __init__(self, gridLimit, wf_lon, wf_lat, xstep=100, ystep=100,
+                 chunks=None):
         """
         Initialise the tile grid for dividing up the domain
 
@@ -116,6 +226,10 @@ class TileGrid(object):
         :param wf_lat: `numpy.ndarray` of latitudes of the wind field.
         :param xstep: `int` size of the tile in the x-direction.
         :param ystep: `int` size of the tile in the y-direction.
+        :param chunks: optional (y, x) chunk size of the wind field
+                       files. Where the tiles are whole chunks, they
+                       start on the chunk boundaries of the files (the
+                       first tile is shorter).
 
         """
 
@@ -141,6 +255,7 @@ class TileGrid(object):
 
         self.xstep = xstep
         self.ystep = ystep
+        self.chunks = chunks
         self.wf_lon = wf_lon
         self.wf_lat = wf_lat
 
@@ -152,8 +267,12 @@ class TileGrid(object):
         rectangular 2D arrays (of dimension x_step * y_step).
         """
 
-        subset_maxcols = int(np.ceil(self.xdim / float(self.xstep)))
-        subset_maxrows = int(np.ceil(self.ydim / float(self.ystep)))
+        ychunk, xchunk = self.chunks or (None, None)
+        xbounds = tileBounds(self.imin, self.xdim, self.xstep, xchunk)
+        ybounds = tileBounds(self.jmin, self.ydim, self.ystep, ychunk)
+
+        subset_maxcols = len(xbounds) - 1
+        subset_maxrows = len(ybounds) - 1
         self.num_tiles = subset_maxcols * subset_maxrows
         self.x_start = np.zeros(self.num_tiles, 'i')
         self.x_end = np.zeros(self.num_tiles, 'i')
@@ -163,12 +282,10 @@ class TileGrid(object):
 
         for i in xrange(subset_maxcols):
             for j in xrange(subset_maxrows):
-                self.x_start[k] = i * self.xstep + self.imin
-                self.x_end[k] = min((i + 1) * self.xstep + self.imin,
-                                    self.xdim + self.imin) - 1
-                self.y_start[k] = j * self.ystep + self.jmin
-                self.y_end[k] = min((j + 1) * self.ystep + self.jmin,
-                                    self.ydim + self.jmin) - 1
+                self.x_start[k] = xbounds[i]
+                self.x_end[k] = xbounds[i + 1] - 1
+                self.y_start[k] = ybounds[j]
+                self.y_end[k] = ybounds[j + 1] - 1
                 k += 1
 
 
@@ -267,12 +384,16 @@ class HazardCalculator(object):
 
 
         # Add configuration settings to global attributes:
-        for section in config.sections():
-            for option in config.options(section):
-                key = "{0}_{1}".format(section, option)
-                value = config.get(section, option)
-                self.global_atts[key] = value
+        if config.getboolean('Hazard', 'ConfigAttributes'):
+            for section in config.sections():
+                for option in config.options(section):
+                    key = "{0}_{1}".format(section, option)
+                    value = config.get(section, option)
+                    self.global_atts[key] = value
+
+        self.ncOptions = nctools.ncSaveOptions(config, 'Hazard')
 
+    @profiler.timed('hazard.tile')
     def calculateHazard(self, tilelimits):
         """
         Load input hazard data and then calculate the return period and
@@ -284,15 +405,22 @@ class HazardCalculator(object):
 
         Rp, loc, scale, shp = calculate(Vr, self.years, self.nodata,
                                         self.minRecords, self.yrsPerSim)
+        results = (tilelimits, Rp, loc, scale, shp)
 
         if self.calcCI:
             RpUpper, RpLower = calculateCI(Vr, self.years, self.nodata,
                                            self.minRecords, self.yrsPerSim,
                                            self.sample_size, self.prange)
+            results += (RpUpper, RpLower)
 
-            return (tilelimits, Rp, loc, scale, shp, RpUpper, RpLower)
-        else:
-            return (tilelimits, Rp, loc, scale, shp)
+        nbytes = Vr.nbytes + sum(a.nbytes for a in results[1:])
+        peak = profiler.peakMemory()
+        log.debug("Tile %s used %.1f MB, peak process memory %s MB",
+                  tilelimits, nbytes / 2. ** 20,
+                  'unknown' if peak is None else '%.1f' % (peak / 2. ** 20))
+        profiler.addMemory('hazard.tile', nbytes, peak)
+
+        return results
 
     def dumpHazardFromTiles(self, tiles, progressCallback=None):
         """
@@ -398,6 +526,7 @@ class HazardCalculator(object):
 
 
     @disableOnWorkers
+    @profiler.timed('hazard.write')
     def saveHazard(self):
         """
         Save hazard data to a netCDF file.
@@ -540,9 +669,14 @@ class HazardCalculator(object):
                            nodata=self.nodata,
                            datatitle='TCRM hazard simulation',
                            gatts=self.global_atts, writedata=True,
-                           keepfileopen=False)
+                           keepfileopen=False, **self.ncOptions)
+
+        if profiler.ENABLED:
+            profiler.addBytes('hazard.write', written=os.path.getsize(
+                pjoin(self.outputPath, 'hazard.nc')))
 
 
+@profiler.timed('hazard.fit')
 def calculate(Vr, years, nodata, minRecords, yrsPerSim):
     """
     Fit a GEV to the wind speed records for a 2-D extent of
@@ -614,8 +748,8 @@ def calculateCI(Vr, years, nodata, minRecords, yrsPerSim=1,
 
     nrecords = Vr.shape[0]
     nsamples = nrecords / sample_size
-    RpUpper = nodata*np.ones((len(years), Vr.shape[1], Vr.shape[2]), dtype='f')
-    RpLower = nodata*np.ones((len(years), Vr.shape[1], Vr.shape[2]), dtype='f')
+    RpUpper = np.full((len(years), Vr.shape[1], Vr.shape[2]), nodata, dtype='f')
+    RpLower = np.full((len(years), Vr.shape[1], Vr.shape[2]), nodata, dtype='f')
 
     w = np.zeros((len(years), nsamples), dtype='f')
     wUpper = np.zeros((len(years)), dtype='f')
@@ -646,6 +780,7 @@ def calculateCI(Vr, years, nodata, minRecords, yrsPerSim=1,
 
 
 
+@profiler.timed('hazard.read')
 def loadFilesFromPath(inputPath, tilelimits):
     """
     Load wind field data for each subset into a 3-D array.
@@ -658,9 +793,7 @@ def loadFilesFromPath(inputPath, tilelimits):
 
     """
 
-    fileList = os.listdir(inputPath)
-    files = [pjoin(inputPath, f) for f in fileList]
-    files = [f for f in files if os.path.isfile(f)]
+    files = windfieldFiles(inputPath)
     log.debug("Loading data from %d files" % (len(files)))
 
     ysize = tilelimits[3] - tilelimits[2]
@@ -670,6 +803,7 @@ def loadFilesFromPath(inputPath, tilelimits):
     for n, f in enumerate(sorted(files)):
         Vr[n,:,:] = loadFile(f, tilelimits)
 
+    profiler.addBytes('hazard.read', read=Vr.nbytes)
     return Vr
 
 def loadFile(filename, limits):
@@ -742,6 +876,7 @@ def run(configFile, callback=None):
     yrsPerSim = config.getint('TrackGenerator', 'YearsPerSimulation')
     minRecords = config.getint('Hazard', 'MinimumRecords')
     calculate_confidence = config.getboolean('Hazard', 'CalculateCI')
+    budget = config.getfloat('Hazard', 'MemoryBudget')
 
     wf_lon, wf_lat = setDomain(inputPath)
 
@@ -750,6 +885,20 @@ def run(configFile, callback=None):
 
     log.info("Running hazard calculations")
     TG = TileGrid(gridLimit, wf_lon, wf_lat)
+    if budget > 0:
+        numFiles = len(windfieldFiles(inputPath))
+        numYears = len(config.get('Hazard', 'Years').split(','))
+        workers = max(1, pp.size() - 1)
+        chunks = nctools.ncSaveOptions(config, 'WindfieldInterface').get(
+            'chunksizes')
+        if chunks:
+            chunks = ([1] + list(chunks))[-2:]
+        xstep, ystep = tileSize(budget * 2 ** 20, numFiles, numYears,
+                                TG.xdim, TG.ydim, calculate_confidence,
+                                workers, chunks)
+        log.info("Using %d x %d tiles for %d wind field files and a "
+                 "memory budget of %g MB", xstep, ystep, numFiles, budget)
+        TG = TileGrid(gridLimit, wf_lon, wf_lat, xstep, ystep, chunks)
     tiles = getTiles(TG)
 
     #def progress(i):
@@ -36,8 +36,6 @@ from Utilities.config import ConfigParser
 from Utilities.files import flStartLog
 from Utilities.version import version
 from Utilities.progressbar import SimpleProgressBar as ProgressBar
-from Evaluate import interpolateTracks
-from PlotInterface.maps import saveWindfieldMap
 
 __version__ = version()
 
@@ -119,6 +117,7 @@ def doWindfieldPlotting(configFile):
 
     """
     from netCDF4 import Dataset
+    from PlotInterface.maps import saveWindfieldMap
     import numpy as np
     config = ConfigParser()
     config.read(configFile)
@@ -173,6 +172,11 @@ def main(configFile):
     config.read(configFile)
     doOutputDirectoryCreation(configFile)
 
+    # The wind fields and time series are plotted with the matplotlib
+    # Agg backend:
+    import matplotlib
+    matplotlib.use('Agg', warn=False)
+
     trackFile = config.get('DataProcess', 'InputFile')
     source = config.get('DataProcess', 'Source')
     delta = 1/12.
@@ -180,6 +184,7 @@ def main(configFile):
     outputTrackFile = pjoin(outputPath, "tracks.interp.csv")
 
     # This will save interpolated track data in TCRM format:
+    from Evaluate import interpolateTracks
     interpTrack = interpolateTracks.parseTracks(configFile, trackFile,
                                                 source, delta,
                                                 outputTrackFile,
@@ -17,7 +17,6 @@ if 'NullHandler' not in dir(log):
     from Utilities import py26compat
     log.NullHandler = py26compat.NullHandler
 
-import Utilities.datasets as datasets
 import traceback
 import argparse
 import time
@@ -26,15 +25,20 @@ import os
 
 from os.path import join as pjoin, realpath, isdir, dirname
 from functools import wraps
+from collections import namedtuple
 from Utilities.progressbar import SimpleProgressBar as ProgressBar
 from Utilities.files import flStartLog, flLoadFile
 from Utilities.config import ConfigParser
 from Utilities.parallel import attemptParallel, disableOnWorkers
 from Utilities.version import version
-from Utilities import pathLocator
+from Utilities.manifest import Manifest, COMPLETE, STARTED
+from Utilities import pathLocator, profiler
 
-import matplotlib
-matplotlib.use('Agg', warn=False)  # Use matplotlib backend
+# Use the matplotlib Agg backend. This is set in the environment, so
+# matplotlib is only imported by the components that plot. Matplotlib
+# before v1.5 ignores MPLBACKEND, so the stages that plot also select
+# the backend with useAggBackend()
+os.environ['MPLBACKEND'] = 'Agg'
 
 # Set Basemap data path if compiled with py2exe
 if pathLocator.is_frozen():
@@ -42,6 +46,15 @@ if pathLocator.is_frozen():
         pathLocator.getRootDirectory(), 'mpl-data', 'data')
 
 
+def useAggBackend():
+    """
+    Select the matplotlib Agg backend, before a stage that plots
+    imports matplotlib.
+    """
+    import matplotlib
+    matplotlib.use('Agg', warn=False)
+
+
 def timer(f):
     """
     A simple timing decorator for the entire process.
@@ -69,6 +82,7 @@ __version__  = version() # pylint: disable-msg=C0103
 
 
 @disableOnWorkers
+@profiler.timed('tcrm.doDataDownload')
 def doDataDownload(configFile):
     """
     Check and download the data files listed in the configuration file.
@@ -103,6 +117,7 @@ def doDataDownload(configFile):
 
     showProgressBar = config.get('Logging', 'ProgressBar')
 
+    import Utilities.datasets as datasets
     datasets.loadDatasets(configFile)
     for dataset in datasets.DATASETS:
         if not dataset.isDownloaded():
@@ -125,6 +140,7 @@ def doDataDownload(configFile):
 
 
 @disableOnWorkers
+@profiler.timed('tcrm.doOutputDirectoryCreation')
 def doOutputDirectoryCreation(configFile):
     """
     Create all the necessary output folders.
@@ -158,13 +174,15 @@ def doOutputDirectoryCreation(configFile):
                 raise
 
 
-def doTrackGeneration(configFile):
+@profiler.timed('tcrm.doTrackGeneration')
+def doTrackGeneration(configFile, resume=False):
     """
     Do the tropical cyclone track generation in :mod:`TrackGenerator`.
 
     The track generation settings are read from *configFile*.
 
     :param str configFile: Name of configuration file.
+    :param bool resume: Only run the simulations with no track file.
 
     """
 
@@ -181,18 +199,20 @@ def doTrackGeneration(configFile):
         pbar.update(float(done)/total)
 
     import TrackGenerator
-    TrackGenerator.run(configFile, status)
+    TrackGenerator.run(configFile, status, resume)
 
     pbar.update(1.0)
     log.info('Completed track generation')
 
 
-def doWindfieldCalculations(configFile):
+@profiler.timed('tcrm.doWindfieldCalculations')
+def doWindfieldCalculations(configFile, resume=False):
     """
     Do the wind field calculations, using :mod:`wind`. The wind
     field settings are read from *configFile*.
 
     :param str configFile: Name of configuration file.
+    :param bool resume: Only process the track files with no gust file.
 
     """
 
@@ -208,14 +228,53 @@ def doWindfieldCalculations(configFile):
     def status(done, total):
         pbar.update(float(done)/total)
 
+    if config.getboolean('WindfieldInterface', 'PlotOutput'):
+        useAggBackend()
+
     import wind
-    wind.run(configFile, status)
+    wind.run(configFile, status, resume)
 
     pbar.update(1.0)
     log.info('Completed wind field calculations')
 
 
+@profiler.timed('tcrm.doStreamedWindfields')
+def doStreamedWindfields(configFile, resume=False):
+    """
+    Generate tropical cyclone tracks with :mod:`TrackGenerator` and
+    calculate their wind fields with :mod:`wind` as they are
+    generated, without reading them back from track files.
+
+    :param str configFile: Name of configuration file.
+    :param bool resume: Only run the simulations with no gust file.
+
+    """
+
+    log.info('Starting track generation and wind field calculations')
+
+    config = ConfigParser()
+    config.read(configFile)
+
+    showProgressBar = config.get('Logging', 'ProgressBar')
+
+    pbar = ProgressBar('Simulating tracks and wind fields: ',
+                       showProgressBar)
+
+    def status(done, total):
+        pbar.update(float(done)/total)
+
+    if config.getboolean('WindfieldInterface', 'PlotOutput'):
+        useAggBackend()
+
+    import wind
+    wind.run(configFile, status, resume, stream=True)
+
+    pbar.update(1.0)
+    log.info('Completed track generation and wind field calculations')
+
+
 @disableOnWorkers
+@profiler.timed('tcrm.doDataProcessing')
 def doDataProcessing(configFile):
     """
     Parse the input data and turn it into the necessary format
@@ -243,6 +302,7 @@ def doDataProcessing(configFile):
 
 
 @disableOnWorkers
+@profiler.timed('tcrm.doDataPlotting')
 def doDataPlotting(configFile):
     """
     Plot the pre-processed input data.
@@ -256,6 +316,7 @@ def doDataPlotting(configFile):
 
     showProgressBar = config.get('Logging', 'ProgressBar')
     pbar = ProgressBar('Plotting results: ', showProgressBar)
+    useAggBackend()
 
     outputPath = config.get('Output', 'Path')
 
@@ -326,6 +387,7 @@ def doDataPlotting(configFile):
     pbar.update(1.0)
 
 @disableOnWorkers
+@profiler.timed('tcrm.doStatistics')
 def doStatistics(configFile):
     """
     Calibrate the model with the :mod:`StatInterface` module.
@@ -351,6 +413,7 @@ def doStatistics(configFile):
 
     pbar.update(0.05)
 
+    useAggBackend()
     from StatInterface import StatInterface
     statInterface = StatInterface.StatInterface(configFile,
                                                 autoCalc_gridLimit=domain)
@@ -378,6 +441,7 @@ def doStatistics(configFile):
     log.info('Completed StatInterface')
 
 
+@profiler.timed('tcrm.doHazard')
 def doHazard(configFile):
     """
     Do the hazard calculations (extreme value distribution fitting)
@@ -405,6 +469,7 @@ def doHazard(configFile):
     pbar.update(1.0)
 
 @disableOnWorkers
+@profiler.timed('tcrm.doHazardPlotting')
 def doHazardPlotting(configFile):
     """
     Do the hazard plots (hazard maps and curves for all locations within
@@ -424,6 +489,7 @@ def doHazardPlotting(configFile):
     pbar = ProgressBar('Plotting hazard maps: ', showProgressBar)
     pbar.update(0.0)
 
+    useAggBackend()
     from PlotInterface.AutoPlotHazard import AutoPlotHazard
     plotter = AutoPlotHazard(configFile, progressbar=pbar)
     plotter.plotMap()
@@ -432,6 +498,7 @@ def doHazardPlotting(configFile):
     pbar.update(1.0)
 
 
+@profiler.timed('tcrm.doEvaluation')
 def doEvaluation(configFile):
     """
     Do the track model evaluation processing, using :mod:`Evaluate`.
@@ -461,18 +528,162 @@ def doEvaluation(configFile):
 
     log.info("Running Evaluation")
 
+    useAggBackend()
     import Evaluate
     Evaluate.run(configFile)
 
 
+def dataProcessInputs(config):
+    """
+    :returns: list containing the path of the input track database.
+    """
+    inputFile = config.get('DataProcess', 'InputFile')
+    source = config.get('DataProcess', 'Source')
+    if config.has_option(source, 'filename'):
+        inputFile = pjoin(config.get(source, 'path'),
+                          config.get(source, 'filename'))
+    if len(dirname(inputFile)) == 0:
+        inputFile = pjoin(pathLocator.getRootDirectory(), 'input', inputFile)
+    return [inputFile]
+
+
+def landmaskInputs(config):
+    """
+    :returns: list containing the path of the land mask.
+    """
+    return [config.get('Input', 'LandMask')]
+
+
+def trackGeneratorInputs(config):
+    """
+    :returns: list of the paths of the land mask and MSLP climatology.
+    """
+    return [config.get('Input', 'LandMask'), config.get('Input', 'MSLPFile')]
+
+
+def noInputs(config):
+    """
+    :returns: an empty list, for stages whose only inputs are the
+              outputs of other stages.
+    """
+    return []
+
+
+Stage = namedtuple('Stage', ['name', 'action', 'function', 'sections',
+                             'inputs', 'upstream', 'owned', 'resumable'])
+
+# The stages tracked in the manifest, in the order they are run: the
+# [Actions] option that turns each stage on, the function that runs
+# it, the configuration sections it uses, a function returning its
+# input files, the stages it depends on, the output directories that
+# only it writes to and whether it can resume an incomplete run.
+STAGES = [
+    Stage('DataProcess', 'DataProcess', doDataProcessing,
+          ['DataProcess', 'Region'], dataProcessInputs, [], [], False),
+    Stage('StatInterface', 'ExecuteStat', doStatistics,
+          ['StatInterface', 'Region', 'RMW'], landmaskInputs,
+          ['DataProcess'], [], False),
+    Stage('TrackGenerator', 'ExecuteTrackGenerator', doTrackGeneration,
+          ['TrackGenerator', 'Region', 'RMW'], trackGeneratorInputs,
+          ['StatInterface'], ['tracks'], True),
+    Stage('WindfieldInterface', 'ExecuteWindfield',
+          doWindfieldCalculations, ['WindfieldInterface', 'Timeseries'],
+          noInputs, ['TrackGenerator'], ['windfield'], True),
+    Stage('Hazard', 'ExecuteHazard', doHazard, ['Hazard'], noInputs,
+          ['WindfieldInterface'], ['hazard'], False)]
+
+# With [TrackGenerator] Stream, the tracks are passed to the wind field
+# calculations as they are generated, so the two are a single stage
+STREAMED = Stage('StreamedWindfield', 'ExecuteWindfield',
+                 doStreamedWindfields,
+                 ['TrackGenerator', 'Region', 'RMW', 'WindfieldInterface',
+                  'Timeseries'], trackGeneratorInputs, ['StatInterface'],
+                 ['tracks', 'windfield'], True)
+
+
+def stages(config):
+    """
+    :param config: :class:`Utilities.config.ConfigParser` of the run.
+
+    :returns: list of the :class:`Stage` objects of the run, in the
+              order they are run.
+
+    """
+    if not (config.getboolean('TrackGenerator', 'Stream') and
+            config.getboolean('Actions', 'ExecuteTrackGenerator') and
+            config.getboolean('Actions', 'ExecuteWindfield')):
+        return STAGES
+
+    result = []
+    for stage in STAGES:
+        if stage.name == 'TrackGenerator':
+            result.append(STREAMED)
+        elif stage.name == 'Hazard':
+            result.append(stage._replace(upstream=[STREAMED.name]))
+        elif stage.name != 'WindfieldInterface':
+            result.append(stage)
+    return result
+
+
+def runStage(stage, configFile, config, manifest, skip=True):
+    """
+    Run a stage, unless its outputs are up to date, and record it in
+    the manifest.
+
+    :param stage: :class:`Stage` to run.
+    :param str configFile: Name of configuration file.
+    :param config: :class:`Utilities.config.ConfigParser` of the run.
+    :param manifest: :class:`Utilities.manifest.Manifest` of the run.
+    :param bool skip: If `False`, run the stage even if it is up to
+                      date.
+
+    """
+    sections = stage.sections
+    if stage.name == 'DataProcess':
+        sections = sections + [config.get('DataProcess', 'Source')]
+    record = manifest.record(config, sections, stage.inputs(config),
+                             stage.upstream)
+    signature = manifest.signature(__version__, record)
+
+    status = None
+    if skip and all(manifest.isComplete(name) for name in stage.upstream):
+        status = manifest.status(stage.name, signature)
+
+    if status == COMPLETE:
+        log.info('%s is up to date, skipping', stage.name)
+        return
+
+    resume = status == STARTED and stage.resumable
+    if resume:
+        log.info('Resuming %s', stage.name)
+
+    manifest.start(stage.name, signature, record, resume)
+    if pp.rank() == 0:
+        manifest.save()
+    pp.barrier()
+
+    if resume:
+        stage.function(configFile, resume=True)
+    else:
+        stage.function(configFile)
+
+    pp.barrier()
+    manifest.complete(stage.name, stage.owned)
+    if pp.rank() == 0:
+        manifest.save()
+
+
 @timer
-def main(configFile='main.ini'):
+@profiler.timed('tcrm.main')
+def main(configFile='main.ini', force=False):
     """
     Main interface of TCRM that allows control and interaction with the
     5 interfaces: DataProcess, StatInterface, TrackGenerator,
     WindfieldInterface and HazardInterface
 
     :param str configFile: Name of file containing configuration settings for running TCRM
+    :param bool force: Run all the stages turned on in the configuration,
+                       even if their outputs are up to date.
 
     """
 
@@ -491,30 +702,19 @@ def main(configFile='main.ini'):
 
     pp.barrier()
 
-    if config.getboolean('Actions', 'DataProcess'):
-        doDataProcessing(configFile)
-
-    pp.barrier()
-
-    if config.getboolean('Actions', 'ExecuteStat'):
-        doStatistics(configFile)
-
-    pp.barrier()
-
-    if config.getboolean('Actions', 'ExecuteTrackGenerator'):
-        doTrackGeneration(configFile)
-
-    pp.barrier()
-
-    if config.getboolean('Actions', 'ExecuteWindfield'):
-        doWindfieldCalculations(configFile)
+    # The manifest records the stages that have run, so a later run
+    # skips stages that are up to date and resumes incomplete ones
 
-    pp.barrier()
+    outputPath = config.get('Output', 'Path')
+    manifest = Manifest(pjoin(outputPath, 'manifest.json'), outputPath,
+                        exclude=['log', 'cache'])
+    skip = config.getboolean('Actions', 'Resume') and not force
 
-    if config.getboolean('Actions', 'ExecuteHazard'):
-        doHazard(configFile)
+    for stage in stages(config):
+        if config.getboolean('Actions', stage.action):
+            runStage(stage, configFile, config, manifest, skip)
 
-    pp.barrier()
+        pp.barrier()
 
     if config.getboolean('Actions', 'PlotData'):
         doDataPlotting(configFile)
@@ -546,6 +746,14 @@ def startup():
                         action='store_true')
     parser.add_argument('-d', '--debug', help='Allow pdb traces',
                         action='store_true')
+    parser.add_argument('-f', '--force',
+                        help='Run all stages, even if their outputs are '
+                             'up to date',
+                        action='store_true')
+    parser.add_argument('-p', '--profile',
+                        help='Write a report of the time spent in each '
+                             'part of the model',
+                        action='store_true')
     args = parser.parse_args()
 
     configFile = args.config_file
@@ -596,6 +804,9 @@ def startup():
 
     flStartLog(logfile, logLevel, verbose, datestamp)
 
+    if args.profile or config.getboolean('Logging', 'Profile'):
+        profiler.enable()
+
     # Switch off minor warning messages
     import warnings
     warnings.filterwarnings("ignore", category=DeprecationWarning)
@@ -607,10 +818,10 @@ def startup():
     warnings.filterwarnings("ignore", category=RuntimeWarning)
 
     if debug:
-        main(configFile)
+        main(configFile, args.force)
     else:
         try:
-            main(configFile)
+            main(configFile, args.force)
         except ImportError as e:
             log.critical("Missing module: {0}".format(e))
         except Exception:  # pylint: disable=W0703
@@ -619,6 +830,12 @@ def startup():
             for line in tblines:
                 log.critical(line.lstrip())
 
+    if profiler.ENABLED:
+        profileFile = config.get('Logging', 'ProfileFile')
+        if not profileFile:
+            profileFile = pjoin(logdir, 'profile.json')
+        profiler.report(profileFile, pp.rank(), pp.size())
+
 
 if __name__ == "__main__":
     startup()
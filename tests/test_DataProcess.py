@@ -0,0 +1,127 @@
+import os
+import sys
+import shutil
+import logging
+import tempfile
+import unittest
+import numpy as np
+from numpy.testing import assert_almost_equal
+
+try:
+    import pathLocate
+except:
+    from unittests import pathLocate
+
+# Add parent folder to python path
+unittest_dir = pathLocate.getUnitTestDirectory()
+sys.path.append(pathLocate.getRootDirectory())
+from DataProcess import DataProcess
+
+
+class DummyLandmask(object):
+    """Treat everything east of 130E as land"""
+
+    def sampleGrid(self, lon, lat):
+        return np.where(np.asarray(lon) > 130., 1., 0.)
+
+
+class TestDeriveParameters(unittest.TestCase):
+
+    def setUp(self):
+        self.processPath = tempfile.mkdtemp()
+        self.dp = object.__new__(DataProcess.DataProcess)
+        self.dp.logger = logging.getLogger()
+        self.dp.landmask = DummyLandmask()
+        self.dp.processPath = self.processPath
+        self.dp.ncflag = True
+        self.dp.data = {}
+
+        self.indicator = np.array([1, 0, 0, 0, 1, 0, 0])
+        self.lon = np.array([128., 129., 130., 131., 150., 150.5, 151.])
+        self.lat = np.array([-15., -15., -15., -15., -20., -20.5, -21.])
+        self.dt = np.array([0., 6., 6., 6., 0., 6., 6.], 'f')
+        self.pressure = np.array([1000., 995., sys.maxint, 985.,
+                                  1002., 1000., 990.])
+        self.vmax = np.array([20., 25., 300., 35., 15., 18., 22.])
+        self.rmax = np.array([40., 38., 36., 34., 50., 48., 46.])
+
+        self.params = self.dp._deriveParameters(self.indicator, self.lon,
+                                                self.lat, self.dt,
+                                                self.pressure, self.vmax,
+                                                self.rmax)
+        self.col = dict((name, self.params[:, i]) for i, name in
+                        enumerate(DataProcess.PROCESS_FIELDS))
+
+    def tearDown(self):
+        shutil.rmtree(self.processPath)
+
+    def test_shape(self):
+        """Test one column is derived for each process field"""
+        self.assertEqual(self.params.shape,
+                         (self.indicator.size,
+                          len(DataProcess.PROCESS_FIELDS)))
+
+    def test_lsflag(self):
+        """Test land/sea flag is derived from the land mask"""
+        assert_almost_equal(self.col['lsflag'], [0, 0, 0, 1, 1, 1, 1])
+
+    def test_initialValuesMasked(self):
+        """Test values undefined at initial observations are masked"""
+        for name in ['bearing', 'speed', 'pressureRate', 'rmaxRate',
+                     'bearingRate', 'speedRate']:
+            self.assertTrue(np.all(self.col[name][[0, 4]] == sys.maxint),
+                            name)
+        for name in ['bearingRate', 'speedRate']:
+            self.assertTrue(np.all(self.col[name][[1, 5]] == sys.maxint),
+                            name)
+
+    def test_rates(self):
+        """Test rates of change are calculated between observations"""
+        assert_almost_equal(self.col['pressureRate'][[1, 5, 6]],
+                            [-5. / 6., -2. / 6., -10. / 6.])
+        assert_almost_equal(self.col['rmaxRate'][[1, 2, 3]],
+                            [-2. / 6., -2. / 6., -2. / 6.])
+
+    def test_missingPressureRate(self):
+        """Test pressure rates are masked around missing pressures"""
+        self.assertEqual(self.col['pressureRate'][2], sys.maxint)
+        self.assertEqual(self.col['pressureRate'][3], sys.maxint)
+
+    def test_vmaxLimit(self):
+        """Test non-physical wind speeds are masked"""
+        self.assertEqual(self.col['vmax'][2], sys.maxint)
+        assert_almost_equal(self.col['vmax'][[0, 1, 3]], [20., 25., 35.])
+
+    def test_noRmax(self):
+        """Test rmax columns are masked when rmax is not available"""
+        params = self.dp._deriveParameters(self.indicator, self.lon,
+                                           self.lat, self.dt,
+                                           self.pressure, self.vmax)
+        i = DataProcess.PROCESS_FIELDS.index('rmax')
+        self.assertTrue(np.all(params[:, i] == sys.maxint))
+
+    def test_processStore(self):
+        """Test the binary process store can be memory-mapped"""
+        self.assertEqual(DataProcess.loadProcessStore(self.processPath),
+                         None)
+        self.dp._saveProcessStore(self.params)
+        store = DataProcess.loadProcessStore(self.processPath)
+        self.assertEqual(sorted(store.keys()),
+                         sorted(DataProcess.PROCESS_FIELDS))
+        for name in DataProcess.PROCESS_FIELDS:
+            assert_almost_equal(store[name], self.col[name])
+
+    def test_processStoreRounding(self):
+        """Test the stored coordinates are rounded as in the text files"""
+        i = DataProcess.PROCESS_FIELDS.index('lon')
+        lon = np.array([119.995, 128.125, 1.005, -0.015, 150.5, 150.4449,
+                        151.])
+        self.params[:, i] = lon
+        self.dp._saveProcessStore(self.params)
+        store = DataProcess.loadProcessStore(self.processPath)
+        self.assertEqual(store['lon'].tolist(),
+                         [float('%6.2f' % x) for x in lon])
+        self.assertEqual(self.params[:, i].tolist(), lon.tolist())
+
+if __name__ == "__main__":
+    unittest.main()
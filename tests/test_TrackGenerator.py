@@ -1,7 +1,23 @@
+import os
+import sys
+import shutil
+import tempfile
 import unittest
+import numpy as np
 from numpy.testing import *
+from netCDF4 import Dataset
 
-# from TrackGenerator import TrackGenerator
+try:
+    import pathLocate
+except:
+    from unittests import pathLocate
+
+# Add parent folder to python path
+unittest_dir = pathLocate.getUnitTestDirectory()
+sys.path.append(pathLocate.getRootDirectory())
+from datetime import datetime, timedelta
+from TrackGenerator.TrackGenerator import SamplePressure, filterTracks
+from Utilities.interp3d import interp3d
 
 
 class TestTrackGenerator(unittest.TestCase):
@@ -10,6 +26,137 @@ class TestTrackGenerator(unittest.TestCase):
         assert_almost_equal(range(10), range(10))
         pass
 
+
+def singleTrack(number, n, lon=120., pressure=95000.):
+    """Arrays of a track, as returned by TrackGenerator._singleTrack"""
+    age = np.arange(n, dtype='i')
+    return (np.ones(n, 'f') * number,
+            np.array([datetime(2000, 1, 1) + timedelta(hours=int(h))
+                      for h in age], dtype=object),
+            age,
+            np.ones(n, 'f') * lon,
+            np.linspace(-15., -16., n).astype('f'),
+            np.ones(n, 'f') * 5.,
+            np.ones(n, 'f') * 225.,
+            np.ones(n, 'f') * pressure,
+            np.ones(n, 'f') * 101000.,
+            np.ones(n, 'f') * 30.)
+
+
+class TestFilterTracks(unittest.TestCase):
+
+    def setUp(self):
+        self.innerGridLimit = {'xMin': 110., 'xMax': 130.,
+                               'yMin': -20., 'yMax': -10.}
+
+    def test_filterTracks(self):
+        """Test tracks failing any of the criteria are removed"""
+        invalid = singleTrack(4, 20)
+        invalid[7][5] = 101000.
+        outside = singleTrack(5, 20)
+        outside[3][-1] = 135.
+        tracks = [singleTrack(1, 0),       # empty
+                  singleTrack(2, 1),       # one step
+                  singleTrack(3, 12),      # died at 11 hours
+                  invalid,                 # pressure not below ambient
+                  outside,                 # leaves the inner domain
+                  singleTrack(6, 13),
+                  singleTrack(7, 20)]
+
+        result = filterTracks(tracks, self.innerGridLimit)
+        self.assertEqual(result.shape, (33, 10))
+        self.assertEqual(result.dtype, object)
+        self.assertEqual(sorted(set(result[:, 0])), [6., 7.])
+        assert_almost_equal(result[:13, 2].astype(int), np.arange(13))
+        self.assertEqual(result[13, 1], datetime(2000, 1, 1))
+        self.assertEqual(filterTracks(tracks).shape, (53, 10))
+
+    def test_singleTrack(self):
+        """Test a single track is stacked with a column per array"""
+        track = singleTrack(1, 15)
+        result = filterTracks([track])
+        self.assertEqual(result.shape, (15, 10))
+        for k, column in enumerate(track):
+            self.assertEqual(list(result[:, k]), list(column))
+
+    def test_noTracks(self):
+        """Test an empty array is returned if all tracks are removed"""
+        self.assertEqual(filterTracks([]).shape, (0,))
+        tracks = [singleTrack(1, 0), singleTrack(2, 5)]
+        self.assertEqual(filterTracks(tracks).shape, (0,))
+
+
+class TestSamplePressure(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.mslpFile = os.path.join(self.tmpdir, 'mslp.nc')
+        t, y, x = np.meshgrid(np.arange(365.), np.linspace(90, -90, 73),
+                              np.arange(0, 360, 2.5), indexing='ij')
+        ncobj = Dataset(self.mslpFile, 'w')
+        ncobj.createDimension('time', 365)
+        ncobj.createDimension('lat', 73)
+        ncobj.createDimension('lon', 144)
+        slp = ncobj.createVariable('slp', 'f4', ('time', 'lat', 'lon'))
+        slp.units = 'hPa'
+        slp[:] = (1010. + 5. * np.cos(2 * np.pi * t / 365.) *
+                  np.sin(np.radians(y)) + 3. * np.cos(np.radians(2 * x)))
+        ncobj.close()
+
+        np.random.seed(1)
+        self.day = np.random.uniform(5., 360., 100)
+        self.lat = np.random.uniform(-40., 0., 100)
+        self.lon = np.random.uniform(90., 180., 100)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_getPressures(self):
+        """Test batch sampling matches sampling single points"""
+        mslp = SamplePressure(self.mslpFile)
+        result = mslp.get_pressures(self.day, self.lat, self.lon)
+        expected = [interp3d(mslp.data, np.array([[d], [y], [x]]),
+                             mslp.scale, mslp.offset, prefilter=False)[0]
+                    for d, y, x in zip(self.day, self.lat, self.lon)]
+        assert_almost_equal(result, expected)
+        assert_almost_equal(mslp.get_pressure(np.array([self.day,
+                                                        self.lat,
+                                                        self.lon])),
+                            expected)
+
+    def test_lookupTable(self):
+        """Test the lookup table approximates the spline"""
+        mslp = SamplePressure(self.mslpFile)
+        table = SamplePressure(self.mslpFile, dt=24.)
+        self.assertEqual(table.table.shape, (365, 73, 144))
+        self.assertEqual(table.table.dtype, np.float32)
+        expected = mslp.get_pressures(self.day, self.lat, self.lon)
+        result = table.get_pressures(self.day, self.lat, self.lon)
+        assert_almost_equal(result, expected, decimal=2)
+
+    def test_lookupTableScalar(self):
+        """Test sampling single points from the lookup table"""
+        table = SamplePressure(self.mslpFile, dt=6.)
+        expected = table.get_pressures(self.day, self.lat, self.lon)
+        result = [table.get_pressures(d, y, x)[0] for d, y, x in
+                  zip(self.day, self.lat, self.lon)]
+        assert_almost_equal(result, expected)
+
+    def test_cache(self):
+        """Test the cached data and table are shared memory maps"""
+        cachePath = os.path.join(self.tmpdir, 'cache')
+        table = SamplePressure(self.mslpFile, dt=6.)
+        first = SamplePressure(self.mslpFile, dt=6., cachePath=cachePath)
+        cached = SamplePressure(self.mslpFile, dt=6., cachePath=cachePath)
+        self.assertTrue(isinstance(cached.data, np.memmap))
+        self.assertTrue(isinstance(cached.table, np.memmap))
+        self.assertFalse(cached.table.flags.writeable)
+        assert_almost_equal(cached.data, table.data)
+        expected = table.get_pressures(self.day, self.lat, self.lon)
+        assert_almost_equal(first.get_pressures(self.day, self.lat,
+                                                self.lon), expected)
+        assert_almost_equal(cached.get_pressures(self.day, self.lat,
+                                                 self.lon), expected)
+
 if __name__ == "__main__":
-    suite = unittest.makeSuite(TestTrackGenerator, 'test')
-    unittest.TextTestRunner().run(suite)
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from numpy.testing import assert_array_equal
+
+try:
+    import pathLocate
+except:
+    from unittests import pathLocate
+
+# Add parent folder to python path
+unittest_dir = pathLocate.getUnitTestDirectory()
+sys.path.append(pathLocate.getRootDirectory())
+from Utilities import arraycache
+from Utilities.grid import SampleGrid
+
+
+class TestArrayCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.cachePath = os.path.join(self.tmpdir, 'cache')
+        self.source = os.path.join(self.tmpdir, 'source.txt')
+        with open(self.source, 'w') as fh:
+            fh.write('data')
+        self.calls = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def build(self):
+        self.calls += 1
+        return {'a': np.arange(6.).reshape(2, 3),
+                'b': np.arange(3, dtype='i')}
+
+    def test_cachedArrays(self):
+        """Test arrays are built once and opened read-only"""
+        key = arraycache.cacheKey(self.source, dt=1.)
+        first = arraycache.cachedArrays(self.cachePath, 'test', key,
+                                        self.build)
+        second = arraycache.cachedArrays(self.cachePath, 'test', key,
+                                         self.build)
+        self.assertEqual(self.calls, 1)
+        self.assertTrue(isinstance(second['a'], np.memmap))
+        self.assertFalse(second['a'].flags.writeable)
+        assert_array_equal(first['a'], self.build()['a'])
+        assert_array_equal(second['b'], self.build()['b'])
+        self.assertEqual(sorted(os.listdir(self.cachePath)),
+                         ['test.a.npy', 'test.b.npy', 'test.json'])
+
+    def test_outOfDate(self):
+        """Test arrays are built again when the key changes"""
+        key = arraycache.cacheKey(self.source, dt=1.)
+        arraycache.cachedArrays(self.cachePath, 'test', key, self.build)
+        self.assertEqual(arraycache.readCache(
+            self.cachePath, 'test', arraycache.cacheKey(self.source, dt=2.)),
+            None)
+
+        with open(self.source, 'w') as fh:
+            fh.write('changed')
+        key = arraycache.cacheKey(self.source, dt=1.)
+        arraycache.cachedArrays(self.cachePath, 'test', key, self.build)
+        self.assertEqual(self.calls, 2)
+
+    def test_unwritable(self):
+        """Test the built arrays are returned if the cache can't be written"""
+        with open(self.cachePath, 'w') as fh:
+            fh.write('not a directory')
+        key = arraycache.cacheKey(self.source)
+        arrays = arraycache.cachedArrays(self.cachePath, 'test', key,
+                                         self.build)
+        self.assertFalse(isinstance(arrays['a'], np.memmap))
+        assert_array_equal(arrays['a'], self.build()['a'])
+
+    def test_sampleGrid(self):
+        """Test sampling a cached grid matches the grid file"""
+        from netCDF4 import Dataset
+        gridFile = os.path.join(self.tmpdir, 'landmask.nc')
+        ncobj = Dataset(gridFile, 'w')
+        ncobj.createDimension('lat', 11)
+        ncobj.createDimension('lon', 21)
+        ncobj.createVariable('lat', 'f8', ('lat',))[:] = \
+            np.linspace(-10., 0., 11)
+        ncobj.createVariable('lon', 'f8', ('lon',))[:] = \
+            np.linspace(100., 120., 21)
+        ncobj.createVariable('landmask', 'i2', ('lat', 'lon'))[:] = \
+            np.arange(231).reshape(11, 21) % 2
+        ncobj.close()
+
+        grid = SampleGrid(gridFile)
+        SampleGrid(gridFile, self.cachePath)
+        cached = SampleGrid(gridFile, self.cachePath)
+        self.assertTrue(isinstance(cached.grid, np.memmap))
+        assert_array_equal(cached.grid, grid.grid)
+        assert_array_equal(cached.lon, grid.lon)
+        for lon, lat in [(105.2, -2.7), (118., -9.5), (110., 0.)]:
+            self.assertEqual(cached.sampleGrid(lon, lat),
+                             grid.sampleGrid(lon, lat))
+
+if __name__ == "__main__":
+    unittest.main()
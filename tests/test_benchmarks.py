@@ -0,0 +1,108 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+import numpy as np
+
+try:
+    import pathLocate
+except:
+    from unittests import pathLocate
+
+# Add parent folder to python path
+unittest_dir = pathLocate.getUnitTestDirectory()
+sys.path.append(pathLocate.getRootDirectory())
+from benchmarks import fixtures, run
+
+
+class TestFixtures(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_writeTrackDatabase(self):
+        """Test the synthetic track database is repeatable"""
+        filename = os.path.join(self.tmpdir, 'tracks.csv')
+        nobs = fixtures.writeTrackDatabase(filename, 2, 3, seed=5)
+        with open(filename) as fh:
+            first = fh.read()
+        data = np.genfromtxt(filename, delimiter=',', skip_header=1,
+                             usecols=(1, 4, 5, 6))
+        self.assertEqual(len(data), nobs)
+        self.assertEqual(set(data[:, 0]), set([1981, 1982]))
+        self.assertTrue(np.all(data[:, 3] <= 1005.))
+
+        fixtures.writeTrackDatabase(filename, 2, 3, seed=5)
+        with open(filename) as fh:
+            self.assertEqual(fh.read(), first)
+
+    def test_createWorkspace(self):
+        """Test the workspace has the inputs named in the configuration"""
+        configFile = fixtures.createWorkspace(self.tmpdir, 'small')
+        with open(configFile) as fh:
+            config = fh.read()
+        for name in ['tracks.csv', 'landmask.nc', 'slp.nc']:
+            path = os.path.join(self.tmpdir, 'input', name)
+            self.assertTrue(os.path.isfile(path))
+            self.assertTrue(path in config)
+        self.assertTrue(os.path.isdir(os.path.join(self.tmpdir, 'output',
+                                                   'plots', 'stats')))
+
+
+class TestRun(unittest.TestCase):
+
+    def results(self, times):
+        return {'metadata': {'commit': None},
+                'results': dict((name, {'status': 'ok', 'min': t})
+                                for name, t in times.items())}
+
+    def test_compare(self):
+        """Test slower cases beyond the threshold are regressions"""
+        base = self.results({'a': 1.0, 'b': 1.0, 'c': 1.0})
+        new = self.results({'a': 1.05, 'b': 1.5, 'd': 1.0})
+        base['results']['e'] = {'status': 'skipped', 'message': ''}
+        new['results']['e'] = {'status': 'ok', 'min': 1.0}
+        rows, regressions = run.compare(base, new, 0.1)
+        self.assertEqual([row[0] for row in rows], ['a', 'b'])
+        self.assertAlmostEqual(rows[1][3], 1.5)
+        self.assertEqual(regressions, ['b'])
+
+    def test_runSuite(self):
+        """Test the benchmarks run and save results as JSON"""
+        # Run in a separate process, as the configuration is only read
+        # once in each process
+        tmpdir = tempfile.mkdtemp()
+        try:
+            output = os.path.join(tmpdir, 'results.json')
+            with open(os.devnull, 'w') as devnull:
+                status = subprocess.call(
+                    [sys.executable, '-m', 'benchmarks.run', '--repeat', '2',
+                     '--only', 'wind.powell.kepert',
+                     '--only', 'hazard.calculate', '--output', output],
+                    cwd=pathLocate.getRootDirectory(), stdout=devnull,
+                    stderr=devnull)
+            self.assertEqual(status, 0)
+            with open(output) as fh:
+                results = json.load(fh)
+        finally:
+            shutil.rmtree(tmpdir)
+
+        self.assertEqual(results['metadata']['size'], 'small')
+        self.assertEqual(sorted(results['results']),
+                         ['hazard.calculate', 'wind.powell.kepert',
+                          'wind.powell.kepert.lookup'])
+        for result in results['results'].values():
+            self.assertEqual(result['status'], 'ok')
+            self.assertEqual(len(result['times']), 2)
+            self.assertEqual(result['min'], min(result['times']))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from numpy.testing import assert_almost_equal
+
+try:
+    import pathLocate
+except:
+    from unittests import pathLocate
+
+# Add parent folder to python path
+unittest_dir = pathLocate.getUnitTestDirectory()
+sys.path.append(pathLocate.getRootDirectory())
+from Utilities import columns
+
+LINES = ["header line\n",
+         "1981001S12, 1981, 1,SI, 1981-01-01 00:00:00, -15.1, 120.5, 990\n",
+         "1981001S12, 1981, 1,SI, 1981-01-01 06:00:00, -15.3, 120.1, 985\n",
+         "\n",
+         "1981002S13, 1981, 2,SI, 1981-01-03 00:00:00, -12.0, 115.0, \n"]
+
+COLS = ['tcserialno', 'season', 'num', 'skip', 'date', 'lat', 'lon',
+        'pressure']
+
+
+class TestColumns(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.dataFile = os.path.join(self.tmpdir, 'input.csv')
+        with open(self.dataFile, 'w') as fh:
+            fh.writelines(LINES)
+        self.usecols = [i for i, c in enumerate(COLS) if c != 'skip']
+        self.dtype = columns.colDtype(COLS)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_colDtype(self):
+        """Test column data types are determined from column names"""
+        self.assertEqual(self.dtype.names,
+                         ('tcserialno', 'season', 'num', 'date', 'lat',
+                          'lon', 'pressure'))
+        self.assertEqual(self.dtype['season'], np.dtype('i'))
+        self.assertEqual(self.dtype['lat'], np.dtype('f8'))
+        self.assertEqual(self.dtype['date'].kind, 'S')
+
+    def test_colDtypeOverride(self):
+        """Test column data types can be overridden"""
+        dtype = columns.colDtype(COLS, ['', '', '|S4', '', '', 'f4',
+                                        '', ''])
+        self.assertEqual(dtype['num'], np.dtype('|S4'))
+        self.assertEqual(dtype['lat'], np.dtype('f4'))
+        self.assertRaises(ValueError, columns.colDtype, COLS, ['i'])
+
+    def test_colReadChunks(self):
+        """Test chunked reading gives the same result for any chunk size"""
+        for chunksize in [1, 2, 10]:
+            data = columns.colReadChunks(self.dataFile, self.dtype, ',',
+                                         self.usecols, 1, chunksize)
+            self.assertEqual(len(data), 3)
+            self.assertEqual(list(data['tcserialno']),
+                             ['1981001S12', '1981001S12', '1981002S13'])
+            self.assertEqual(data['date'][1], '1981-01-01 06:00:00')
+            assert_almost_equal(data['lat'], [-15.1, -15.3, -12.0])
+            assert_almost_equal(data['pressure'][:2], [990., 985.])
+            self.assertTrue(np.isnan(data['pressure'][2]))
+
+    def test_cache(self):
+        """Test cached data is only used if the key matches"""
+        cacheFile = self.dataFile + columns.CACHE_EXT
+        data = columns.colReadChunks(self.dataFile, self.dtype, ',',
+                                     self.usecols, 1)
+        key = columns._cacheKey(self.dataFile, ',', 1, COLS, self.dtype)
+        self.assertEqual(columns._readCache(cacheFile, key), None)
+        columns._writeCache(cacheFile, key, data)
+        cached = columns._readCache(cacheFile, key)
+        self.assertEqual(cached.dtype, data.dtype)
+        self.assertTrue(np.all(cached['num'] == data['num']))
+        self.assertEqual(columns._readCache(cacheFile, key + 'x'), None)
+        self.assertEqual(sorted(os.listdir(self.tmpdir)),
+                         ['input.csv', 'input.csv' + columns.CACHE_EXT])
+
+    def test_damagedCache(self):
+        """Test a truncated or empty cache file is treated as missing"""
+        cacheFile = self.dataFile + columns.CACHE_EXT
+        data = columns.colReadChunks(self.dataFile, self.dtype, ',',
+                                     self.usecols, 1)
+        key = columns._cacheKey(self.dataFile, ',', 1, COLS, self.dtype)
+        columns._writeCache(cacheFile, key, data)
+        with open(cacheFile, 'rb') as fh:
+            contents = fh.read()
+        for size in [len(contents) // 2, len(contents) - 10, 0]:
+            with open(cacheFile, 'wb') as fh:
+                fh.write(contents[:size])
+            self.assertEqual(columns._readCache(cacheFile, key), None)
+
+    def test_cacheKeyMtime(self):
+        """Test the key changes if the file is modified within a second"""
+        stat = os.stat(self.dataFile)
+        mtime = int(stat.st_mtime) + 0.25
+        os.utime(self.dataFile, (stat.st_atime, mtime))
+        key = columns._cacheKey(self.dataFile, ',', 1, COLS, self.dtype)
+        os.utime(self.dataFile, (stat.st_atime, mtime + 0.5))
+        self.assertNotEqual(columns._cacheKey(self.dataFile, ',', 1, COLS,
+                                              self.dtype), key)
+
+if __name__ == "__main__":
+    unittest.main()
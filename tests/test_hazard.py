@@ -0,0 +1,104 @@
+import sys
+import unittest
+import numpy as np
+
+try:
+    import pathLocate
+except:
+    from unittests import pathLocate
+
+# Add parent folder to python path
+unittest_dir = pathLocate.getUnitTestDirectory()
+sys.path.append(pathLocate.getRootDirectory())
+import hazard
+from hazard import TileGrid
+
+
+class TestTileSize(unittest.TestCase):
+
+    def setUp(self):
+        self.lon = np.arange(100., 120.05, 0.1)
+        self.lat = np.arange(-25., -9.95, 0.1)
+        self.gridLimit = {'xMin': 100., 'xMax': 120.,
+                          'yMin': -25., 'yMax': -10.}
+
+    def test_pointBytes(self):
+        """Test the memory per grid point counts inputs and results"""
+        self.assertEqual(hazard.pointBytes(1000, 10), 4 * (1000 + 26))
+        self.assertEqual(hazard.pointBytes(1000, 10, True),
+                         4 * (1000 + 66))
+
+    def test_budget(self):
+        """Test tiles fit in the memory budget"""
+        tg = TileGrid(self.gridLimit, self.lon, self.lat)
+        budget = 2. ** 20
+        for numFiles in [10, 1000, 10000]:
+            xstep, ystep = hazard.tileSize(budget, numFiles, 11,
+                                           tg.xdim, tg.ydim, True)
+            self.assertTrue(xstep * ystep *
+                            hazard.pointBytes(numFiles, 11, True) <= budget)
+            self.assertTrue(xstep == tg.xdim or ystep == 1)
+
+        # Single point tiles if the budget is too small:
+        self.assertEqual(hazard.tileSize(100, 10000, 11, tg.xdim, tg.ydim),
+                         (1, 1))
+
+    def test_workers(self):
+        """Test there are at least as many tiles as workers"""
+        tg = TileGrid(self.gridLimit, self.lon, self.lat)
+        xstep, ystep = hazard.tileSize(2. ** 30, 100, 11, tg.xdim, tg.ydim)
+        self.assertEqual((xstep, ystep), (tg.xdim, tg.ydim))
+
+        xstep, ystep = hazard.tileSize(2. ** 30, 100, 11, tg.xdim, tg.ydim,
+                                       workers=4)
+        tiles = TileGrid(self.gridLimit, self.lon, self.lat, xstep, ystep)
+        self.assertTrue(tiles.num_tiles >= 4)
+
+    def test_chunks(self):
+        """Test tiles are rounded down to whole chunks"""
+        nbytes = hazard.pointBytes(100, 11)
+        # Whole rows, rounded down to a band of chunks:
+        self.assertEqual(hazard.tileSize(1000 * 250 * nbytes, 100, 11,
+                                         1000, 800, chunks=(100, 100)),
+                         (1000, 200))
+        # Fewer rows than a chunk, so tiles of one band of chunks:
+        self.assertEqual(hazard.tileSize(1000 * 28 * nbytes, 100, 11,
+                                         1000, 800, chunks=(100, 100)),
+                         (200, 100))
+        # Chunks wider than the domain:
+        self.assertEqual(hazard.tileSize(60 * 120 * nbytes, 100, 11,
+                                         60, 250, chunks=(100, 100)),
+                         (60, 100))
+        # Not rounded if a chunk does not fit in the budget:
+        self.assertEqual(hazard.tileSize(5000 * nbytes, 100, 11,
+                                         1000, 800, chunks=(100, 100)),
+                         (1000, 5))
+
+    def test_tileBounds(self):
+        """Test tiles of whole chunks start on the chunk boundaries"""
+        self.assertEqual(hazard.tileBounds(40, 401, 100, 100),
+                         [40, 100, 200, 300, 400, 441])
+        self.assertEqual(hazard.tileBounds(40, 401, 100),
+                         [40, 140, 240, 340, 440, 441])
+        # Not aligned unless the tiles are whole chunks:
+        self.assertEqual(hazard.tileBounds(40, 401, 90, 100),
+                         [40, 130, 220, 310, 400, 441])
+        self.assertEqual(hazard.tileBounds(40, 401, 401, 100), [40, 441])
+
+    def test_alignedTiles(self):
+        """Test each chunk of the wind field files is read by one tile"""
+        gridLimit = {'xMin': 104., 'xMax': 118.,
+                     'yMin': -23., 'yMax': -11.}
+        tg = TileGrid(gridLimit, self.lon, self.lat, 60, 30, (30, 20))
+        self.assertEqual((tg.imin, tg.jmin), (40, 20))
+        self.assertEqual(sum((tg.x_end - tg.x_start + 1) *
+                             (tg.y_end - tg.y_start + 1)),
+                         tg.xdim * tg.ydim)
+        self.assertTrue(np.all(tg.x_start[tg.x_start > tg.imin] % 20 == 0))
+        self.assertTrue(np.all(tg.y_start[tg.y_start > tg.jmin] % 30 == 0))
+        self.assertTrue(np.all(tg.x_end - tg.x_start < 60))
+        self.assertTrue(np.all(tg.y_end - tg.y_start < 30))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import sys
+import json
+import unittest
+import subprocess
+
+try:
+    import pathLocate
+except:
+    from unittests import pathLocate
+
+# Add parent folder to python path
+unittest_dir = pathLocate.getUnitTestDirectory()
+sys.path.append(pathLocate.getRootDirectory())
+
+# Modules that are only needed for plotting, reading netCDF files or
+# the calculations of each component, and should not be imported to
+# start the model
+HEAVY = ['matplotlib', 'mpl_toolkits.basemap', 'scipy', 'netCDF4',
+         'PlotInterface', 'Evaluate', 'StatInterface', 'TrackGenerator',
+         'wind', 'hazard', 'urllib2']
+
+# Seconds allowed for importing each script
+BUDGET = 1.0
+
+SCRIPT = """
+import sys, json, time
+start = time.time()
+import {0}
+elapsed = time.time() - start
+json.dump({{'time': elapsed, 'modules': sorted(sys.modules)}}, sys.stdout)
+"""
+
+
+class TestImports(unittest.TestCase):
+
+    def importScript(self, name):
+        """Import `name` in a new interpreter"""
+        output = subprocess.check_output(
+            [sys.executable, '-c', SCRIPT.format(name)],
+            cwd=pathLocate.getRootDirectory())
+        return json.loads(output)
+
+    def check(self, name):
+        result = self.importScript(name)
+        loaded = [module for module in HEAVY
+                  if module in result['modules']]
+        self.assertEqual(loaded, [], "%s imports %s" %
+                         (name, ', '.join(loaded)))
+        self.assertTrue(result['time'] < BUDGET,
+                        "Importing %s took %.2f s" % (name, result['time']))
+
+    def test_tcrm(self):
+        """Test tcrm starts without importing the components"""
+        self.check('tcrm')
+
+    def test_tcevent(self):
+        """Test tcevent starts without importing the components"""
+        self.check('tcevent')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,8 @@ from numpy.testing import assert_almost_equal
 
 import os
 import sys
+import shutil
+import tempfile
 import numpy
 from datetime import datetime
 import cPickle
@@ -207,6 +209,52 @@ class TestDateConversion(unittest.TestCase):
         self.assertRaises(ValueError, loadData.date2ymdh, self.badInputDates)
 
 
+class TestFixedWidthDates(unittest.TestCase):
+
+    def setUp(self):
+        self.dates = ['1999-12-31 18:00:00', '2000-02-29 06:30:00',
+                      '2000-03-01 00:00:00']
+
+    def test_fixedWidthLayout(self):
+        """Test positions of fixed-width date directives"""
+        width, fields, literals = loadData._fixedWidthLayout('%Y%m%dT%H%M')
+        self.assertEqual(width, 13)
+        self.assertEqual(fields['Y'], (0, 4))
+        self.assertEqual(fields['M'], (11, 13))
+        self.assertEqual(literals, [(8, 'T')])
+        self.assertEqual(loadData._fixedWidthLayout('%I:%M %p %d/%m/%Y'),
+                         None)
+        self.assertEqual(loadData._fixedWidthLayout('%H:%M'), None)
+
+    def test_parseFixedWidth(self):
+        """Test fixed-width parsing falls back on non-conforming dates"""
+        dt = loadData._parseFixedWidth(self.dates, '%Y-%m-%d %H:%M:%S')
+        self.assertEqual(dt[1], np.datetime64('2000-02-29T06:30:00'))
+        self.assertEqual(loadData._parseFixedWidth(['2000-1-1 00:00:00'],
+                                                   '%Y-%m-%d %H:%M:%S'),
+                         None)
+        self.assertEqual(loadData._parseFixedWidth(['2001-02-29 00:00:00'],
+                                                   '%Y-%m-%d %H:%M:%S'),
+                         None)
+
+    def test_date2ymdhNoPadding(self):
+        """Test date2ymdh with dates that are not zero-padded"""
+        year, month, day, hour, minute, dt = \
+            loadData.date2ymdh(['2000-1-2 3:04:00'])
+        self.assertEqual(dt[0], datetime(2000, 1, 2, 3, 4))
+
+    def test_toDatetime64(self):
+        """Test conversion to datetime64 values and back"""
+        year, month, day, hour, minute, dt = loadData.date2ymdh(self.dates)
+        dt64 = loadData._toDatetime64(year, month, day, hour, minute)
+        self.assertEqual(list(dt64.astype(datetime)), list(dt))
+        result = loadData._fromDatetime64(dt64)
+        for a, b in zip(result, (year, month, day, hour, minute)):
+            assert_almost_equal(a, b)
+        self.assertRaises(ValueError, loadData._toDatetime64,
+                          [2001], [2], [29], [0], [0])
+
+
 class TestAgeParsing(unittest.TestCase):
 
     def setUp(self):
@@ -357,6 +405,37 @@ class TestJulianDays(unittest.TestCase):
         self.assertRaises(ValueError, loadData.julianDays,
                           *badYearArgs)
 
+class TestSpeedBearing(unittest.TestCase):
+
+    def setUp(self):
+        self.index = np.array([1, 0, 0, 1, 0])
+        self.lon = np.array([130., 130., 130.5, 150., 150.])
+        self.lat = np.array([-15., -16., -16., -20., -21.])
+        self.dt = np.array([0., 6., 6., 0., 6.])
+        self.pressure = np.array([990., 985., 980., 1000., 995.])
+        self.penv = np.ones(5) * 1008.
+
+    def test_getSpeedBearing(self):
+        """Test speed and bearing are masked at the start of each TC"""
+        speed, bearing = loadData.getSpeedBearing(self.index, self.lon,
+                                                  self.lat, self.dt,
+                                                  missingValue=-1)
+        assert_almost_equal(speed[[0, 3]], [-1, -1])
+        assert_almost_equal(bearing[[0, 3]], [-1, -1])
+        assert_almost_equal(bearing[[1, 4]], [180., 180.], decimal=3)
+        assert_almost_equal(speed[1], 111.2 / 6., decimal=1)
+
+    def test_maxWindSpeedSharedSpeed(self):
+        """Test maxWindSpeed gives the same result with a given speed"""
+        speed, bearing = loadData.getSpeedBearing(self.index, self.lon,
+                                                  self.lat, self.dt)
+        expected = loadData.maxWindSpeed(self.index, self.dt, self.lon,
+                                         self.lat, self.pressure, self.penv)
+        result = loadData.maxWindSpeed(self.index, self.dt, self.lon,
+                                       self.lat, self.pressure, self.penv,
+                                       speed=speed)
+        assert_almost_equal(result, expected)
+
 class TestLoadingTrackFiles(unittest.TestCase):
 
     def setUp(self):
@@ -370,6 +449,53 @@ class TestLoadingTrackFiles(unittest.TestCase):
                                       'loadTrackFile.pck'))
         self.trackData = cPickle.load(inputFile)
 
+class TestLoadTrackFile(unittest.TestCase):
+    """
+    Test loading a small track file into tracks
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.configFile = os.path.join(self.tmpdir, 'test.ini')
+        self.trackFile = os.path.join(self.tmpdir, 'tracks.csv')
+        with open(self.configFile, 'w') as fh:
+            fh.write("[DataProcess]\n"
+                     "FilterSeasons=False\n"
+                     "[TEST]\n"
+                     "Columns=tcserialno,season,num,date,lat,lon,pressure,"
+                     "penv\n"
+                     "FieldDelimiter=,\n"
+                     "NumberOfHeadingLines=1\n"
+                     "PressureUnits=hPa\n"
+                     "LengthUnits=km\n"
+                     "SpeedUnits=kph\n"
+                     "DateFormat=%Y-%m-%d %H:%M\n")
+        with open(self.trackFile, 'w') as fh:
+            fh.write("serial,season,num,date,lat,lon,pressure,penv\n"
+                     "A,2000,1,2000-01-01 00:00,-15.0,130.0,990,1008\n"
+                     "A,2000,1,2000-01-01 06:00,-16.0,130.0,980,1008\n"
+                     "A,2000,1,2000-01-01 12:00,-16.5,130.5,985,1008\n"
+                     "B,2000,2,2000-02-01 00:00,-20.0,150.0,1000,1010\n"
+                     "B,2000,2,2000-02-01 06:00,-21.0,150.0,995,1010\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_loadTrackFile(self):
+        """Test each track is loaded once with its attributes"""
+        tracks = loadData.loadTrackFile(self.configFile, self.trackFile,
+                                        'TEST')
+        self.assertEqual(len(tracks), 2)
+        self.assertEqual([track.trackId for track in tracks],
+                         [(1, 2), (2, 2)])
+        self.assertEqual([len(track) for track in tracks], [3, 2])
+        self.assertEqual(tracks[1].trackfile, self.trackFile)
+        assert_almost_equal([track.trackMinPressure for track in tracks],
+                            [980., 995.])
+        for track in tracks:
+            self.assertEqual(track.trackMaxWind, track.WindSpeed.max())
+            self.assertTrue(track.trackMaxWind > 0)
+
 #class TestFilterPressure(unittest.TestCase):
 #
 #    def setUp(self):
@@ -0,0 +1,145 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+try:
+    import pathLocate
+except:
+    from unittests import pathLocate
+
+# Add parent folder to python path
+unittest_dir = pathLocate.getUnitTestDirectory()
+sys.path.append(pathLocate.getRootDirectory())
+from Utilities import manifest
+from Utilities.manifest import Manifest, COMPLETE, STARTED
+
+
+class TestManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        for name in ['log', 'tracks', 'windfield']:
+            os.mkdir(os.path.join(self.tmpdir, name))
+        self.filename = os.path.join(self.tmpdir, 'manifest.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write(self, name, text='data'):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, 'w') as fh:
+            fh.write(text)
+        return path
+
+    def test_fileChecksum(self):
+        """Test the checksum of a file, or None if it is missing"""
+        path = self.write('input.csv', 'abc')
+        self.assertEqual(manifest.fileChecksum(path, blocksize=2),
+                         '900150983cd24fb0d6963f7d28e17f72')
+        self.assertEqual(manifest.fileChecksum(path + 'x'), None)
+
+    def test_markComplete(self):
+        """Test an output is complete until it or its parameters change"""
+        path = self.write('tracks/tracks.00000.csv')
+        self.assertFalse(manifest.isMarkedComplete(path, seed=1))
+
+        manifest.markComplete(path, seed=1, jumpahead=100)
+        self.assertTrue(os.path.isfile(os.path.join(
+            self.tmpdir, 'tracks', '.tracks.00000.csv.done')))
+        self.assertTrue(manifest.isMarkedComplete(path, seed=1,
+                                                  jumpahead=100))
+        self.assertFalse(manifest.isMarkedComplete(path, seed=2,
+                                                   jumpahead=100))
+
+        self.write('tracks/tracks.00000.csv', 'truncated')
+        self.assertFalse(manifest.isMarkedComplete(path, seed=1,
+                                                   jumpahead=100))
+        os.remove(path)
+        self.assertFalse(manifest.isMarkedComplete(path, seed=1,
+                                                   jumpahead=100))
+
+    def test_snapshot(self):
+        """Test excluded files and directories are not listed"""
+        self.write('log/main.log')
+        self.write('tracks/tracks.00000.csv', 'abcd')
+        files = manifest.snapshot(self.tmpdir, exclude=['log'])
+        self.assertEqual(list(files), [os.path.join('tracks',
+                                                    'tracks.00000.csv')])
+        self.assertEqual(files.values()[0][0], 4)
+
+    def test_status(self):
+        """Test a stage is complete until its outputs change"""
+        m = Manifest(self.filename, self.tmpdir, exclude=['log'])
+        record = {'config': {'TrackGenerator': {'numsimulations': '5'}},
+                  'inputs': {}, 'upstream': {}}
+        signature = m.signature('1.0', record)
+        self.assertEqual(m.status('TrackGenerator', signature), None)
+
+        m.start('TrackGenerator', signature, record)
+        self.write('tracks/tracks.00000.csv')
+        self.write('log/main.log')
+        m.save()
+        self.assertEqual(Manifest(self.filename, self.tmpdir).status(
+            'TrackGenerator', signature), STARTED)
+
+        m.complete('TrackGenerator')
+        m.save()
+        m = Manifest(self.filename, self.tmpdir, exclude=['log'])
+        self.assertEqual(m.status('TrackGenerator', signature), COMPLETE)
+        self.assertEqual(list(m.stages['TrackGenerator']['outputs']),
+                         [os.path.join('tracks', 'tracks.00000.csv')])
+        self.assertEqual(m.status('TrackGenerator',
+                                  m.signature('1.1', record)), None)
+
+        self.write('tracks/tracks.00000.csv', 'changed')
+        self.assertEqual(m.status('TrackGenerator', signature), None)
+        self.assertFalse(m.isComplete('TrackGenerator'))
+
+    def test_record(self):
+        """Test the record changes with the outputs of upstream stages"""
+        m = Manifest(self.filename, self.tmpdir)
+        path = self.write('input.csv')
+        m.start('TrackGenerator', 'a', {})
+        self.write('tracks/tracks.00000.csv')
+        m.complete('TrackGenerator')
+        first = m.record(self.config(), [], [path], ['TrackGenerator'])
+        self.assertEqual(first['inputs'][path],
+                         manifest.fileChecksum(path))
+
+        m.start('TrackGenerator', 'a', {})
+        self.write('tracks/tracks.00001.csv')
+        m.complete('TrackGenerator')
+        second = m.record(self.config(), [], [path], ['TrackGenerator'])
+        self.assertNotEqual(m.signature('1.0', first),
+                            m.signature('1.0', second))
+
+    def config(self):
+        from ConfigParser import RawConfigParser
+        config = RawConfigParser()
+        config.add_section('Region')
+        config.set('Region', 'gridSpace', "{'x':1.0,'y':1.0}")
+        return config
+
+    def test_resume(self):
+        """Test files written before resuming are outputs of the stage"""
+        m = Manifest(self.filename, self.tmpdir)
+        m.start('WindfieldInterface', 'a', {})
+        self.write('windfield/gust.00000.nc')
+        m.save()
+
+        m = Manifest(self.filename, self.tmpdir)
+        started = m.stages['WindfieldInterface']['started']
+        m.start('WindfieldInterface', 'a', {}, resume=True)
+        self.write('windfield/gust.00001.nc')
+        m.complete('WindfieldInterface', owned=['windfield'])
+        entry = m.stages['WindfieldInterface']
+        self.assertEqual(entry['started'], started)
+        self.assertEqual(sorted(entry['outputs']),
+                         [os.path.join('windfield', 'gust.00000.nc'),
+                          os.path.join('windfield', 'gust.00001.nc')])
+
+
+if __name__ == "__main__":
+    unittest.main()
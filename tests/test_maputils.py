@@ -125,6 +125,24 @@ class TestMapUtils(NumpyTestCase.NumpyTestCase):
         bear = maputils.gridLatLonBear(cLon, cLat, lonArray, latArray)
         self.numpyAssertAlmostEqual(bear, expected)
 
+    def test_MakeGridSingle(self):
+        """Test makeGrid in single precision"""
+        R, theta = maputils.makeGrid(120., -15., 1., 0.05)
+        R32, theta32 = maputils.makeGrid(120., -15., 1., 0.05,
+                                         dtype=numpy.float32)
+        self.assertEqual(R32.dtype, numpy.float32)
+        self.assertEqual(theta32.dtype, numpy.float32)
+        self.assertTrue(numpy.all(R32 > 0))
+        self.assertTrue(numpy.allclose(R32, R, rtol=1e-5, atol=1e-3))
+        self.assertTrue(numpy.allclose(theta32, theta, atol=1e-5))
+
+    def test_MakeGridMargin(self):
+        """Test makeGrid size for margins that are not exact in binary"""
+        for margin in [0.29, 0.57, 2.01]:
+            R, theta = maputils.makeGrid(120., -15., margin, 0.01)
+            n = 2 * int(round(margin / 0.01)) + 1
+            self.assertEqual(R.shape, (n, n))
+
     def test_Bearing(self):
         """Test conversion from bearing to theta and back again"""
         for th in self.theta:
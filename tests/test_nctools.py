@@ -276,6 +276,38 @@ class TestNetCDF(NumpyTestCase.NumpyTestCase):
                            self.dimensions,
                            self.nullvalue_var)
 
+    def test_ncSaveGridChunking(self):
+        """Test ncSaveGrid chunking and compression settings"""
+        nctools.ncSaveGrid(self.ncfile, self.dimensions, self.variables,
+                           complevel=2, shuffle=False, lsd=1,
+                           chunksizes=(4, 20))
+        ncobj = Dataset(self.ncfile)
+        press = ncobj.variables['pressure']
+        self.assertEqual(press.chunking(), [1, 1, 4, 12])
+        self.assertEqual(press.filters()['complevel'], 2)
+        self.assertFalse(press.filters()['shuffle'])
+        self.assertEqual(press.least_significant_digit, 1)
+        ncobj.close()
+
+    def test_ncSaveOptions(self):
+        """Test ncSaveGrid settings are read from a configuration"""
+        from ConfigParser import RawConfigParser
+        config = RawConfigParser()
+        config.add_section('Output')
+        self.assertEqual(nctools.ncSaveOptions(config, 'Output'), {})
+        config.set('Output', 'CompressionLevel', '0')
+        config.set('Output', 'Shuffle', 'False')
+        config.set('Output', 'ChunkSize', '100,100')
+        config.set('Output', 'LeastSignificantDigit', '2')
+        self.assertEqual(nctools.ncSaveOptions(config, 'Output'),
+                         {'zlib': False, 'complevel': 1, 'shuffle': False,
+                          'chunksizes': (100, 100), 'lsd': 2})
+        config.set('Output', 'ChunkSize', '0')
+        config.set('Output', 'LeastSignificantDigit', '')
+        options = nctools.ncSaveOptions(config, 'Output')
+        self.assertFalse('chunksizes' in options)
+        self.assertFalse('lsd' in options)
+
 
 class TestNCReading(NumpyTestCase.NumpyTestCase):
 
@@ -0,0 +1,70 @@
+import sys
+import time
+import threading
+import unittest
+
+try:
+    import pathLocate
+except:
+    from unittests import pathLocate
+
+# Add parent folder to python path
+unittest_dir = pathLocate.getUnitTestDirectory()
+sys.path.append(pathLocate.getRootDirectory())
+from Utilities.prefetch import Prefetch
+
+
+class TestPrefetch(unittest.TestCase):
+
+    def setUp(self):
+        self.produced = []
+
+    def produce(self, n, delay=0.):
+        for i in range(n):
+            time.sleep(delay)
+            self.produced.append((i, threading.current_thread().name))
+            yield i
+
+    def test_order(self):
+        """Test items are produced in order in the background thread"""
+        with Prefetch(self.produce(5, 0.01), 2) as items:
+            self.assertEqual(list(items), range(5))
+        self.assertTrue(all(name == 'Prefetch'
+                            for i, name in self.produced))
+
+    def test_synchronous(self):
+        """Test items are produced in the caller without a queue"""
+        with Prefetch(self.produce(3), 0) as items:
+            self.assertEqual(list(items), range(3))
+        self.assertEqual(set(name for i, name in self.produced),
+                         set([threading.current_thread().name]))
+
+    def test_bounded(self):
+        """Test at most maxsize items are produced ahead"""
+        with Prefetch(self.produce(10), 2) as items:
+            iterator = iter(items)
+            self.assertEqual(next(iterator), 0)
+            time.sleep(0.1)
+            # One item consumed, two queued and one waiting to be queued
+            self.assertTrue(len(self.produced) <= 4)
+        self.assertTrue(len(self.produced) < 10)
+
+    def test_error(self):
+        """Test errors in the producer are raised in the consumer"""
+        def fail():
+            yield 1
+            raise IOError("Cannot read tracks")
+
+        items = []
+        with Prefetch(fail(), 2) as prefetch:
+            try:
+                for item in prefetch:
+                    items.append(item)
+            except IOError:
+                pass
+            else:
+                self.fail("IOError not raised")
+        self.assertEqual(items, [1])
+
+if __name__ == "__main__":
+    unittest.main()
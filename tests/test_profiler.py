@@ -0,0 +1,108 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+try:
+    import pathLocate
+except:
+    from unittests import pathLocate
+
+# Add parent folder to python path
+unittest_dir = pathLocate.getUnitTestDirectory()
+sys.path.append(pathLocate.getRootDirectory())
+from Utilities import profiler
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        profiler.reset()
+        profiler.enable()
+
+    def tearDown(self):
+        profiler.enable(False)
+        profiler.reset()
+
+    def test_disabled(self):
+        """Test nothing is recorded when profiling is off"""
+        profiler.enable(False)
+        self.assertTrue(profiler.span('a') is profiler.NULLSPAN)
+        with profiler.span('a'):
+            pass
+        profiler.addBytes('a', read=10)
+        self.assertEqual(profiler.summary(), {})
+
+    def test_span(self):
+        """Test spans are counted, even if an exception is raised"""
+        for i in range(3):
+            with profiler.span('a'):
+                pass
+        try:
+            with profiler.span('a'):
+                raise ValueError
+        except ValueError:
+            pass
+        stats = profiler.summary()['a']
+        self.assertEqual(stats['count'], 4)
+        self.assertTrue(stats['max'] >= stats['p95'] >= 0.)
+        self.assertAlmostEqual(stats['mean'], stats['total'] / 4)
+
+    def test_timed(self):
+        """Test decorated functions are recorded with their result"""
+        @profiler.timed()
+        def square(x):
+            return x * x
+
+        @profiler.timed('cube')
+        def cube(x):
+            return x ** 3
+
+        self.assertEqual(square(3), 9)
+        self.assertEqual(cube(2), 8)
+        self.assertEqual(cube(3), 27)
+        stats = profiler.summary()
+        self.assertEqual(stats['square']['count'], 1)
+        self.assertEqual(stats['cube']['count'], 2)
+
+    def test_addBytes(self):
+        """Test bytes read and written are accumulated"""
+        profiler.addBytes('io', read=100)
+        profiler.addBytes('io', read=50, written=20)
+        stats = profiler.summary()['io']
+        self.assertEqual(stats['bytesRead'], 150)
+        self.assertEqual(stats['bytesWritten'], 20)
+        self.assertEqual(stats['count'], 0)
+
+    def test_addMemory(self):
+        """Test the largest memory recorded for a span is kept"""
+        profiler.addMemory('tile', 100, 1000)
+        profiler.addMemory('tile', 50)
+        stats = profiler.summary()['tile']
+        self.assertEqual(stats['peakBytes'], 100)
+        self.assertEqual(stats['peakProcessBytes'], 1000)
+        self.assertTrue(profiler.peakMemory() > 0)
+
+    def test_report(self):
+        """Test the report of each worker is written as JSON"""
+        with profiler.span('a'):
+            pass
+        tmpdir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tmpdir, 'profile.json')
+            self.assertEqual(profiler.report(filename), filename)
+            self.assertEqual(profiler.report(filename, 2, 4),
+                             filename + '-2')
+            with open(filename + '-2') as fh:
+                data = json.load(fh)
+        finally:
+            shutil.rmtree(tmpdir)
+        self.assertEqual(data['rank'], 2)
+        self.assertEqual(data['size'], 4)
+        self.assertEqual(data['spans']['a']['count'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import sys
+import pickle
+import unittest
+import numpy as np
+
+try:
+    import pathLocate
+except:
+    from unittests import pathLocate
+
+# Add parent folder to python path
+unittest_dir = pathLocate.getUnitTestDirectory()
+sys.path.append(pathLocate.getRootDirectory())
+from Utilities.track import Track, TrackCollection, viewClass
+
+
+def trackData(numbers):
+    """Records with the given cyclone numbers"""
+    n = len(numbers)
+    data = np.empty(n, dtype=[('CycloneNumber', 'i'), ('Longitude', 'f'),
+                              ('Latitude', 'f'), ('CentralPressure', 'f')])
+    data['CycloneNumber'] = numbers
+    data['Longitude'] = 110. + np.arange(n)
+    data['Latitude'] = -10. - np.arange(n)
+    data['CentralPressure'] = 100000. - 100. * np.arange(n)
+    return data
+
+
+class TestTrackCollection(unittest.TestCase):
+
+    def setUp(self):
+        self.data = trackData([1, 1, 1, 2, 2, 4])
+        self.tracks = TrackCollection.fromCycloneNumbers(self.data,
+                                                         'tracks.csv')
+
+    def test_fromCycloneNumbers(self):
+        """Test tracks are split by cyclone number"""
+        self.assertEqual(len(self.tracks), 4)
+        self.assertEqual(self.tracks.lengths().tolist(), [3, 2, 0, 1])
+        self.assertEqual([len(t) for t in self.tracks], [3, 2, 0, 1])
+        track = self.tracks[1]
+        self.assertEqual(track.trackId, (1, 4))
+        self.assertEqual(track.trackfile, 'tracks.csv')
+        self.assertEqual(track.Longitude.tolist(), [113., 114.])
+        self.assertEqual(self.tracks[-1].CycloneNumber.tolist(), [4])
+
+        empty = TrackCollection.fromCycloneNumbers(self.data[:0])
+        self.assertEqual(len(empty), 1)
+        self.assertEqual(len(empty[0]), 0)
+
+    def test_fromIndicator(self):
+        """Test tracks start where the indicator is set"""
+        indicator = np.array([0, 1, 0, 1, 1, 0])
+        tracks = TrackCollection.fromIndicator(self.data, indicator)
+        self.assertEqual(tracks.lengths().tolist(), [2, 1, 2])
+        self.assertEqual(tracks[0].Longitude.tolist(), [111., 112.])
+
+    def test_bounds(self):
+        """Test the bounds of each track, NaN for empty tracks"""
+        xMin, xMax, yMin, yMax = self.tracks.bounds()
+        self.assertEqual(xMin[:2].tolist(), [110., 113.])
+        self.assertEqual(xMax[:2].tolist(), [112., 114.])
+        self.assertEqual(yMax[:2].tolist(), [-10., -13.])
+        self.assertTrue(np.isnan(xMin[2]))
+        minimum = self.tracks.reduce(np.minimum, 'CentralPressure')
+        self.assertEqual(minimum[3], 99500.)
+
+    def test_inRegion(self):
+        """Test the tracks in a region agree with each track"""
+        gridLimit = {'xMin': 109., 'xMax': 113.5, 'yMin': -20., 'yMax': 0.}
+        inside = self.tracks.inRegion(gridLimit)
+        self.assertEqual(inside.tolist(), [True, False, False, False])
+        self.assertTrue(self.tracks[0].inRegion(gridLimit))
+        self.assertFalse(self.tracks[1].inRegion(gridLimit))
+
+    def test_select(self):
+        """Test selecting tracks by mask or by index"""
+        subset = self.tracks.select(np.array([False, True, False, True]))
+        self.assertEqual(subset.lengths().tolist(), [2, 1])
+        self.assertEqual(subset[1].Longitude.tolist(), [115.])
+        subset = self.tracks.select([3, 0])
+        self.assertEqual(subset.records()['CycloneNumber'].tolist(),
+                         [4, 1, 1, 1])
+
+
+class TestTrack(unittest.TestCase):
+
+    def setUp(self):
+        self.data = trackData([1, 1, 1])
+
+    def test_fields(self):
+        """Test the fields are attributes of the track"""
+        track = Track(self.data)
+        self.assertTrue(isinstance(track, Track))
+        self.assertEqual(len(track), 3)
+        self.assertEqual(track.trackId, None)
+        self.assertEqual(track.Latitude.tolist(), [-10., -11., -12.])
+        self.assertEqual(track.data.tolist(), self.data.tolist())
+
+    def test_data(self):
+        """Test changing the track data does not change the track"""
+        track = Track(self.data)
+        data = track.data
+        data['Longitude'] = 0.
+        self.assertEqual(track.Longitude[0], 110.)
+
+    def test_pickle(self):
+        """Test a track is pickled with its data and attributes"""
+        track = Track(self.data)
+        track.trackId = (0, 1)
+        track.trackMinPressure = 99800.
+        copy = pickle.loads(pickle.dumps(track, pickle.HIGHEST_PROTOCOL))
+        self.assertEqual(copy.trackId, (0, 1))
+        self.assertEqual(copy.trackMinPressure, 99800.)
+        self.assertEqual(copy.data.tolist(), self.data.tolist())
+
+    def test_reserved(self):
+        """Test fields may not replace the attributes of a track"""
+        self.assertRaises(ValueError, viewClass, ('Longitude', 'data'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+try:
+    import pathLocate
+except:
+    from unittests import pathLocate
+
+# Add parent folder to python path
+unittest_dir = pathLocate.getUnitTestDirectory()
+sys.path.append(pathLocate.getRootDirectory())
+from Utilities import version
+
+COMMIT = '0123456789abcdef0123456789abcdef01234567'
+
+
+class TestHeadCommit(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.gitdir = os.path.join(self.tmpdir, '.git')
+        os.makedirs(os.path.join(self.gitdir, 'refs', 'heads'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write(self, name, text):
+        with open(os.path.join(self.gitdir, name), 'w') as fh:
+            fh.write(text)
+
+    def test_branch(self):
+        """Test the commit of the current branch is read"""
+        self.write('HEAD', 'ref: refs/heads/master\n')
+        self.write(os.path.join('refs', 'heads', 'master'), COMMIT + '\n')
+        self.assertEqual(version.headCommit(self.tmpdir), COMMIT)
+
+    def test_packedRefs(self):
+        """Test the commit is read from packed refs"""
+        self.write('HEAD', 'ref: refs/heads/master\n')
+        self.write('packed-refs', '# pack-refs with: peeled\n'
+                   '%s refs/heads/develop\n'
+                   '%s refs/heads/master\n' % ('f' * 40, COMMIT))
+        self.assertEqual(version.headCommit(self.tmpdir), COMMIT)
+
+    def test_detached(self):
+        """Test the commit of a detached HEAD is read"""
+        self.write('HEAD', COMMIT + '\n')
+        self.assertEqual(version.headCommit(self.tmpdir), COMMIT)
+
+    def test_notGit(self):
+        """Test None is returned outside a git checkout"""
+        shutil.rmtree(self.gitdir)
+        self.assertEqual(version.headCommit(self.tmpdir), None)
+
+    def test_checkout(self):
+        """Test the commit of the TCRM checkout matches git"""
+        try:
+            with open(os.devnull, 'w') as devnull:
+                commit = subprocess.check_output(
+                    ['git', 'rev-parse', 'HEAD'], cwd=version.ROOT,
+                    stderr=devnull).strip()
+        except (OSError, subprocess.CalledProcessError):
+            self.skipTest("Not a git checkout")
+        self.assertEqual(version.headCommit(), commit)
+        self.assertEqual(version.version(), commit)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,381 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from datetime import datetime, timedelta
+
+try:
+    import pathLocate
+except:
+    from unittests import pathLocate
+
+# Add parent folder to python path
+unittest_dir = pathLocate.getUnitTestDirectory()
+sys.path.append(pathLocate.getRootDirectory())
+import wind
+from Utilities.track import TrackCollection
+
+
+def syntheticTrack(n=12, **fields):
+    """A storm moving south-west at 5 m/s"""
+    data = np.empty(n, dtype={'names': wind.TRACKFILE_COLS,
+                              'formats': wind.TRACKFILE_FMTS})
+    data['CycloneNumber'] = 1
+    data['Datetime'] = [datetime(2000, 1, 1) + timedelta(hours=i)
+                        for i in range(n)]
+    data['TimeElapsed'] = np.arange(n)
+    data['Longitude'] = np.linspace(120., 121., n)
+    data['Latitude'] = np.linspace(-15., -16., n)
+    data['Speed'] = 5.
+    data['Bearing'] = np.radians(225.)
+    data['CentralPressure'] = 95000.
+    data['EnvPressure'] = 101000.
+    data['rMax'] = 30.
+    for name, value in fields.items():
+        data[name] = value
+    return wind.Track(data)
+
+
+class TestPrecision(unittest.TestCase):
+
+    def setUp(self):
+        self.track = syntheticTrack()
+
+    def test_localWindField(self):
+        """Test single precision is kept through the wind field"""
+        for windFieldType in ['kepert', 'hubbert', 'mcconochie']:
+            wt = wind.WindfieldAroundTrack(self.track, profileType='holland',
+                                           windFieldType=windFieldType,
+                                           margin=1., dtype=np.float32)
+            Ux, Vy, P = wt.localWindField(0)
+            for arr in (Ux, Vy, P):
+                self.assertEqual(arr.dtype, np.float32, windFieldType)
+                self.assertTrue(np.all(np.isfinite(arr)), windFieldType)
+
+    def test_comparePrecision(self):
+        """Test single precision gusts are close to double precision"""
+        for profileType in ['holland', 'powell', 'willoughby']:
+            wfg = wind.WindfieldGenerator(None, margin=1.,
+                                          profileType=profileType,
+                                          windFieldType='kepert')
+            diffs = wfg.comparePrecision(self.track)
+            self.assertTrue(diffs['gustMax'] < 0.01, profileType)
+            self.assertTrue(diffs['gustRelMax'] < 1e-4, profileType)
+            self.assertTrue(diffs['pressureMax'] < 1., profileType)
+
+class TestModels(unittest.TestCase):
+
+    def setUp(self):
+        self.track = syntheticTrack()
+
+    def test_fieldReused(self):
+        """Test the field model is reused with each step's profile"""
+        wt = wind.WindfieldAroundTrack(self.track, profileType='holland',
+                                       margin=1.)
+        windfield = wt.windfield
+        Ux, Vy, P = wt.localWindField(0)
+        Ux1, Vy1, P1 = wt.localWindField(1)
+        self.assertTrue(wt.windfield is windfield)
+        self.assertEqual(windfield.profile.lon, self.track.Longitude[1])
+        self.assertFalse(np.allclose(Ux, Ux1))
+
+
+class TestExtremes(unittest.TestCase):
+
+    def setUp(self):
+        self.extremes = wind.WindExtremes.empty((3, 4), 101000.)
+
+    def test_update(self):
+        """Test the extremes are updated in place within a window"""
+        gust = self.extremes.gust
+        window = (slice(1, 3), slice(0, 2))
+        ones = np.ones((2, 2))
+        self.extremes.update(10. * ones, 90. * ones, -10. * ones, 0. * ones,
+                             99000. * ones, window)
+        self.extremes.update(np.array([[5., 20.], [5., 5.]]), 180. * ones,
+                             0. * ones, 20. * ones, 100000. * ones, window)
+        self.assertTrue(self.extremes.gust is gust)
+        np.testing.assert_equal(gust[1:, :2], [[10., 20.], [10., 10.]])
+        np.testing.assert_equal(self.extremes.bearing[1:, :2],
+                                [[90., 180.], [90., 90.]])
+        np.testing.assert_equal(self.extremes.Ux[1:, :2],
+                                [[-10., 0.], [-10., -10.]])
+        np.testing.assert_equal(self.extremes.Vy[1:, :2],
+                                [[0., 20.], [0., 0.]])
+        self.assertTrue(np.all(self.extremes.pressure[1:, :2] == 99000.))
+        self.assertTrue(np.all(gust[0] == 0.))
+        self.assertTrue(np.all(self.extremes.pressure[:, 2:] == 101000.))
+
+    def test_trackfile(self):
+        """Test wind components are merged with the maximum gust"""
+        tmpdir = tempfile.mkdtemp()
+        trackfile = os.path.join(tmpdir, 'tracks.csv')
+        with open(trackfile, 'w') as fh:
+            fh.write('%header\n')
+            for num, cp in [(1, 990.), (2, 950.)]:
+                for i in range(6):
+                    fh.write('%d,2000-01-01 %02d:00:00,%d,%.1f,-15.0,'
+                             '18.,270.,%.1f,1010.,30.\n' %
+                             (num, i, i, 120. + 0.2 * i, cp))
+        wfg = wind.WindfieldGenerator(None, margin=1., resolution=0.1,
+                                      profileType='powell')
+        try:
+            gust, bearing, Vx, Vy, P, lon, lat = \
+                wfg.calculateExtremesFromTrackfile(trackfile)
+        finally:
+            shutil.rmtree(tmpdir)
+        np.testing.assert_almost_equal(np.hypot(Vx, Vy), gust, 4)
+
+
+class TestGustWindow(unittest.TestCase):
+
+    def setUp(self):
+        self.track = syntheticTrack(CentralPressure=100500., rMax=15.)
+
+    def regionalGust(self, gustThreshold):
+        wfg = wind.WindfieldGenerator(None, margin=2., resolution=0.05,
+                                      profileType='powell',
+                                      gustThreshold=gustThreshold)
+        wfg.setGridLimit(self.track)
+        wt = wfg.windfieldAroundTrack(self.track)
+        return wt, wt.regionalExtremes(wfg.gridLimit)
+
+    def test_windowMargin(self):
+        """Test the window is reduced for a weak storm"""
+        wt, extremes = self.regionalGust(0.)
+        self.assertEqual(wt.windowMargin(0), 2.)
+        wt, extremes = self.regionalGust(15.)
+        margin = wt.windowMargin(0)
+        self.assertTrue(margin < 1.)
+        self.assertAlmostEqual(margin / 0.05, round(margin / 0.05))
+
+    def test_gustAboveThreshold(self):
+        """Test gusts above the threshold are unchanged by the window"""
+        wt, extremes = self.regionalGust(0.)
+        full = extremes[0]
+        wt, extremes = self.regionalGust(15.)
+        windowed = extremes[0]
+        above = full >= 15.
+        self.assertTrue(above.any())
+        np.testing.assert_array_equal(windowed[above], full[above])
+        self.assertTrue(np.all(windowed[~above] < 15.))
+
+    def test_pressureOverMargin(self):
+        """Test the pressure is evaluated beyond the window"""
+        wt, full = self.regionalGust(0.)
+        wt, windowed = self.regionalGust(15.)
+        np.testing.assert_array_equal(windowed[4], full[4])
+
+    def test_oneProfilePerStep(self):
+        """Test the radial profile is created once at each time step"""
+        wfg = wind.WindfieldGenerator(None, margin=2., resolution=0.05,
+                                      profileType='powell',
+                                      profileTolerance=1e-3,
+                                      gustThreshold=15.)
+        wfg.setGridLimit(self.track)
+        wt = wfg.windfieldAroundTrack(self.track)
+        profiles = []
+        windProfile = wt.windProfile
+
+        def countProfile(i):
+            profiles.append(windProfile(i))
+            return profiles[-1]
+
+        wt.windProfile = countProfile
+        wt.regionalExtremes(wfg.gridLimit)
+        self.assertEqual(len(profiles), len(self.track))
+        self.assertTrue(wt.lookup_ is profiles[-1])
+
+class TestNestedGrid(unittest.TestCase):
+
+    def setUp(self):
+        self.track = syntheticTrack()
+
+    def test_upsample(self):
+        """Test upsampling reproduces a linear function exactly"""
+        x = np.arange(-6., 7.)
+        coarse = np.add.outer(2. * x, -x)
+        fine = wind.upsample(coarse, 3, 2, 35)
+        xf = (np.arange(35) + 2) / 3. - 6.
+        np.testing.assert_almost_equal(fine, np.add.outer(2. * xf, -xf))
+
+    def test_nestedWindField(self):
+        """Test the nested wind field is close to the full wind field"""
+        full = wind.WindfieldAroundTrack(self.track, profileType='powell',
+                                         margin=1., resolution=0.02)
+        nested = wind.WindfieldAroundTrack(self.track, profileType='powell',
+                                           margin=1., resolution=0.02,
+                                           nestRadius=3., nestFactor=4)
+        for expected, result in zip(full.localWindField(2),
+                                    nested.localWindField(2)):
+            self.assertEqual(result.shape, expected.shape)
+            np.testing.assert_array_equal(result[50, 40:61],
+                                          expected[50, 40:61])
+        Ux, Vy, P = full.localWindField(2)
+        nUx, nVy, nP = nested.localWindField(2)
+        diff = np.hypot(nUx - Ux, nVy - Vy)
+        self.assertTrue(diff.max() < 0.5)
+        self.assertTrue(np.abs(nP - P).max() < 10.)
+
+class TestGridSeries(unittest.TestCase):
+
+    def setUp(self):
+        self.track = syntheticTrack()
+        self.tmpdir = tempfile.mkdtemp()
+        self.wfg = wind.WindfieldGenerator(None, margin=1., resolution=0.1,
+                                           profileType='powell')
+        self.wfg.setGridLimit(self.track)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_regionalGrid(self):
+        """Test the regional grid covers the domain and margin"""
+        lonGrid, latGrid = wind.regionalGrid(self.wfg.gridLimit, 1., 0.1)
+        self.assertEqual(lonGrid[0], 11900)
+        self.assertEqual(lonGrid[-1], 12200)
+        self.assertEqual(latGrid[0], -1700)
+        self.assertEqual(np.diff(latGrid).max(), 10)
+
+    def test_extract(self):
+        """Test each time step is written and matches the extremes"""
+        from Utilities.gridseries import GridSeries
+        from netCDF4 import Dataset
+        lonGrid, latGrid = wind.regionalGrid(self.wfg.gridLimit, 1., 0.1)
+        filename = os.path.join(self.tmpdir, 'evolution.nc')
+        gs = GridSeries(filename, lonGrid / 100., latGrid / 100.,
+                        syncInterval=5)
+        track, result = self.wfg.calculateExtremesFromTrack(self.track,
+                                                            gs.extract)
+        gs.shutdown()
+
+        ncobj = Dataset(filename)
+        try:
+            self.assertEqual(ncobj.dimensions['time'].isunlimited(), True)
+            self.assertEqual(len(ncobj.variables['time']), len(self.track.data))
+            gust = ncobj.variables['gust']
+            self.assertEqual(gust.shape,
+                             (len(self.track.data), len(latGrid), len(lonGrid)))
+            self.assertEqual(gust.chunking()[0], 1)
+            self.assertTrue(gust.filters()['zlib'])
+            maxGust = np.ma.filled(gust[:].max(axis=0), 0.)
+            slp = ncobj.variables['slp'][:]
+        finally:
+            ncobj.close()
+        np.testing.assert_almost_equal(maxGust, result[0], 4)
+        self.assertTrue(np.ma.count_masked(slp) > 0)
+        np.testing.assert_almost_equal(slp.min(axis=0).filled(101000.),
+                                       result[4], 1)
+
+class TestDumpGusts(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.trackfiles = []
+        for num in range(3):
+            trackfile = os.path.join(self.tmpdir, 'tracks.%d.csv' % num)
+            with open(trackfile, 'w') as fh:
+                fh.write('%header\n')
+                for i in range(4):
+                    fh.write('1,2000-01-01 %02d:00:00,%d,%.1f,-15.0,'
+                             '18.,270.,%.1f,1010.,30.\n' %
+                             (i, i, 120. + 0.2 * i, 960. + 10. * num))
+            self.trackfiles.append(trackfile)
+        self.wfg = wind.WindfieldGenerator(None, margin=1., resolution=0.1,
+                                           profileType='powell')
+        wind.pp = wind.attemptParallel()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_writeQueue(self):
+        """Test gust files written in the background match"""
+        from Utilities.writequeue import WriteQueue
+        from netCDF4 import Dataset
+        self.wfg.config = wind.ConfigParser()
+        for path, queueSize in [('sync', 0), ('async', 2)]:
+            os.mkdir(os.path.join(self.tmpdir, path))
+            with WriteQueue(queueSize) as writeQueue:
+                self.wfg.dumpGustsFromTrackfiles(
+                    self.trackfiles, os.path.join(self.tmpdir, path),
+                    writeQueue=writeQueue)
+        for num in range(3):
+            vmax = []
+            for path in ['sync', 'async']:
+                ncobj = Dataset(os.path.join(self.tmpdir, path,
+                                             'gust.%d.nc' % num))
+                vmax.append(ncobj.variables['vmax'][:])
+                ncobj.close()
+            np.testing.assert_array_equal(vmax[0], vmax[1])
+
+
+class TestStreamedTracks(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def generated(self, ntracks):
+        """Tracks as returned by the track generator"""
+        results = []
+        for num in range(1, ntracks + 1):
+            n = 3 + num
+            results.append((np.ones(n) * num,
+                            np.array([datetime(2000, 1, 1) +
+                                      timedelta(hours=i) for i in range(n)]),
+                            np.arange(n) / 3.,
+                            120. + np.arange(n) / 7.,
+                            -15. - np.arange(n) / 9.,
+                            np.linspace(10., 20., n) / 3.,
+                            np.linspace(200., 250., n) / 7.,
+                            np.linspace(960., 980., n) / 1.0001,
+                            np.ones(n) * 1010.123456,
+                            np.linspace(20., 40., n) / 3.))
+        if len(results) > 0:
+            return np.hstack([np.vstack(r) for r in results]).T
+        return np.array(results).T
+
+    def test_generatedTrackData(self):
+        """Test streamed tracks match those read from the track file"""
+        fmt = '%i,%s,%7.3f,%8.3f,%8.3f,%6.2f,%6.2f,%7.2f,%7.2f,%6.2f'
+        for ntracks in [0, 1, 2]:
+            tracks = self.generated(ntracks)
+            trackfile = os.path.join(self.tmpdir, 'tracks.csv')
+            with open(trackfile, 'w') as fh:
+                fh.write('%header\n')
+                if len(tracks) > 0:
+                    np.savetxt(fh, tracks, fmt=fmt)
+
+            expected = TrackCollection.fromCycloneNumbers(
+                wind.readTrackData(trackfile))
+            result = TrackCollection.fromCycloneNumbers(
+                wind.generatedTrackData(tracks))
+            self.assertEqual(result.lengths().tolist(),
+                             expected.lengths().tolist())
+            for name in wind.TRACKFILE_COLS:
+                data = result.columns[name]
+                read = expected.columns[name]
+                if name == 'Datetime':
+                    self.assertEqual(list(data), list(read))
+                else:
+                    np.testing.assert_allclose(data, read, rtol=1e-12)
+
+    def test_loadTracksFromSimulations(self):
+        """Test tracks of each simulation are numbered as in files"""
+        class Simulation(object):
+            seed, jumpahead, ntracks = 1, 100, 2
+            index = 0
+
+        tracks = list(wind.loadTracksFromSimulations(
+            [(Simulation(), 'tracks.00000.csv', self.generated(2))]))
+        self.assertEqual([t.trackId for t in tracks], [(0, 2), (1, 2)])
+        self.assertEqual(tracks[1].params, {'seed': 1, 'jumpahead': 100,
+                                            'ntracks': 2})
+        self.assertEqual(len(tracks[1].Longitude), 5)
+
+if __name__ == "__main__":
+    unittest.main()
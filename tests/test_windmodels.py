@@ -144,6 +144,144 @@ class TestWindVorticity(NumpyTestCase.NumpyTestCase):
         self.numpyAssertAlmostEqual(V, self.test_vorticity_powell)
 
 
+class TestWindPressure(NumpyTestCase.NumpyTestCase):
+
+    def setUp(self):
+        pkl_file = open(os.path.join(unittest_dir, 'test_data',
+                                     'pressureProfileTestData.pck'), 'r')
+        self.R = cPickle.load(pkl_file)
+        self.pEnv = cPickle.load(pkl_file)
+        self.pCentre = cPickle.load(pkl_file)
+        self.rMax = cPickle.load(pkl_file)
+        self.cLat = cPickle.load(pkl_file)
+        self.cLon = cPickle.load(pkl_file)
+        self.beta = cPickle.load(pkl_file)
+        self.rMax2 = cPickle.load(pkl_file)
+        self.beta1 = cPickle.load(pkl_file)
+        self.beta2 = cPickle.load(pkl_file)
+        self.test_pHolland = cPickle.load(pkl_file)
+        self.test_pWilloughby = cPickle.load(pkl_file)
+        self.test_pdoubleHolland = cPickle.load(pkl_file)
+        self.test_pPowell = cPickle.load(pkl_file)
+        pkl_file.close()
+
+    def testHolland(self):
+        profile = HollandWindProfile(self.cLat, self.cLon, self.pEnv,
+                                     self.pCentre, self.rMax, self.beta)
+        P = profile.pressure(self.R)
+        self.numpyAssertAlmostEqual(P, self.test_pHolland)
+
+    def testWilloughby(self):
+        profile = WilloughbyWindProfile(
+            self.cLat, self.cLon, self.pEnv, self.pCentre, self.rMax)
+        P = profile.pressure(self.R)
+        self.numpyAssertAlmostEqual(P, self.test_pWilloughby)
+
+    def testPowell(self):
+        profile = PowellWindProfile(
+            self.cLat, self.cLon, self.pEnv, self.pCentre, self.rMax)
+        P = profile.pressure(self.R)
+        self.numpyAssertAlmostEqual(P, self.test_pPowell)
+
+    def testDoubleHolland(self):
+        profile = DoubleHollandWindProfile(
+            self.cLat, self.cLon, self.pEnv, self.pCentre, self.rMax,
+            self.beta1, self.beta2, self.rMax2)
+        P = profile.pressure(self.R)
+        self.numpyAssertAlmostEqual(P, self.test_pdoubleHolland)
+
+    def testSharedTerms(self):
+        """Test radial terms are only calculated once for a grid"""
+        profile = HollandWindProfile(self.cLat, self.cLon, self.pEnv,
+                                     self.pCentre, self.rMax, self.beta)
+        terms = profile.hollandTerms(self.R)
+        self.assertTrue(profile.hollandTerms(self.R) is terms)
+        profile.beta = self.beta + 0.1
+        self.assertFalse(profile.hollandTerms(self.R) is terms)
+        self.assertFalse(profile.hollandTerms(self.R.copy()) is terms)
+
+
+class TestRadialLookup(NumpyTestCase.NumpyTestCase):
+
+    def setUp(self):
+        x = np.linspace(-200., 200., 201)
+        self.R = np.hypot(*np.meshgrid(x, x))
+        self.R[100, 100] = 1e-30
+        self.tolerance = 1e-3
+        self.profiles = [
+            HollandWindProfile(-15., 120., 101000., 95000., 30., 1.3),
+            PowellWindProfile(-15., 120., 101000., 95000., 30.),
+            DoubleHollandWindProfile(-15., 120., 101000., 95000., 30.,
+                                     1.3, 1.3, 60.),
+            RankineWindProfile(-15., 120., 101000., 95000., 30.)]
+
+    def testAccuracy(self):
+        """Test lookup table values are within the tolerance"""
+        for profile in self.profiles:
+            lookup = RadialLookupProfile(profile, self.tolerance)
+            methods = ['velocity', 'vorticity']
+            if not isinstance(profile, RankineWindProfile):
+                methods.append('pressure')
+            for name in methods:
+                exact = getattr(profile, name)(self.R)
+                approx = getattr(lookup, name)(self.R)
+                scale = exact.max() - exact.min()
+                error = np.abs(approx - exact).max()
+                self.assertTrue(error <= 2 * self.tolerance * scale,
+                                "%s %s" % (profile.__class__.__name__, name))
+
+    def testRmax(self):
+        """Test values either side of rMax use the profile on that side"""
+        R = 30. * np.array([1. - 1e-9, 1., 1. + 1e-9, 200.])
+        for profile in self.profiles:
+            lookup = RadialLookupProfile(profile, self.tolerance)
+            self.numpyAssertAlmostEqual(lookup.vorticity(R),
+                                        profile.vorticity(R))
+
+    def testTableReuse(self):
+        """Test tables are only built once for a grid"""
+        lookup = RadialLookupProfile(self.profiles[0], self.tolerance)
+        lookup.velocity(self.R)
+        table = lookup.tables_['velocity']
+        lookup.velocity(self.R)
+        self.assertTrue(lookup.tables_['velocity'] is table)
+        self.assertEqual(lookup.rMax, self.profiles[0].rMax)
+
+        # A grid within the range of the table:
+        lookup.velocity(self.R[50:150, 50:150])
+        self.assertTrue(lookup.tables_['velocity'][1:] == table[1:])
+
+    def testPrevious(self):
+        """Test the spacing of the previous time step is reused"""
+        first = RadialLookupProfile(self.profiles[0], self.tolerance)
+        first.velocity(self.R)
+        profile = HollandWindProfile(-15.1, 120., 101000., 95200., 32., 1.3)
+        lookup = RadialLookupProfile(profile, self.tolerance,
+                                     previous=first)
+        self.assertEqual(lookup.nCore, first.nCore)
+        self.assertEqual(lookup.checked, set(['velocity']))
+        exact = profile.velocity(self.R)
+        error = np.abs(lookup.velocity(self.R) - exact).max()
+        self.assertTrue(error <= 2 * self.tolerance * (exact.max() -
+                                                       exact.min()))
+        self.assertEqual(lookup.nCore, first.nCore)
+
+
+class TestModelParams(unittest.TestCase):
+
+    def testProfileParams(self):
+        """Test the additional profile parameters are resolved"""
+        self.assertEqual(profileParams('holland'), ['beta'])
+        self.assertEqual(profileParams('doubleholland'),
+                         ['beta1', 'beta2', 'rMax2'])
+        self.assertEqual(profileParams('powell'), [])
+
+    def testFieldParams(self):
+        """Test the additional field parameters are resolved"""
+        for name in ['kepert', 'hubbert', 'mcconochie']:
+            self.assertEqual(fieldParams(name), [])
+
+
 class TestWindField(NumpyTestCase.NumpyTestCase):
 
     def setUp(self):
@@ -203,5 +341,11 @@ if __name__ == "__main__":
     testSuite = unittest.makeSuite(TestWindVorticity, 'test')
     unittest.TextTestRunner(verbosity=2).run(testSuite)
 
+    testSuite = unittest.makeSuite(TestWindPressure, 'test')
+    unittest.TextTestRunner(verbosity=2).run(testSuite)
+
+    testSuite = unittest.makeSuite(TestRadialLookup, 'test')
+    unittest.TextTestRunner(verbosity=2).run(testSuite)
+
     testSuite = unittest.makeSuite(TestWindField, 'test')
     unittest.TextTestRunner(verbosity=2).run(testSuite)
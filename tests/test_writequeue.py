@@ -0,0 +1,94 @@
+import sys
+import time
+import threading
+import unittest
+
+try:
+    import pathLocate
+except:
+    from unittests import pathLocate
+
+# Add parent folder to python path
+unittest_dir = pathLocate.getUnitTestDirectory()
+sys.path.append(pathLocate.getRootDirectory())
+from Utilities.writequeue import WriteQueue
+
+
+class TestWriteQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.written = []
+
+    def write(self, value, delay=0.):
+        time.sleep(delay)
+        self.written.append((value, threading.current_thread().name))
+
+    def failWrite(self, value):
+        raise IOError("Cannot write %s" % value)
+
+    def test_order(self):
+        """Test tasks are executed in order in the writer thread"""
+        with WriteQueue(2) as writeQueue:
+            for i in range(5):
+                writeQueue.submit(self.write, i, delay=0.01)
+        self.assertEqual([v for v, name in self.written], range(5))
+        self.assertTrue(all(name == 'WriteQueue'
+                            for v, name in self.written))
+
+    def test_synchronous(self):
+        """Test tasks are executed immediately without a queue"""
+        writeQueue = WriteQueue(0)
+        writeQueue.submit(self.write, 1)
+        self.assertEqual(self.written,
+                         [(1, threading.current_thread().name)])
+        writeQueue.shutdown()
+
+    def test_backpressure(self):
+        """Test submitting blocks while the queue is full"""
+        event = threading.Event()
+        writeQueue = WriteQueue(1)
+        writeQueue.submit(event.wait)
+        writeQueue.submit(self.write, 1)
+        submitted = threading.Event()
+
+        def submit():
+            writeQueue.submit(self.write, 2)
+            submitted.set()
+
+        thread = threading.Thread(target=submit)
+        thread.start()
+        self.assertFalse(submitted.wait(0.1))
+        event.set()
+        thread.join()
+        writeQueue.shutdown()
+        self.assertEqual([v for v, name in self.written], [1, 2])
+
+    def test_error(self):
+        """Test errors in the writer are raised in the caller"""
+        writeQueue = WriteQueue(2)
+        writeQueue.submit(self.failWrite, 1)
+        writeQueue.queue.join()
+        self.assertRaises(IOError, writeQueue.submit, self.write, 2)
+        writeQueue.shutdown()
+        self.assertEqual(self.written, [])
+
+        writeQueue = WriteQueue(2)
+        event = threading.Event()
+        writeQueue.submit(event.wait)
+        writeQueue.submit(self.failWrite, 1)
+        writeQueue.submit(self.write, 2)
+        event.set()
+        self.assertRaises(IOError, writeQueue.shutdown)
+        self.assertEqual(self.written, [])
+
+    def test_errorInContext(self):
+        """Test pending tasks are completed when the caller fails"""
+        def run():
+            with WriteQueue(2) as writeQueue:
+                writeQueue.submit(self.write, 1, delay=0.05)
+                raise ValueError("Calculation failed")
+        self.assertRaises(ValueError, run)
+        self.assertEqual([v for v, name in self.written], [1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -44,8 +44,13 @@ from Utilities.config import ConfigParser
 from Utilities.metutils import convert
 from Utilities.maputils import bearing2theta, makeGrid
 from Utilities.parallel import attemptParallel
+from Utilities.writequeue import WriteQueue
+from Utilities.prefetch import Prefetch
+from Utilities.manifest import markComplete, isMarkedComplete
+from Utilities.track import Track, TrackCollection
 
 import Utilities.nctools as nctools
+import Utilities.profiler as profiler
 
 # Trackfile .csv format.
 DATEFORMAT = "%Y-%m-%d %H:%M:%S"
@@ -68,63 +73,102 @@ TRACKFILE_CNVT = {
 }
 
 
-class Track(object):
+class WindExtremes(object):
 
     """
-    A single tropical cyclone track.
+    Running extremes of the wind field over a grid: the maximum gust
+    wind speed, the bearing and components of the wind at the time of
+    the maximum gust, and the minimum pressure.
 
-    The object exposes the track data through the object attributes.
-    For example, If `data` contains the tropical cyclone track data
-    (`numpy.array`) loaded with the :meth:`readTrackData` function,
-    then the central pressure column can be printed out with the
-    code::
+    The extremes are updated in place, so merging a time step or a
+    track does not allocate new grids.
 
-        >>> t = Track(data)
-        >>> print(t.CentralPressure)
+    :param gust: maximum gust wind speed.
+    :param bearing: bearing of the wind at the maximum gust.
+    :param Ux: eastward component of the wind at the maximum gust.
+    :param Vy: northward component of the wind at the maximum gust.
+    :param pressure: minimum pressure.
+    :type  gust, bearing, Ux, Vy, pressure: :class:`numpy.ndarray`
 
-
-    :type  data: numpy.ndarray
-    :param data: the tropical cyclone track data.
     """
 
-    def __init__(self, data):
-        self.data = data
-        self.trackId = None
-        self.trackfile = None
+    def __init__(self, gust, bearing, Ux, Vy, pressure):
+        self.gust = gust
+        self.bearing = bearing
+        self.Ux = Ux
+        self.Vy = Vy
+        self.pressure = pressure
+        self.mask = np.empty(gust.shape, dtype=bool)
 
-    def __getattr__(self, key):
+    @classmethod
+    def empty(cls, shape, envPressure, dtype='f'):
         """
-        Get the `key` from the `data` object.
+        Create extremes for a grid with no wind and the environmental
+        pressure everywhere.
 
-        :type  key: str
-        :param key: the key to lookup in the `data` object.
+        :param tuple shape: shape of the grid.
+        :param float envPressure: the environmental pressure.
+        :param dtype: floating point type of the grids.
         """
-        if key.startswith('__') and key.endswith('__'):
-            return super(Track, self).__getattr__(key)
-        return self.data[key]
+        pressure = np.empty(shape, dtype=dtype)
+        pressure.fill(envPressure)
+        return cls(np.zeros(shape, dtype), np.zeros(shape, dtype),
+                   np.zeros(shape, dtype), np.zeros(shape, dtype),
+                   pressure)
 
-    def inRegion(self, gridLimit):
+    def update(self, gust, bearing, Ux, Vy, pressure, window=Ellipsis):
+        """
+        Retain the new values where the gust wind speed is larger than
+        the current maximum, and the new pressure where it is lower
+        than the current minimum.
+
+        :param gust: gust wind speed.
+        :param bearing: bearing of the wind.
+        :param Ux: eastward component of the wind.
+        :param Vy: northward component of the wind.
+        :param pressure: pressure.
+        :type  gust, bearing, Ux, Vy, pressure: :class:`numpy.ndarray`
+        :param window: index of the region of the grid covered by the
+                       new values (default is the whole grid).
         """
-        Check if the tropical cyclone track falls within a region.
+        mask = self.mask[window]
 
-        :type  gridLimit: :class:`dict`
-        :param gridLimit: the region to check.
-                          The :class:`dict` should contain the keys
-                          :attr:`xMin`, :attr:`xMax`, :attr:`yMin` and
-                          :attr:`yMax`. The *y* variable bounds the
-                          latitude and the *x* variable bounds the
-                          longitude.
+        np.greater(gust, self.gust[window], out=mask)
+        np.copyto(self.gust[window], gust, where=mask)
+        np.copyto(self.bearing[window], bearing, where=mask)
+        np.copyto(self.Ux[window], Ux, where=mask)
+        np.copyto(self.Vy[window], Vy, where=mask)
 
+        self.updatePressure(pressure, window)
+
+    def updatePressure(self, pressure, window=Ellipsis):
         """
-        xMin = gridLimit['xMin']
-        xMax = gridLimit['xMax']
-        yMin = gridLimit['yMin']
-        yMax = gridLimit['yMax']
+        Retain the new pressure where it is lower than the current
+        minimum.
 
-        return ((xMin <= np.min(self.Longitude)) and
-                (np.max(self.Latitude) <= xMax) and
-                (yMin <= np.min(self.Latitude)) and
-                (np.max(self.Latitude) <= yMax))
+        :param pressure: pressure.
+        :type  pressure: :class:`numpy.ndarray`
+        :param window: index of the region of the grid covered by the
+                       new values (default is the whole grid).
+        """
+        mask = self.mask[window]
+        np.less(pressure, self.pressure[window], out=mask)
+        np.copyto(self.pressure[window], pressure, where=mask)
+
+    def merge(self, other):
+        """
+        Merge the extremes from another :class:`WindExtremes` on the
+        same grid.
+        """
+        self.update(other.gust, other.bearing, other.Ux, other.Vy,
+                    other.pressure)
+
+    def arrays(self):
+        """
+        :returns: the gust, bearing, eastward and northward wind and
+                  pressure grids.
+        """
+        return self.gust, self.bearing, self.Ux, self.Vy, self.pressure
 
 
 class WindfieldAroundTrack(object):
@@ -170,12 +214,40 @@ class WindfieldAroundTrack(object):
                       latitude and the *x* variable bounds the
                       longitude.
 
+    :type  profileTolerance: float
+    :param profileTolerance: if greater than zero, the radial profile
+                             is interpolated from a lookup table with
+                             this relative accuracy, rather than
+                             evaluated at every grid point.
+
+    :type  dtype: :class:`numpy.dtype`
+    :param dtype: floating point type of the grid, profile and wind
+                  field arrays.
+
+    :type  gustThreshold: float
+    :param gustThreshold: if greater than zero, the wind field is only
+                          evaluated within the distance of the eye where
+                          the gust wind speed may exceed this value (m/s).
+                          The pressure is still evaluated over the margin.
+
+    :type  nestRadius: float
+    :param nestRadius: if greater than zero, the wind field is only
+                       evaluated at full resolution within this distance
+                       of the eye (in multiples of the radius to maximum
+                       winds), and interpolated from a coarser grid
+                       elsewhere.
+
+    :type  nestFactor: int
+    :param nestFactor: ratio of the coarse grid spacing to `resolution`.
+
     """
 
     def __init__(self, track, profileType='powell', windFieldType='kepert',
                  beta=1.5, beta1=1.5, beta2=1.4, thetaMax=70.0,
                  margin=2.0, resolution=0.05, gustFactor=1.23,
-                 gridLimit=None, domain='bounded'):
+                 gridLimit=None, domain='bounded', profileTolerance=0.,
+                 dtype=float, gustThreshold=0., nestRadius=0.,
+                 nestFactor=5):
         self.track = track
         self.profileType = profileType
         self.windFieldType = windFieldType
@@ -188,15 +260,39 @@ class WindfieldAroundTrack(object):
         self.gustFactor = gustFactor
         self.gridLimit = gridLimit
         self.domain = domain
-
-    def polarGridAroundEye(self, i):
+        self.profileTolerance = profileTolerance
+        self.dtype = dtype
+        self.gustThreshold = gustThreshold
+        self.nestRadius = nestRadius
+        self.nestFactor = int(nestFactor)
+        self.lookup_ = None
+
+        # Resolve the models once for the track. The field model is
+        # reused at each time step with the profile for that step.
+        self.profileModel = windmodels.profile(profileType)
+        self.profileValues = [getattr(self, p) for p in
+                              windmodels.profileParams(profileType)
+                              if hasattr(self, p)]
+        fieldModel = windmodels.field(windFieldType)
+        values = [getattr(self, p) for p in
+                  windmodels.fieldParams(windFieldType) if hasattr(self, p)]
+        self.windfield = fieldModel(None, *values)
+
+    def polarGridAroundEye(self, i, margin=None):
         """
         Generate a polar coordinate grid around the eye of the
         tropical cyclone at time i.
 
         :type  i: int
         :param i: the time.
+
+        :type  margin: float
+        :param margin: extent of the grid (in degrees) around the eye,
+                       if different from `margin`.
         """
+        if margin is None:
+            margin = self.margin
+
         if self.domain=='full':
             R, theta = makeGrid(self.track.Longitude[i],
                                 self.track.Latitude[i],
@@ -204,13 +300,100 @@ class WindfieldAroundTrack(object):
                                 minLon=self.gridLimit['xMin'],
                                 maxLon=self.gridLimit['xMax'],
                                 minLat=self.gridLimit['yMin'],
-                                maxLat=self.gridLimit['yMax'])
+                                maxLat=self.gridLimit['yMax'],
+                                dtype=self.dtype)
         else:
             R, theta = makeGrid(self.track.Longitude[i],
                                 self.track.Latitude[i],
-                                self.margin, self.resolution)
+                                margin, self.resolution,
+                                dtype=self.dtype)
         return R, theta
 
+    def windowMargin(self, i, profile=None):
+        """
+        Calculate the extent (in degrees) of the grid around the eye of
+        the tropical cyclone at time `i` where the gust wind speed may
+        exceed `gustThreshold`.
+
+        The surface gust is bounded by the gradient level wind speed of
+        the radial profile plus the forward speed of the storm, scaled
+        by the gust factor. The extent is a whole number of grid cells,
+        and is never larger than `margin`.
+
+        :type  i: int
+        :param i: the time.
+
+        :param profile: the radial profile at time `i`, if already
+                        created.
+        :type  profile: :class:`windmodels.WindProfileModel`
+        """
+        if self.gustThreshold <= 0:
+            return self.margin
+
+        if profile is None:
+            profile = self.windProfile(i)
+
+        cells = int(round(self.margin / self.resolution))
+        cellSize = convert(self.resolution, 'deg', 'km')
+        R = cellSize * np.arange(1, cells + 1)
+
+        V = np.abs(profile.velocity(R))
+        gust = self.gustFactor * (V + self.track.Speed[i])
+        above = np.flatnonzero(gust >= self.gustThreshold)
+        if len(above) == 0:
+            return self.resolution
+
+        window = self.cellsWithin(i, R[above[-1]] + cellSize)
+        return min(window, cells) * self.resolution
+
+    def cellsWithin(self, i, radius):
+        """
+        Calculate the number of grid cells either side of the eye of the
+        tropical cyclone at time `i` needed to cover all points within
+        `radius` (km) of the eye.
+
+        Cells are narrower in the zonal direction, most so at the
+        poleward edge of the grid, so this sets the number of cells.
+
+        :type  i: int
+        :param i: the time.
+
+        :type  radius: float
+        :param radius: distance from the eye (km).
+        """
+        cellSize = convert(self.resolution, 'deg', 'km')
+        edge = abs(self.track.Latitude[i]) + radius / convert(1., 'deg', 'km')
+        coslat = math.cos(math.radians(min(edge, 89.)))
+        return int(math.ceil(radius / (cellSize * coslat)))
+
+    def windProfile(self, i):
+        """
+        Create the radial profile of the tropical cyclone at time `i`.
+
+        The same profile object provides both the pressure and the
+        wind fields, so the terms they share are only calculated once
+        for each time step. If `profileTolerance` is set, the profile
+        is wrapped in a :class:`windmodels.RadialLookupProfile`, which
+        uses the table spacing found for the previous time step.
+
+        :type  i: int
+        :param i: the time.
+        """
+        lat = self.track.Latitude[i]
+        lon = self.track.Longitude[i]
+        eP = self.track.EnvPressure[i]
+        cP = self.track.CentralPressure[i]
+        rMax = self.track.rMax[i]
+
+        profile = self.profileModel(lat, lon, eP, cP, rMax,
+                                    *self.profileValues)
+        if self.profileTolerance > 0:
+            profile = windmodels.RadialLookupProfile(profile,
+                                                     self.profileTolerance,
+                                                     previous=self.lookup_)
+            self.lookup_ = profile
+        return profile
+
     def pressureProfile(self, i, R):
         """
         Calculate the pressure profile at time `i` at the radiuses `R`
@@ -223,59 +406,115 @@ class WindfieldAroundTrack(object):
         :type  R: :class:`numpy.ndarray`
         :param R: the radiuses around the tropical cyclone.
         """
-        from PressureInterface.pressureProfile import PrsProfile as PressureProfile
-
-        p = PressureProfile(R, self.track.EnvPressure[i],
-                            self.track.CentralPressure[i],
-                            self.track.rMax[i],
-                            self.track.Latitude[i],
-                            self.track.Longitude[i],
-                            self.beta, beta1=self.beta1,
-                            beta2=self.beta2)
-        try:
-            pressure = getattr(p, self.profileType)
-        except AttributeError:
-            msg = '%s not implemented in pressureProfile' % self.profileType
-            log.exception(msg)
-        return pressure()
-
-    def localWindField(self, i):
+        return self.windProfile(i).pressure(R)
+
+    def localWindField(self, i, margin=None, profile=None):
         """
         Calculate the local wind field at time `i` around the
         tropical cyclone.
 
         :type  i: int
         :param i: the time.
+
+        :type  margin: float
+        :param margin: extent of the grid (in degrees) around the eye,
+                       if different from `margin`.
+
+        :param profile: the radial profile at time `i`, if already
+                        created.
+        :type  profile: :class:`windmodels.WindProfileModel`
+        """
+        if profile is None:
+            profile = self.windProfile(i)
+
+        if self.nestRadius > 0 and self.domain == 'bounded':
+            return self.nestedWindField(i, profile, margin)
+
+        R, theta = self.polarGridAroundEye(i, margin)
+        return self.gridWindField(i, profile, R, theta)
+
+    def gridWindField(self, i, profile, R, theta):
+        """
+        Calculate the wind field at time `i` on a grid of distances and
+        bearings from the eye of the tropical cyclone.
+
+        :type  i: int
+        :param i: the time.
+
+        :param profile: the radial profile at time `i`.
+        :type  profile: :class:`windmodels.WindProfileModel`
+
+        :type  R: :class:`numpy.ndarray`
+        :param R: distance of the grid points from the eye (km).
+
+        :type  theta: :class:`numpy.ndarray`
+        :param theta: direction of the grid points from the eye.
         """
-        lat = self.track.Latitude[i]
-        lon = self.track.Longitude[i]
-        eP = self.track.EnvPressure[i]
-        cP = self.track.CentralPressure[i]
-        rMax = self.track.rMax[i]
         vFm = self.track.Speed[i]
         thetaFm = self.track.Bearing[i]
         thetaMax = self.thetaMax
 
-        #FIXME: temporary way to do this
-        cls = windmodels.profile(self.profileType)
-        params = windmodels.profileParams(self.profileType)
-        values = [getattr(self, p) for p in params if hasattr(self, p)]
-        profile = cls(lat, lon, eP, cP, rMax, *values)
+        P = profile.pressure(R)
 
-        R, theta = self.polarGridAroundEye(i)
+        self.windfield.profile = profile
+        Ux, Vy = self.windfield.field(R, theta, vFm, thetaFm,  thetaMax)
 
-        P = self.pressureProfile(i, R)
+        return (Ux, Vy, P)
 
-        #FIXME: temporary way to do this
-        cls = windmodels.field(self.windFieldType)
-        params = windmodels.fieldParams(self.windFieldType)
-        values = [getattr(self, p) for p in params if hasattr(self, p)]
-        windfield = cls(profile, *values)
+    def nestedWindField(self, i, profile, margin=None):
+        """
+        Calculate the local wind field at time `i` around the tropical
+        cyclone on nested grids.
 
-        Ux, Vy = windfield.field(R, theta, vFm, thetaFm,  thetaMax)
+        The wind field is evaluated at full resolution within
+        `nestRadius` times the radius to maximum winds of the eye, where
+        the gradients are steepest. Elsewhere, it is bilinearly
+        interpolated from a grid `nestFactor` times coarser. The
+        returned arrays are on the same grid as :meth:`localWindField`.
 
-        return (Ux, Vy, P)
+        :type  i: int
+        :param i: the time.
 
+        :param profile: the radial profile at time `i`.
+        :type  profile: :class:`windmodels.WindProfileModel`
+
+        :type  margin: float
+        :param margin: extent of the grid (in degrees) around the eye,
+                       if different from `margin`.
+        """
+        if margin is None:
+            margin = self.margin
+
+        lon = self.track.Longitude[i]
+        lat = self.track.Latitude[i]
+        factor = self.nestFactor
+        cells = int(round(margin / self.resolution))
+        inner = self.cellsWithin(i, self.nestRadius * self.track.rMax[i])
+
+        if factor < 2 or inner + factor >= cells:
+            R, theta = self.polarGridAroundEye(i, margin)
+            return self.gridWindField(i, profile, R, theta)
+
+        # The coarse grid covers the margin, and its points coincide
+        # with points of the fine grid
+        coarse = -(-cells // factor)
+        R, theta = makeGrid(lon, lat, coarse * factor * self.resolution,
+                            factor * self.resolution, dtype=self.dtype)
+        fields = self.gridWindField(i, profile, R, theta)
+        offset = coarse * factor - cells
+        fields = [upsample(f, factor, offset, 2 * cells + 1)
+                  for f in fields]
+
+        R, theta = makeGrid(lon, lat, inner * self.resolution,
+                            self.resolution, dtype=self.dtype)
+        core = slice(cells - inner, cells + inner + 1)
+        for field, fine in zip(fields, self.gridWindField(i, profile,
+                                                          R, theta)):
+            field[core, core] = fine
+
+        return tuple(fields)
+
+    @profiler.timed('wind.track')
     def regionalExtremes(self, gridLimit, timeStepCallback=None):
         """
         Calculate the maximum potential wind gust and minimum
@@ -292,8 +531,10 @@ class WindfieldAroundTrack(object):
 
         :type  timeStepCallback: function
         :param timeStepCallback: the function to be called on each time step.
+                                 If `gustThreshold` is set, it is only
+                                 given the fields within the window.
         """
-        if len(self.track.data) > 0:
+        if len(self.track) > 0:
             envPressure = self.track.EnvPressure[0]
         else:
             envPressure = np.NaN
@@ -310,23 +551,15 @@ class WindfieldAroundTrack(object):
         gridMargin = int(100. * self.margin)
         gridStep = int(100. * self.resolution)
 
-        minLat = int(100. * yMin) - gridMargin
-        maxLat = int(100. * yMax) + gridMargin
-        minLon = int(100. * xMin) - gridMargin
-        maxLon = int(100. * xMax) + gridMargin
-
-        latGrid = np.arange(minLat, maxLat + gridStep, gridStep, dtype=int)
-        lonGrid = np.arange(minLon, maxLon + gridStep, gridStep, dtype=int)
-
-        [cGridX, cGridY] = np.meshgrid(lonGrid, latGrid)
+        lonGrid, latGrid = regionalGrid(gridLimit, self.margin,
+                                        self.resolution)
+        minLat, maxLat = latGrid[0], latGrid[-1]
+        minLon, maxLon = lonGrid[0], lonGrid[-1]
 
         # Initialise the region
 
-        UU = np.zeros_like(cGridX, dtype='f')
-        VV = np.zeros_like(cGridY, dtype='f')
-        bearing = np.zeros_like(cGridX, dtype='f')
-        gust = np.zeros_like(cGridX, dtype='f')
-        pressure = np.ones_like(cGridX, dtype='f') * envPressure
+        extremes = WindExtremes.empty((len(latGrid), len(lonGrid)),
+                                      envPressure)
 
         lonCDegree = np.array(100. * self.track.Longitude, dtype=int)
         latCDegree = np.array(100. * self.track.Latitude, dtype=int)
@@ -339,57 +572,70 @@ class WindfieldAroundTrack(object):
                                 (self.track.Latitude <= yMax))[0]
 
         for i in timesInRegion:
+            with profiler.span('wind.timestep'):
+                # Map the local grid to the regional grid
+                jmin, jmax = 0, int((maxLat - minLat + 2. * gridMargin) / gridStep) + 1
+                imin, imax = 0, int((maxLon - minLon + 2. * gridMargin) / gridStep) + 1
 
-            # Map the local grid to the regional grid
-            jmin, jmax = 0, int((maxLat - minLat + 2. * gridMargin) / gridStep) + 1
-            imin, imax = 0, int((maxLon - minLon + 2. * gridMargin) / gridStep) + 1
-            
-            if self.domain == 'bounded':
+                # The same profile is used for the window, the wind
+                # field and the pressure at this time step
 
-                jmin = int((latCDegree[i] - minLat - gridMargin) / gridStep)
-                jmax = int((latCDegree[i] - minLat + gridMargin) / gridStep) + 1
-                imin = int((lonCDegree[i] - minLon - gridMargin) / gridStep)
-                imax = int((lonCDegree[i] - minLon + gridMargin) / gridStep) + 1
+                profile = self.windProfile(i)
 
-            # Calculate the local wind speeds and pressure at time i
+                margin = None
+                if self.domain == 'bounded':
 
-            Ux, Vy, P = self.localWindField(i)
+                    # Only evaluate the wind field in the window where
+                    # the gust may exceed the threshold; elsewhere the
+                    # gust is left unchanged
+                    margin = self.windowMargin(i, profile)
+                    stepMargin = int(round(100. * margin))
+                    jmin = int((latCDegree[i] - minLat - stepMargin) / gridStep)
+                    jmax = int((latCDegree[i] - minLat + stepMargin) / gridStep) + 1
+                    imin = int((lonCDegree[i] - minLon - stepMargin) / gridStep)
+                    imax = int((lonCDegree[i] - minLon + stepMargin) / gridStep) + 1
 
-            # Calculate the local wind gust and bearing
+                    # The pressure departs from the environmental
+                    # pressure beyond the window, so it is evaluated
+                    # over the whole margin
+                    stepMargin = int(round(100. * self.margin))
+                    pressureWindow = (
+                        slice(int((latCDegree[i] - minLat - stepMargin) / gridStep),
+                              int((latCDegree[i] - minLat + stepMargin) / gridStep) + 1),
+                        slice(int((lonCDegree[i] - minLon - stepMargin) / gridStep),
+                              int((lonCDegree[i] - minLon + stepMargin) / gridStep) + 1))
 
-            Ux *= self.gustFactor
-            Vy *= self.gustFactor
+                # Calculate the local wind speeds and pressure at time i
 
-            localGust = np.sqrt(Ux ** 2 + Vy ** 2)
-            localBearing = ((np.arctan2(-Ux, -Vy)) * 180. / np.pi)
+                Ux, Vy, P = self.localWindField(i, margin, profile)
 
-            # Handover this time step to a callback if required
+                # Calculate the local wind gust and bearing
 
-            if timeStepCallback is not None:
-                timeStepCallback(self.track.Datetime[i],
-                                 localGust, Ux, Vy, P,
-                                 lonGrid[imin:imax] / 100.,
-                                 latGrid[jmin:jmax] / 100.)
+                Ux *= self.gustFactor
+                Vy *= self.gustFactor
 
-            # Retain when there is a new maximum gust
-            mask = localGust > gust[jmin:jmax, imin:imax]
+                localGust = np.sqrt(Ux ** 2 + Vy ** 2)
+                localBearing = ((np.arctan2(-Ux, -Vy)) * 180. / np.pi)
 
-            gust[jmin:jmax, imin:imax] = np.where(
-                mask, localGust, gust[jmin:jmax, imin:imax])
-            bearing[jmin:jmax, imin:imax] = np.where(
-                mask, localBearing, bearing[jmin:jmax, imin:imax])
-            UU[jmin:jmax, imin:imax] = np.where(
-                mask, Ux, UU[jmin:jmax, imin:imax])
-            VV[jmin:jmax, imin:imax] = np.where(
-                mask, Vy, VV[jmin:jmax, imin:imax])
+                # Handover this time step to a callback if required
 
-            # Retain the lowest pressure
+                if timeStepCallback is not None:
+                    timeStepCallback(self.track.Datetime[i],
+                                     localGust, Ux, Vy, P,
+                                     lonGrid[imin:imax] / 100.,
+                                     latGrid[jmin:jmax] / 100.)
 
-            pressure[jmin:jmax, imin:imax] = np.where(
-                P < pressure[jmin:jmax, imin:imax],
-                P, pressure[jmin:jmax, imin:imax])
+                # Retain when there is a new maximum gust or lowest pressure
 
-        return gust, bearing, UU, VV, pressure, lonGrid / 100., latGrid / 100.
+                extremes.update(localGust, localBearing, Ux, Vy, P,
+                                (slice(jmin, jmax), slice(imin, imax)))
+
+                if margin is not None and margin < self.margin:
+                    R, theta = self.polarGridAroundEye(i)
+                    extremes.updatePressure(profile.pressure(R),
+                                            pressureWindow)
+
+        return extremes.arrays() + (lonGrid / 100., latGrid / 100.)
 
 
 class WindfieldGenerator(object):
@@ -428,12 +674,45 @@ class WindfieldGenerator(object):
                       variable bounds the latitude and the *x* variable bounds
                       the longitude.
 
+    :type  profileTolerance: float
+    :param profileTolerance: relative accuracy of the radial profile
+                             lookup tables (0 to evaluate the profile
+                             at every grid point).
+
+    :type  dtype: :class:`numpy.dtype`
+    :param dtype: floating point type of the wind field calculations.
+
+    :type  gustThreshold: float
+    :param gustThreshold: gust wind speed (m/s) that sets the extent of
+                          the grid evaluated around the eye at each time
+                          (0 to always evaluate the full margin).
+
+    :type  nestRadius: float
+    :param nestRadius: distance from the eye (in multiples of the radius
+                       to maximum winds) evaluated at full resolution
+                       (0 to evaluate the full margin at full resolution).
+
+    :type  nestFactor: int
+    :param nestFactor: ratio of the coarse grid spacing to `resolution`
+                       outside `nestRadius`.
+
+    :type  ncOptions: dict
+    :param ncOptions: compression and chunking settings of the gust
+                      files, passed to :func:`Utilities.nctools.ncSaveGrid`.
+
+    :type  configAttributes: bool
+    :param configAttributes: if True, store the configuration settings
+                             as global attributes of each gust file.
+
     """
 
     def __init__(self, config, margin=2.0, resolution=0.05,
                  profileType='powell', windFieldType='kepert',
                  beta=1.5, beta1=1.5, beta2=1.4,
-                 thetaMax=70.0, gridLimit=None, domain='bounded'):
+                 thetaMax=70.0, gridLimit=None, domain='bounded',
+                 profileTolerance=0., dtype=float, gustThreshold=0.,
+                 nestRadius=0., nestFactor=5, ncOptions=None,
+                 configAttributes=True):
 
         self.config = config
         self.margin = margin
@@ -446,6 +725,13 @@ class WindfieldGenerator(object):
         self.thetaMax = thetaMax
         self.gridLimit = gridLimit
         self.domain = domain
+        self.profileTolerance = profileTolerance
+        self.dtype = dtype
+        self.gustThreshold = gustThreshold
+        self.nestRadius = nestRadius
+        self.nestFactor = nestFactor
+        self.ncOptions = ncOptions or {}
+        self.configAttributes = configAttributes
 
     def setGridLimit(self, track):
         """
@@ -484,20 +770,84 @@ class WindfieldGenerator(object):
         if self.gridLimit is None:
             self.setGridLimit(track)
 
-        wt = WindfieldAroundTrack(track,
-                                  profileType=self.profileType,
-                                  windFieldType=self.windFieldType,
-                                  beta=self.beta,
-                                  beta1=self.beta1,
-                                  beta2=self.beta2,
-                                  thetaMax=self.thetaMax,
-                                  margin=self.margin,
-                                  resolution=self.resolution,
-                                  gridLimit=self.gridLimit,
-                                  domain=self.domain)
+        wt = self.windfieldAroundTrack(track)
 
         return track, wt.regionalExtremes(self.gridLimit, callback)
 
+    def windfieldAroundTrack(self, track, dtype=None):
+        """
+        Create the :class:`WindfieldAroundTrack` for a single track with
+        the settings of this generator.
+
+        :type  track: :class:`Track`
+        :param track: the tropical cyclone track.
+
+        :type  dtype: :class:`numpy.dtype`
+        :param dtype: floating point type of the calculations, if
+                      different from the generator setting.
+
+        """
+        if dtype is None:
+            dtype = self.dtype
+
+        return WindfieldAroundTrack(track,
+                                    profileType=self.profileType,
+                                    windFieldType=self.windFieldType,
+                                    beta=self.beta,
+                                    beta1=self.beta1,
+                                    beta2=self.beta2,
+                                    thetaMax=self.thetaMax,
+                                    margin=self.margin,
+                                    resolution=self.resolution,
+                                    gridLimit=self.gridLimit,
+                                    domain=self.domain,
+                                    profileTolerance=self.profileTolerance,
+                                    dtype=dtype,
+                                    gustThreshold=self.gustThreshold,
+                                    nestRadius=self.nestRadius,
+                                    nestFactor=self.nestFactor)
+
+    def comparePrecision(self, track, dtype=np.float32):
+        """
+        Compare the wind extremes of a single track calculated with the
+        floating point type `dtype` against those calculated in double
+        precision.
+
+        :type  track: :class:`Track`
+        :param track: the tropical cyclone track.
+
+        :type  dtype: :class:`numpy.dtype`
+        :param dtype: floating point type to compare.
+
+        :returns: :class:`dict` with the maximum (`gustMax`) and root
+                  mean square (`gustRms`) absolute differences in gust
+                  wind speed (m/s), the maximum relative difference in
+                  gust wind speed where the gust exceeds 1 m/s
+                  (`gustRelMax`) and the maximum absolute difference in
+                  minimum pressure (`pressureMax`, Pa).
+
+        """
+        if self.gridLimit is None:
+            self.setGridLimit(track)
+
+        gust = {}
+        pressure = {}
+        for precision in (np.float64, dtype):
+            wt = self.windfieldAroundTrack(track, precision)
+            result = wt.regionalExtremes(self.gridLimit)
+            gust[precision] = result[0].astype(float)
+            pressure[precision] = result[4].astype(float)
+
+        diff = np.abs(gust[dtype] - gust[np.float64])
+        strong = gust[np.float64] > 1.
+        relDiff = diff[strong] / gust[np.float64][strong]
+
+        return {'gustMax': diff.max(),
+                'gustRms': np.sqrt(np.mean(diff ** 2)),
+                'gustRelMax': relDiff.max() if relDiff.size else 0.,
+                'pressureMax': np.nanmax(np.abs(pressure[dtype] -
+                                                pressure[np.float64]))}
+
 
     def calculateExtremesFromTrackfile(self, trackfile, callback=None):
         """
@@ -521,15 +871,12 @@ class WindfieldGenerator(object):
         results = (f(track, callback)[1] for track in trackiter)
 
         gust, bearing, Vx, Vy, P, lon, lat = results.next()
+        extremes = WindExtremes(gust, bearing, Vx, Vy, P)
 
         for result in results:
-            gust1, bearing1, Vx1, Vy1, P1, lon1, lat1 = result
-            gust = np.where(gust1 > gust, gust1, gust)
-            Vx = np.where(gust1 > gust, Vx1, Vx)
-            Vy = np.where(gust1 > gust, Vy1, Vy)
-            P = np.where(P1 < P, P1, P)
+            extremes.update(*result[:5])
 
-        return (gust, bearing, Vx, Vy, P, lon, lat)
+        return extremes.arrays() + (lon, lat)
 
     def dumpExtremesFromTrackfile(self, trackfile, dumpfile, callback=None):
         """
@@ -674,7 +1021,8 @@ class WindfieldGenerator(object):
                           fileName=pressurefile)
 
     def dumpGustsFromTracks(self, trackiter, windfieldPath, fnFormat,
-                            progressCallback=None, timeStepCallback=None):
+                            progressCallback=None, timeStepCallback=None,
+                            writeQueue=None):
         """
         Dump the maximum wind speeds (gusts) observed over a region to
         netcdf files. One file is created for every track file.
@@ -697,6 +1045,11 @@ class WindfieldGenerator(object):
         :param timeStepCallback: optional function to be called at each
                                  timestep to extract point values for
                                  specified locations.
+
+        :type  writeQueue: :class:`Utilities.writequeue.WriteQueue`
+        :param writeQueue: optional queue to write the files in the
+                           background. If not given, each file is
+                           written before the next track is processed.
         """
         if timeStepCallback:
             results = itertools.imap(self.calculateExtremesFromTrack, trackiter,
@@ -712,25 +1065,26 @@ class WindfieldGenerator(object):
             gust, bearing, Vx, Vy, P, lon, lat = result
 
             if track.trackfile in gusts:
-                gust1, bearing1, Vx1, Vy1, P1, lon1, lat1 = \
-                    gusts[track.trackfile]
-                gust = np.where(gust > gust1, gust, gust1)
-                Vx = np.where(gust > gust1, Vx, Vx1)
-                Vy = np.where(gust > gust1, Vy, Vy1)
-                P = np.where(P1 < P, P1, P)
-
-            gusts[track.trackfile] = (gust, bearing, Vx, Vy, P, lon, lat)
+                gusts[track.trackfile][0].update(gust, bearing, Vx, Vy, P)
+            else:
+                extremes = WindExtremes(gust, bearing, Vx, Vy, P)
+                gusts[track.trackfile] = (extremes, lon, lat)
+
             done[track.trackfile] += [track.trackId]
             if len(done[track.trackfile]) >= done[track.trackfile][0][1]:
-                path, basename = psplit(track.trackfile)
-                base, ext = psplitext(basename)
-                dumpfile = pjoin(windfieldPath,
-                                 base.replace('tracks', 'gust') + '.nc')
+                extremes, lon, lat = gusts[track.trackfile]
+                gust, bearing, Vx, Vy, P = extremes.arrays()
+                dumpfile = gustFilename(track.trackfile, windfieldPath)
 
                 #dumpfile = pjoin(windfieldPath, fnFormat % (pp.rank(), i))
-                self._saveGustToFile(track.trackfile,
-                                     (lat, lon, gust, Vx, Vy, P),
-                                     dumpfile)
+                if writeQueue is None:
+                    self._saveGustToFile(track.trackfile,
+                                         (lat, lon, gust, Vx, Vy, P),
+                                         dumpfile, track.params)
+                else:
+                    writeQueue.submit(self._saveGustToFile, track.trackfile,
+                                      (lat, lon, gust, Vx, Vy, P), dumpfile,
+                                      track.params)
 
                 del done[track.trackfile]
                 del gusts[track.trackfile]
@@ -740,13 +1094,22 @@ class WindfieldGenerator(object):
                 if progressCallback:
                     progressCallback(i)
 
-    def _saveGustToFile(self, trackfile, result, filename):
+    @profiler.timed('wind.write')
+    def _saveGustToFile(self, trackfile, result, filename, params=None):
         """
-        Save gusts to a file.
+        Save gusts to a file. The file is written under a temporary
+        name and then renamed, so an interrupted run never leaves an
+        incomplete gust file, and is then marked complete with
+        `params`, the parameters the tracks were produced from (by
+        default, those identifying the track file).
         """
         lat, lon, speed, Vx, Vy, P = result
 
-        trackfileDate = flModDate(trackfile)
+        if os.path.isfile(trackfile):
+            trackfileDate = flModDate(trackfile)
+        else:
+            # Streamed tracks that were not saved
+            trackfileDate = datetime.now().strftime(DATEFORMAT)
 
         gatts = {
             'title': 'TCRM hazard simulation - synthetic event wind field',
@@ -759,11 +1122,12 @@ class WindfieldGenerator(object):
             'beta': self.beta}
 
         # Add configuration settings to global attributes:
-        for section in self.config.sections():
-            for option in self.config.options(section):
-                key = "{0}_{1}".format(section, option)
-                value = self.config.get(section, option)
-                gatts[key] = value
+        if self.configAttributes:
+            for section in self.config.sections():
+                for option in self.config.options(section):
+                    key = "{0}_{1}".format(section, option)
+                    value = self.config.get(section, option)
+                    gatts[key] = value
 
         dimensions = {
             0: {
@@ -864,12 +1228,22 @@ class WindfieldGenerator(object):
             }
         }
 
-        nctools.ncSaveGrid(filename, dimensions, variables, gatts=gatts)
+        path, basename = psplit(filename)
+        tmpfile = pjoin(path, '.' + basename + '.tmp')
+        nctools.ncSaveGrid(tmpfile, dimensions, variables, gatts=gatts,
+                           **self.ncOptions)
+        os.rename(tmpfile, filename)
+        if params is None:
+            params = trackfileParams(trackfile)
+        markComplete(filename, **params)
+
+        if profiler.ENABLED:
+            profiler.addBytes('wind.write', written=os.path.getsize(filename))
 
     def dumpGustsFromTrackfiles(self, trackfiles, windfieldPath,
                                 filenameFormat='gust-%02i-%04i.nc',
                                 progressCallback=None,
-                                timeStepCallback=None):
+                                timeStepCallback=None, writeQueue=None):
         """
         Helper method to dump the maximum wind speeds (gusts) observed over a
         region to netcdf files. One file is created for every track file.
@@ -893,15 +1267,21 @@ class WindfieldGenerator(object):
                                  timestep to extract point values for
                                  specified locations.
 
+        :type  writeQueue: :class:`Utilities.writequeue.WriteQueue`
+        :param writeQueue: optional queue to write the files in the
+                           background.
+
         """
 
         tracks = loadTracksFromFiles(sorted(trackfiles))
 
         self.dumpGustsFromTracks(tracks, windfieldPath, filenameFormat,
                                  progressCallback=progressCallback,
-                                 timeStepCallback=timeStepCallback)
+                                 timeStepCallback=timeStepCallback,
+                                 writeQueue=writeQueue)
 
 
+@profiler.timed('wind.readTrack')
 def readTrackData(trackfile):
     """
     Read a track .csv file into a numpy.ndarray.
@@ -919,6 +1299,9 @@ def readTrackData(trackfile):
 
     """
 
+    if profiler.ENABLED:
+        profiler.addBytes('wind.readTrack', read=os.path.getsize(trackfile))
+
     try:
         return np.loadtxt(trackfile,
                           comments='%',
@@ -934,27 +1317,42 @@ def readTrackData(trackfile):
                         'formats': TRACKFILE_FMTS})
 
 
-def readMultipleTrackData(trackfile):
+def generatedTrackData(tracks):
     """
-    Reads all the track datas from a .csv file into a list of numpy.ndarrays.
-    The tracks are seperated based in their cyclone id. This function calls
-    `readTrackData` to read the data from the file.
+    Convert the tracks generated by a simulation of
+    :mod:`TrackGenerator` into the track data that would be read from
+    its track file. The values are rounded to the precision of the track
+    files and converted to the units used by :func:`readTrackData`, so
+    the wind fields are the same as if the tracks were read from the
+    file.
 
-    :param str trackfile: the track data filename.
+    :param tracks: the array of tracks returned by
+                   :meth:`TrackGenerator.TrackGenerator.generateTracks`.
 
-    :return: a collection of :class:`Track` objects
+    :return: track data
+    :rtype: :class:`numpy.ndarray`
 
     """
-
-    datas = []
-    data = readTrackData(trackfile)
-    if len(data) > 0:
-        cycloneId = data['CycloneNumber']
-        for i in range(1, np.max(cycloneId) + 1):
-            datas.append(data[cycloneId == i])
-    else:
-        datas.append(data)
-    return datas
+    dtype = {'names': TRACKFILE_COLS, 'formats': TRACKFILE_FMTS}
+    if len(tracks) == 0:
+        return np.empty(0, dtype=dtype)
+
+    def column(i, decimals):
+        """Column `i`, rounded as it is written to the track file"""
+        return np.round(tracks[:, i].astype(float), decimals)
+
+    data = np.empty(len(tracks), dtype=dtype)
+    data['CycloneNumber'] = tracks[:, 0].astype(int)
+    data['Datetime'] = tracks[:, 1]
+    data['TimeElapsed'] = column(2, 3)
+    data['Longitude'] = column(3, 3)
+    data['Latitude'] = column(4, 3)
+    data['Speed'] = convert(column(5, 2), TRACKFILE_UNIT[5], 'mps')
+    data['Bearing'] = bearing2theta(column(6, 2) * np.pi / 180.)
+    data['CentralPressure'] = convert(column(7, 2), TRACKFILE_UNIT[7], 'Pa')
+    data['EnvPressure'] = convert(column(8, 2), TRACKFILE_UNIT[8], 'Pa')
+    data['rMax'] = column(9, 2)
+    return data
 
 
 def loadTracksFromFiles(trackfiles):
@@ -986,7 +1384,7 @@ def loadTracks(trackfile):
     Read tracks from a track .csv file and return a list of :class:`Track`
     objects.
 
-    This calls the function `readMultipleTrackData` to parse the track .csv
+    This calls the function `readTrackData` to parse the track .csv
     file.
 
     :param str trackfile: the track data filename.
@@ -995,17 +1393,54 @@ def loadTracks(trackfile):
 
     """
 
-    tracks = []
-    datas = readMultipleTrackData(trackfile)
-    n = len(datas)
-    for i, data in enumerate(datas):
-        track = Track(data)
-        track.trackfile = trackfile
-        track.trackId = (i, n)
-        tracks.append(track)
+    return makeTracks(readTrackData(trackfile), trackfile)
+
+
+def makeTracks(data, trackfile, params=None):
+    """
+    Create the :class:`Track` objects of the tracks of a track file.
+    The tracks are views of a :class:`TrackCollection` of all the
+    tracks in the file.
+
+    :param data: track data, as returned by :func:`readTrackData`.
+    :param str trackfile: the track data filename.
+    :param dict params: optional parameters the tracks were produced
+                        from, recorded when their gust file is marked
+                        complete.
+
+    :return: list of :class:`Track` objects.
+
+    """
+    tracks = list(TrackCollection.fromCycloneNumbers(data, trackfile))
+    for track in tracks:
+        track.params = params
     return tracks
 
 
+def loadTracksFromSimulations(simulations):
+    """
+    Generator that yields :class:`Track` objects from the simulations
+    of :mod:`TrackGenerator` as they are generated, without reading
+    the track files.
+
+    :param simulations: iterable of the :class:`Simulation`, the path of
+                        the track file and the array of tracks of each
+                        simulation, as yielded by
+                        :func:`TrackGenerator.TrackGenerator.simulations`.
+                        The simulations are already balanced across
+                        processors.
+
+    """
+    from TrackGenerator.TrackGenerator import simulationParams
+
+    for sim, trackfile, tracks in simulations:
+        log.info('Calculating wind fields for tracks of simulation %d',
+                 sim.index)
+        data = generatedTrackData(tracks)
+        for track in makeTracks(data, trackfile, simulationParams(sim)):
+            yield track
+
+
 def loadTracksFromPath(path):
     """
     Helper function to obtain a generator that yields :class:`Track` objects
@@ -1037,23 +1472,68 @@ def balanced(iterable):
     return itertools.islice(iterable, p, None, P)
 
 
-def run(configFile, callback=None):
+def regionalGrid(gridLimit, margin, resolution):
     """
-    Run the wind field calculations.
+    The grid over which the wind extremes of each track are
+    accumulated, in hundredths of a degree.
 
-    :param str configFile: path to a configuration file.
-    :param func callback: optional callback function to track progress.
+    :param dict gridLimit: the domain where the tracks will be
+                           considered, with keys :attr:`xMin`,
+                           :attr:`xMax`, :attr:`yMin` and :attr:`yMax`.
+    :param float margin: the margin (degrees) added around the domain.
+    :param float resolution: the grid spacing (degrees).
+
+    :returns: integer arrays of the longitudes and latitudes of the grid.
 
     """
+    gridMargin = int(100. * margin)
+    gridStep = int(100. * resolution)
 
-    log.info('Loading wind field calculation settings')
+    minLat = int(100. * gridLimit['yMin']) - gridMargin
+    maxLat = int(100. * gridLimit['yMax']) + gridMargin
+    minLon = int(100. * gridLimit['xMin']) - gridMargin
+    maxLon = int(100. * gridLimit['xMax']) + gridMargin
 
-    # Get configuration
+    latGrid = np.arange(minLat, maxLat + gridStep, gridStep, dtype=int)
+    lonGrid = np.arange(minLon, maxLon + gridStep, gridStep, dtype=int)
 
-    config = ConfigParser()
-    config.read(configFile)
+    return lonGrid, latGrid
 
-    outputPath = config.get('Output', 'Path')
+
+def upsample(data, factor, offset, size):
+    """
+    Bilinearly interpolate a square grid onto a grid `factor` times
+    finer. Point `j` of the coarse grid coincides with point
+    `j * factor - offset` of the fine grid along each axis.
+
+    :param data: 2-d :class:`numpy.ndarray` on the coarse grid.
+    :param int factor: ratio of the coarse and fine grid spacings.
+    :param int offset: number of fine grid points that the coarse grid
+                       extends beyond the start of the fine grid.
+    :param int size: number of points along each axis of the fine grid.
+
+    :returns: 2-d :class:`numpy.ndarray` on the fine grid.
+
+    """
+    pos = (np.arange(size) + offset) / float(factor)
+    index = np.minimum(pos.astype(int), data.shape[0] - 2)
+    weight = (pos - index).astype(data.dtype)
+
+    rows = (data[index] * (1 - weight)[:, np.newaxis] +
+            data[index + 1] * weight[:, np.newaxis])
+    return rows[:, index] * (1 - weight) + rows[:, index + 1] * weight
+
+
+def windfieldGenerator(config):
+    """
+    Create a :class:`WindfieldGenerator` with the settings in the
+    `WindfieldInterface` section of a configuration.
+
+    :param config: :class:`Utilities.config.ConfigParser` instance.
+
+    :returns: :class:`WindfieldGenerator` instance.
+
+    """
     profileType = config.get('WindfieldInterface', 'profileType')
     windFieldType = config.get('WindfieldInterface', 'windFieldType')
     beta = config.getfloat('WindfieldInterface', 'beta')
@@ -1063,10 +1543,17 @@ def run(configFile, callback=None):
     margin = config.getfloat('WindfieldInterface', 'Margin')
     resolution = config.getfloat('WindfieldInterface', 'Resolution')
     domain = config.get('WindfieldInterface', 'Domain')
-
-    windfieldPath = pjoin(outputPath, 'windfield')
-    trackPath = pjoin(outputPath, 'tracks')
-    windfieldFormat = 'gust-%i-%04d.nc'
+    profileTolerance = config.getfloat('WindfieldInterface',
+                                       'ProfileTolerance')
+    dtype = np.dtype(config.get('WindfieldInterface', 'Precision'))
+    if dtype not in (np.float32, np.float64):
+        raise ValueError("Precision must be float32 or float64")
+    gustThreshold = config.getfloat('WindfieldInterface', 'GustThreshold')
+    nestRadius = config.getfloat('WindfieldInterface', 'NestRadius')
+    nestFactor = config.getint('WindfieldInterface', 'NestFactor')
+    ncOptions = nctools.ncSaveOptions(config, 'WindfieldInterface')
+    configAttributes = config.getboolean('WindfieldInterface',
+                                         'ConfigAttributes')
 
     gridLimit = None
     if config.has_option('Region','gridLimit'):
@@ -1075,24 +1562,164 @@ def run(configFile, callback=None):
     if config.has_option('WindfieldInterface', 'gridLimit'):
         gridLimit = config.geteval('WindfieldInterface', 'gridLimit')
 
-    if config.has_section('Timeseries'):
-        if config.has_option('Timeseries', 'Extract'):
-            if config.getboolean('Timeseries', 'Extract'):
-                from Utilities.timeseries import Timeseries
-                log.debug("Timeseries data will be extracted")
-                ts = Timeseries(configFile)
-                timestepCallback = ts.extract
-            else:
-                def timestepCallback(*args):
-                    """Dummy timestepCallback function"""
-                    pass
+    thetaMax = math.radians(thetaMax)
 
-    else:
-        def timestepCallback(*args):
-            """Dummy timestepCallback function"""
-            pass
+    return WindfieldGenerator(config=config,
+                              margin=margin,
+                              resolution=resolution,
+                              profileType=profileType,
+                              windFieldType=windFieldType,
+                              beta=beta,
+                              beta1=beta1,
+                              beta2=beta2,
+                              thetaMax=thetaMax,
+                              gridLimit=gridLimit,
+                              domain=domain,
+                              profileTolerance=profileTolerance,
+                              dtype=dtype,
+                              gustThreshold=gustThreshold,
+                              nestRadius=nestRadius,
+                              nestFactor=nestFactor,
+                              ncOptions=ncOptions,
+                              configAttributes=configAttributes)
+
+
+def validatePrecision(configFile, dtype=np.float32, maxTracks=None):
+    """
+    Quantify the differences in the wind extremes calculated with
+    the floating point type `dtype` against double precision, for the
+    tracks in the output track path of a simulation.
 
-    thetaMax = math.radians(thetaMax)
+    :param str configFile: path to a configuration file.
+    :param dtype: floating point type to compare.
+    :param int maxTracks: maximum number of tracks to compare (default
+                          is all the tracks).
+
+    :returns: :class:`dict` of the largest of each of the differences
+              returned by :meth:`WindfieldGenerator.comparePrecision`
+              over all the tracks.
+
+    """
+    config = ConfigParser()
+    config.read(configFile)
+
+    wfg = windfieldGenerator(config)
+    trackPath = pjoin(config.get('Output', 'Path'), 'tracks')
+    trackfiles = [pjoin(trackPath, f) for f in sorted(os.listdir(trackPath))
+                  if f.startswith('tracks')]
+    tracks = itertools.chain.from_iterable(loadTracks(f) for f in trackfiles)
+
+    summary = defaultdict(float)
+    for track in itertools.islice(tracks, maxTracks):
+        if len(track) == 0:
+            continue
+        wfg.gridLimit = None
+        diffs = wfg.comparePrecision(track, dtype)
+        log.debug("Track %s: %s", track.trackId, diffs)
+        for key, value in diffs.items():
+            summary[key] = max(summary[key], value)
+
+    log.info("Differences from double precision: maximum gust %.2e m/s "
+             "(RMS %.2e m/s, relative %.2e), pressure %.2e Pa",
+             summary['gustMax'], summary['gustRms'],
+             summary['gustRelMax'], summary['pressureMax'])
+    return dict(summary)
+
+
+def gridSeries(config, wfg, trackfile):
+    """
+    Create the writer of the wind field at each time step over the
+    region of the wind field generator. If no region is configured,
+    it is set from the first track in `trackfile`, as it would be by
+    :meth:`WindfieldGenerator.calculateExtremesFromTrack`.
+
+    :param config: :class:`Utilities.config.ConfigParser` instance.
+    :param wfg: :class:`WindfieldGenerator` instance.
+    :param str trackfile: path to the first track file to be processed.
+
+    :returns: :class:`Utilities.gridseries.GridSeries` instance.
+
+    """
+    from Utilities.gridseries import GridSeries
+
+    if wfg.gridLimit is None:
+        wfg.setGridLimit(loadTracks(trackfile)[0])
+
+    lonGrid, latGrid = regionalGrid(wfg.gridLimit, wfg.margin,
+                                    wfg.resolution)
+
+    syncInterval = 24
+    if config.has_option('Timeseries', 'SyncInterval'):
+        syncInterval = config.getint('Timeseries', 'SyncInterval')
+
+    filename = pjoin(config.get('Output', 'Path'), 'windfield',
+                     'evolution.nc')
+    gatts = {'title': 'TCRM wind field time series',
+             'tcrm_version': flProgramVersion(),
+             'track_file': trackfile,
+             'radial_profile': wfg.profileType,
+             'boundary_layer': wfg.windFieldType}
+
+    return GridSeries(filename, lonGrid / 100., latGrid / 100.,
+                      syncInterval, gatts=gatts)
+
+
+def gustFilename(trackfile, windfieldPath):
+    """
+    :param str trackfile: Path of a track file.
+    :param str windfieldPath: Directory of the gust files.
+
+    :returns: Path of the gust file of the tracks in `trackfile`.
+
+    """
+    base, ext = psplitext(psplit(trackfile)[1])
+    return pjoin(windfieldPath, base.replace('tracks', 'gust') + '.nc')
+
+
+def trackfileParams(trackfile):
+    """
+    :param str trackfile: Path of a track file.
+
+    :returns: :class:`dict` identifying the track file, recorded when
+              its gust file is marked complete, so the gust file is
+              recalculated if the tracks change.
+
+    """
+    stat = os.stat(trackfile)
+    return {'trackfile': psplit(trackfile)[1], 'size': stat.st_size,
+            'mtime': stat.st_mtime}
+
+
+def run(configFile, callback=None, resume=False, stream=False):
+    """
+    Run the wind field calculations.
+
+    :param str configFile: path to a configuration file.
+    :param func callback: optional callback function to track progress.
+    :param bool resume: if `True`, only calculate the wind fields of
+                        track files whose gust file is not marked
+                        complete, to complete an interrupted run.
+    :param bool stream: if `True`, generate the tracks with
+                        :mod:`TrackGenerator` and calculate their wind
+                        fields as they are generated, instead of reading
+                        the track files. The tracks are passed through a
+                        queue of at most [TrackGenerator] StreamQueue
+                        simulations, and only saved to track files if
+                        [TrackGenerator] WriteTracks is set.
+
+    """
+
+    log.info('Loading wind field calculation settings')
+
+    # Get configuration
+
+    config = ConfigParser()
+    config.read(configFile)
+
+    outputPath = config.get('Output', 'Path')
+    windfieldPath = pjoin(outputPath, 'windfield')
+    trackPath = pjoin(outputPath, 'tracks')
+    windfieldFormat = 'gust-%i-%04d.nc'
 
     # Attempt to start the track generator in parallel
     global pp
@@ -1100,44 +1727,123 @@ def run(configFile, callback=None):
 
     log.info('Running windfield generator')
 
-    wfg = WindfieldGenerator(config=config,
-                             margin=margin,
-                             resolution=resolution,
-                             profileType=profileType,
-                             windFieldType=windFieldType,
-                             beta=beta,
-                             beta1=beta1,
-                             beta2=beta2,
-                             thetaMax=thetaMax,
-                             gridLimit=gridLimit,
-                             domain=domain)
+    wfg = windfieldGenerator(config)
 
     msg = 'Dumping gusts to %s' % windfieldPath
     log.info(msg)
 
     # Get the trackfile names and count
 
-    files = os.listdir(trackPath)
-    trackfiles = [pjoin(trackPath, f) for f in files if f.startswith('tracks')]
+    if stream:
+        trackfiles = []
+    else:
+        files = sorted(os.listdir(trackPath))
+        trackfiles = [pjoin(trackPath, f) for f in files
+                      if f.startswith('tracks')]
     nfiles = len(trackfiles)
 
     def progressCallback(i):
         """Define the callback function"""
         callback(i, nfiles)
 
-    msg = 'Processing %d track files in %s' % (nfiles, trackPath)
-    log.info(msg)
+    # Set up the output of data at each time step
+
+    writers = []
+    gridWriter = False
+    if config.has_option('Timeseries', 'Extract'):
+        if config.getboolean('Timeseries', 'Extract'):
+            from Utilities.timeseries import Timeseries
+            log.debug("Timeseries data will be extracted")
+            writers.append(Timeseries(configFile))
+
+    if config.has_option('Timeseries', 'Windfield'):
+        if config.getboolean('Timeseries', 'Windfield'):
+            if pp.size() > 1:
+                log.warning("Wind field time series cannot be written "
+                            "in parallel")
+            elif stream:
+                log.warning("Wind field time series cannot be written "
+                            "when streaming tracks")
+            elif nfiles > 0:
+                writers.append(gridSeries(config, wfg,
+                                          sorted(trackfiles)[0]))
+                gridWriter = True
+
+    def timestepCallback(*args):
+        """Pass each time step to the time series writers"""
+        for writer in writers:
+            writer.extract(*args)
+
+    if writers and wfg.gustThreshold > 0:
+        log.warning("GustThreshold is ignored when time series are "
+                    "extracted, as they need the full wind field")
+        wfg.gustThreshold = 0.
+
+    if resume and writers:
+        log.info("Time series are extracted from all tracks, so all "
+                 "track files will be processed")
+        resume = False
+
+    if stream:
+        import TrackGenerator.TrackGenerator as TrackGenerator
+        writeTracks = config.getboolean('TrackGenerator', 'WriteTracks')
+
+        def complete(sim, trackfile):
+            """
+            A simulation is complete if its gust file (and track file,
+            if they are written) is marked complete
+            """
+            params = TrackGenerator.simulationParams(sim)
+            if writeTracks and not isMarkedComplete(trackfile, **params):
+                return False
+            return isMarkedComplete(gustFilename(trackfile, windfieldPath),
+                                    **params)
+
+        simulations = TrackGenerator.simulations(configFile, callback,
+                                                 resume, writeTracks,
+                                                 complete)
+        log.info('Streaming tracks to the wind field calculations')
+    else:
+        if resume:
+            # All processors check the same files, so they agree on
+            # the remaining track files before balancing them
+            trackfiles = [f for f in trackfiles if not isMarkedComplete(
+                gustFilename(f, windfieldPath), **trackfileParams(f))]
+            log.info('Resuming: %d of %d track files have no complete '
+                     'gust file', len(trackfiles), nfiles)
+            nfiles = len(trackfiles)
+
+        msg = 'Processing %d track files in %s' % (nfiles, trackPath)
+        log.info(msg)
 
     # Do the work
 
+    # The wind field time series is written on this thread, so the gust
+    # files are then also written on this thread (the netCDF library is
+    # not thread-safe)
+
+    queueSize = config.getint('Output', 'WriterQueue')
+    if gridWriter:
+        log.debug("Writing gust files synchronously")
+        queueSize = 0
+
     pp.barrier()
 
-    wfg.dumpGustsFromTrackfiles(trackfiles, windfieldPath, windfieldFormat,
-                                progressCallback, timestepCallback)
-    try:
-        ts.shutdown()
-    except NameError:
-        pass
+    if stream:
+        streamSize = config.getint('TrackGenerator', 'StreamQueue')
+        with WriteQueue(queueSize) as writeQueue, \
+                Prefetch(simulations, streamSize) as simulations:
+            wfg.dumpGustsFromTracks(loadTracksFromSimulations(simulations),
+                                    windfieldPath, windfieldFormat,
+                                    timeStepCallback=timestepCallback,
+                                    writeQueue=writeQueue)
+    else:
+        with WriteQueue(queueSize) as writeQueue:
+            wfg.dumpGustsFromTrackfiles(trackfiles, windfieldPath,
+                                        windfieldFormat, progressCallback,
+                                        timestepCallback, writeQueue)
+    for writer in writers:
+        writer.shutdown()
 
     pp.barrier()
 
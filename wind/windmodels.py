@@ -154,6 +154,7 @@ class WindProfileModel(object):
         self.speed = windSpeedModel(self)
         self.f = metutils.coriolis(lat)
         self.vMax_ = None
+        self.terms_ = None
 
     @property
     def dP(self):
@@ -181,6 +182,39 @@ class WindProfileModel(object):
         """
         self.vMax_ = value
 
+    def radialTerms(self, R, key, calculate):
+        """
+        Return the terms of the profile that depend only on the radial
+        distance `R`. These are shared by the pressure, velocity and
+        vorticity calculations, so are only calculated once for a
+        given grid and set of profile parameters.
+
+        :param R: :class:`numpy.ndarray` of distance of grid from
+                  the TC centre.
+        :param tuple key: The profile parameters the terms depend on.
+        :param calculate: Function that calculates the terms at `R`.
+
+        :returns: The terms returned by `calculate`.
+
+        """
+        if (self.terms_ is None or self.terms_[0] is not R or
+                self.terms_[1] != key):
+            self.terms_ = (R, key, calculate(R))
+        return self.terms_[2]
+
+    def pressure(self, R):
+        """
+        Calculate the pressure as a function of radial distance `R`.
+
+        :param R: :class:`numpy.ndarray` of distance of grid from
+                  the TC centre.
+
+        :returns: Array of pressure values (Pa).
+        :rtype: :class:`numpy.ndarray`
+
+        """
+        raise NotImplementedError
+
     def velocity(self, R):
         """
         Calculate velocity as a function of radial distance `R`.
@@ -317,6 +351,42 @@ class HollandWindProfile(WindProfileModel):
 
         return d2Vm
 
+    def hollandTerms(self, R):
+        """
+        The terms of the Holland profile that depend on `R`:
+        the scaled radius (`delta`), `exp(-delta)` and the square
+        root term of the gradient wind.
+
+        :param R: :class:`numpy.ndarray` of distance of grid from
+                  the TC centre.
+
+        :returns: `delta`, `exp(-delta)` and the square root term.
+
+        """
+        def calculate(R):
+            delta = (self.rMax / R) ** self.beta
+            edelta = np.exp(-delta)
+            root = np.sqrt((self.dP * self.beta / self.rho) *
+                           delta * edelta + (R * self.f / 2.) ** 2)
+            return delta, edelta, root
+
+        key = (self.beta, self.dP, self.rMax, self.f)
+        return self.radialTerms(R, key, calculate)
+
+    def pressure(self, R):
+        """
+        Calculate the pressure as a function of radial distance.
+
+        :param R: :class:`numpy.ndarray` of distance of grid from
+                  the TC centre.
+
+        :returns: Array of pressure values (Pa).
+        :rtype: :class:`numpy.ndarray`
+
+        """
+        delta, edelta, root = self.hollandTerms(R)
+        return self.cP + self.dP * edelta
+
     def velocity(self, R):
         """
         Calculate velocity as a function of radial distance.
@@ -335,12 +405,9 @@ class HollandWindProfile(WindProfileModel):
               self.rMax)
         bb = (d2Vm - 6 * aa * self.rMax) / 2.
         cc = -3 * aa * self.rMax ** 2 - 2 * bb * self.rMax
-        delta = (self.rMax / R) ** self.beta
-        edelta = np.exp(-delta)
+        delta, edelta, root = self.hollandTerms(R)
 
-        V = ( np.sqrt((self.dP * self.beta / self.rho)
-             * delta * edelta + (R * self.f / 2.) ** 2) - R *
-             np.abs(self.f) / 2.)
+        V = root - R * np.abs(self.f) / 2.
 
         icore = np.where(R <= self.rMax)
         V[icore] = (R[icore] * (R[icore] * (R[icore] * aa + bb) + cc))
@@ -361,17 +428,12 @@ class HollandWindProfile(WindProfileModel):
         """
          
         beta = self.beta
-        delta = (self.rMax / R) ** beta
-        edelta = np.exp(-delta)
+        delta, edelta, root = self.hollandTerms(R)
 
-        Z = ((np.sqrt((self.dP * beta / self.rho) *
-             delta * edelta + (R * self.f / 2.) ** 2)) / R -
-             np.abs(self.f) + edelta *
+        Z = (root / R - np.abs(self.f) + edelta *
              (2 * (beta ** 2) * self.dP * (delta - 1) * delta +
               self.rho * edelta * (self.f * R) ** 2) /
-             (2 * self.rho * R *
-              np.sqrt(4 * (beta * self.dP / self.rho) * delta * edelta
-                      + (self.f * R) ** 2)))
+             (4 * self.rho * R * root))
 
         # Calculate first and second derivatives at R = Rmax:
         d2Vm = self.secondDerivative()
@@ -609,6 +671,49 @@ class DoubleHollandWindProfile(WindProfileModel):
 
         return d2Vm
 
+    def doubleHollandTerms(self, R):
+        """
+        The terms of the double Holland profile that depend on `R`:
+        the scaled radii of the two vortices (`mu` and `nu`), their
+        negative exponentials and the square root term of the
+        gradient wind.
+
+        :param R: :class:`numpy.ndarray` of distance of grid from
+                  the TC centre.
+
+        :returns: `mu`, `nu`, `exp(-mu)`, `exp(-nu)` and the square
+                  root term.
+
+        """
+        def calculate(R):
+            mu = (self.rMax / R) ** self.beta1
+            nu = (self.rMax2 / R) ** self.beta2
+            emu = np.exp(-mu)
+            enu = np.exp(-nu)
+
+            gradientV1 = (self.beta1 * self.dp1 / self.rho) * mu * emu
+            gradientV2 = (self.beta2 * self.dp2 / self.rho) * nu * enu
+            root = np.sqrt(gradientV1 + gradientV2 + (R * self.f / 2.) ** 2)
+            return mu, nu, emu, enu, root
+
+        key = (self.beta1, self.beta2, self.dp1, self.dp2, self.rMax,
+               self.rMax2, self.f)
+        return self.radialTerms(R, key, calculate)
+
+    def pressure(self, R):
+        """
+        Calculate the pressure as a function of radial distance.
+
+        :param R: :class:`numpy.ndarray` of distance of grid from
+                  the TC centre.
+
+        :returns: Array of pressure values (Pa).
+        :rtype: :class:`numpy.ndarray`
+
+        """
+        mu, nu, emu, enu, root = self.doubleHollandTerms(R)
+        return self.cP + self.dp1 * emu + self.dp2 * enu
+
     def velocity(self, R):
         """
         Calculate velocity as a function of radial distance.
@@ -622,29 +727,12 @@ class DoubleHollandWindProfile(WindProfileModel):
         
         """
         rMax = self.rMax
-        rMax2 = self.rMax2
-
-        # Scale dp2 if dP is less than 800 Pa
-
-        if self.dP < 1500.:
-            dp2 = (self.dP / 1500.) * (800. + (self.dP - 800.) / 2000.)
-        else:
-            dp2 = 800. + (self.dP - 800.) / 2000.
-
-        dp1 = self.dP - dp2
 
         # The two gradient wind components
 
-        mu = (rMax / R) ** self.beta1
-        nu = (rMax2 / R) ** self.beta2
-        emu = np.exp(-mu)
-        enu = np.exp(-nu)
+        mu, nu, emu, enu, root = self.doubleHollandTerms(R)
 
-        gradientV1 = (self.beta1 * dp1 / self.rho) * mu * emu
-        gradientV2 = (self.beta2 * dp2 / self.rho) * nu * enu
-
-        V = (np.sign(self.f) * np.sqrt(gradientV1 + gradientV2 + (R *
-             self.f / 2.) ** 2) - R * np.abs(self.f) / 2.)
+        V = np.sign(self.f) * root - R * np.abs(self.f) / 2.
 
         vMax = np.abs(V).max()
 
@@ -675,37 +763,21 @@ class DoubleHollandWindProfile(WindProfileModel):
         :rtype: :class:`numpy.ndarray`
         
         """
-        # Scale dp2 if dP is less than 1500 Pa:
-        if self.dP < 1500.:
-            dp2 = (self.dP / 1500.) * (800. + (self.dP - 800.) / 2000.)
-        else:
-            dp2 = 800. + (self.dP - 800.) / 2000.
-
-        dp1 = self.dP - dp2
+        chi = self.beta1 * self.dp1 / self.rho
+        psi = self.beta2 * self.dp2 / self.rho
 
-        chi = self.beta1 * dp1 / self.rho
-        psi = self.beta2 * dp2 / self.rho
-
-        delta = (self.rMax / R) ** self.beta1
-        gamma = (self.rMax2 / R) ** self.beta2
-        edelta = np.exp(-delta)
-        egamma = np.exp(-gamma)
+        delta, gamma, edelta, egamma, root = self.doubleHollandTerms(R)
 
         # Derivatives:
 
-        ddelta = (-self.beta1 * (self.rMax ** self.beta1) / (R **
-                  (self.beta1 + 1)))
-        dgamma = (-self.beta2 * (self.rMax2 ** self.beta2) / (R **
-                  (self.beta2 + 1)))
+        ddelta = -self.beta1 * delta / R
+        dgamma = -self.beta2 * gamma / R
 
-        Z = (np.sign(self.f) * np.sqrt(chi * delta * edelta + psi *
-             gamma * egamma + (self.f * R / 2) ** 2) / R -
+        Z = (np.sign(self.f) * root / R -
              np.abs(self.f) + (1 / 2) *
              (chi * ddelta * edelta * (1 - delta) +
               psi * dgamma * egamma * (1 - gamma) +
-              R * self.f ** 2) /
-             np.sqrt(chi * delta * edelta + psi * gamma *
-                     egamma + (self.f * R / 2) ** 2))
+              R * self.f ** 2) / root)
 
         d2Vm = self.secondDerivative()
         aa = ((d2Vm / 2.0 - (-1.0 * np.sign(self.f) * self.vMax /
@@ -797,7 +869,7 @@ class NewHollandWindProfile(WindProfileModel):
         edeltag = np.exp(-1. * deltag)
         rgterm = Bs * self.dP * deltag * edeltag / self.rho
         xn = np.log(17.) / np.log(rgterm)
-        xx = 0.5 * np.ones(R.shape)
+        xx = 0.5 * np.ones_like(R)
 
         i = np.where(R > self.rMax)
         xx[i] = (0.5 + (R[i] - self.rMax) * (xn - 0.5) / (self.rGale -
@@ -826,6 +898,184 @@ class NewHollandWindProfile(WindProfileModel):
         raise Exception
 
 
+class RadialLookupProfile(object):
+
+    """
+    Evaluate a wind profile on a table of radial distances, and
+    interpolate the values from the table to the grid.
+
+    The profiles are purely radial functions, so for fine grids it is
+    much cheaper to evaluate them at a few hundred distances and
+    linearly interpolate than to evaluate them at every grid point.
+    The table spacing is halved until the interpolation error at the
+    midpoints between the table entries is less than `tolerance`
+    (relative to the range of the values in the table).
+
+    The spacing is a fraction of the radius of maximum winds. The
+    profiles of the time steps of a track have a similar shape relative
+    to the radius of maximum winds, so the spacing found for one time
+    step can be given to the next one as `previous`: the tables are
+    then built at that spacing without checking the interpolation error
+    again. A table is reused for any grid within the range of distances
+    it covers.
+
+    The radius of maximum winds is always a table entry, and the
+    interpolation on either side of it uses the limit of the profile
+    from that side, as some profiles (e.g. the vorticity of the
+    Holland profile) are not continuous there.
+
+    Other attributes are taken from the wrapped profile, so an
+    instance can be used in place of the profile in a
+    :class:`windmodels.WindFieldModel`.
+
+    :param profile: The wind profile to evaluate.
+    :type  profile: :class:`windmodels.WindProfileModel` instance.
+    :param float tolerance: Maximum relative interpolation error.
+    :param int maxSize: Maximum number of entries in a table.
+    :param previous: Optional lookup of the previous time step, whose
+                     table spacing is used.
+    :type  previous: :class:`windmodels.RadialLookupProfile` instance.
+
+    """
+
+    def __init__(self, profile, tolerance=1e-3, maxSize=65536,
+                 previous=None):
+        self.profile = profile
+        self.tolerance = tolerance
+        self.maxSize = maxSize
+        self.nCore = 8
+        self.checked = set()
+        if previous is not None:
+            self.nCore = previous.nCore
+            self.checked = set(previous.checked)
+        self.tables_ = {}
+        self.weights_ = None
+
+    def __getattr__(self, key):
+        if key.startswith('__') and key.endswith('__'):
+            raise AttributeError(key)
+        return getattr(self.profile, key)
+
+    def _table(self, name, R):
+        """
+        Evaluate the profile method `name` on a table of distances
+        that covers the range of `R`. Unless the spacing has been
+        checked for this method, the table is refined until the
+        interpolation error is below the tolerance.
+
+        :returns: The range of distances covered by the table, the
+                  table spacing, and the value at the start of each
+                  interval and its change across the interval.
+
+        """
+        func = getattr(self.profile, name)
+        rMax = float(self.profile.rMax)
+        rMin = R.min()
+        nMax = int(np.ceil(R.max() / rMax))
+        outer = func(np.array([np.nextafter(rMax, np.inf)]))[0]
+
+        step = rMax / self.nCore
+        size = self.nCore * nMax + 2
+        r = step * np.arange(size)
+        r[0] = min(rMin, step)
+        values = func(r)
+
+        while True:
+            start = values[:-1].copy()
+            start[self.nCore] = outer
+            change = values[1:] - start
+            if name in self.checked:
+                break
+
+            mid = step * (np.arange(size - 1) + 0.5)
+            midValues = func(mid)
+            error = np.nanmax(np.abs(start + 0.5 * change - midValues))
+            scale = np.nanmax(values) - np.nanmin(values)
+            if error <= self.tolerance * scale or 2 * size > self.maxSize:
+                log.debug("Radial %s table: %d entries, spacing %.3f km, "
+                          "relative error %.2e", name, size, step,
+                          error / scale)
+                self.checked.add(name)
+                break
+
+            # Halve the spacing: the midpoints are the new entries
+            self.nCore *= 2
+            step = rMax / self.nCore
+            size = 2 * size - 2
+            refined = np.empty(size, values.dtype)
+            refined[0::2] = values[:size // 2]
+            refined[1::2] = midValues
+            if rMin >= step:
+                refined[0] = refined[1]
+            values = refined
+
+        covers = (min(rMin, step), step * (size - 1))
+        return covers, step, start.astype(R.dtype), change.astype(R.dtype)
+
+    def _evaluate(self, name, R):
+        """
+        Evaluate the profile method `name` at `R` from a table.
+        """
+        table = self.tables_.get(name)
+        if table is None or (table[0] is not R and
+                             not table[1][0] <= R.min() <= R.max() <=
+                             table[1][1]):
+            table = (R,) + self._table(name, R)
+            self.tables_[name] = table
+        R_, covers, step, start, change = table
+
+        if (self.weights_ is None or self.weights_[0] is not R or
+                self.weights_[1] != step):
+            x = R / step
+            lower = np.ceil(x) - 1
+            self.weights_ = (R, step, lower.astype(int), x - lower)
+        R_, step_, index, weight = self.weights_
+
+        return (start.take(index, mode='clip') +
+                weight * change.take(index, mode='clip'))
+
+    def pressure(self, R):
+        """
+        Pressure at radial distance `R`, interpolated from a table.
+
+        :param R: :class:`numpy.ndarray` of distance of grid from
+                  the TC centre.
+
+        :returns: Array of pressure values (Pa).
+        :rtype: :class:`numpy.ndarray`
+
+        """
+        return self._evaluate('pressure', R)
+
+    def velocity(self, R):
+        """
+        Gradient level wind speed at radial distance `R`,
+        interpolated from a table.
+
+        :param R: :class:`numpy.ndarray` of distance of grid from
+                  the TC centre.
+
+        :returns: Array of gradient level wind speed.
+        :rtype: :class:`numpy.ndarray`
+
+        """
+        return self._evaluate('velocity', R)
+
+    def vorticity(self, R):
+        """
+        Gradient level (relative) vorticity at radial distance `R`,
+        interpolated from a table.
+
+        :param R: :class:`numpy.ndarray` of distance of grid from
+                  the TC centre.
+
+        :returns: Array of gradient level (relative) vorticity.
+        :rtype: :class:`numpy.ndarray`
+
+        """
+        return self._evaluate('vorticity', R)
+
+
 class WindFieldModel(object):
 
     """
@@ -911,7 +1161,7 @@ class HubbertWindField(WindFieldModel):
         V = self.velocity(R)
 
         Km = .70
-        inflow = 25. * np.ones(np.shape(R))
+        inflow = 25. * np.ones_like(R)
         core = np.where(R < self.rMax)
         inflow[core] = 0
         inflow = inflow * np.pi / 180
@@ -951,7 +1201,7 @@ class McConochieWindField(WindFieldModel):
         """
         V = self.velocity(R)
 
-        inflow = 25. * np.ones(np.shape(R))
+        inflow = 25. * np.ones_like(R)
         mid = np.where(R < 1.2 * self.rMax)
         inflow[mid] = 10. + 75. * (R[mid] / self.rMax - 1.)
         inner = np.where(R < self.rMax)
@@ -966,7 +1216,7 @@ class McConochieWindField(WindFieldModel):
         Vsf = V + asym
 
         # Surface wind reduction factor:
-        swrf = 0.81 * np.ones(np.shape(Vsf))
+        swrf = 0.81 * np.ones_like(Vsf)
         low = np.where(Vsf >= 6)
         med = np.where(Vsf >= 19.5)
         high = np.where(Vsf >= 45)
@@ -1010,7 +1260,7 @@ class KepertWindField(WindFieldModel):
         K = 50.  # Diffusivity
         Cd = 0.002  # Constant drag coefficient
         
-        Vt = vFm * np.ones(V.shape)
+        Vt = vFm * np.ones_like(V)
         
         core = np.where(R > 4. * self.rMax)
         Vt[core] = vFm * np.exp(-((R[core] / self.rMax) - 4.) ** 2. )
@@ -1124,11 +1374,7 @@ def profileParams(name):
     """
     List of additional parameters required for a wind profile model.
     """
-    from inspect import getargspec
-    std = getargspec(WindProfileModel.__init__)[0]
-    new = getargspec(profile(name).__init__)[0]
-    params = [p for p in new if p not in std]
-    return params
+    return PROFILE_PARAMS[name]
 
 
 def field(name):
@@ -1143,11 +1389,18 @@ def fieldParams(name):
     """
     List of additional parameters required for a wind field model.
     """
+    return FIELD_PARAMS[name]
+
+
+def extraParams(base, cls):
+    """
+    List of the parameters of the constructor of `cls` that are not
+    parameters of the constructor of `base`.
+    """
     from inspect import getargspec
-    std = getargspec(WindFieldModel.__init__)[0]
-    new = getargspec(field(name).__init__)[0]
-    params = [p for p in new if p not in std]
-    return params
+    std = getargspec(base.__init__)[0]
+    new = getargspec(cls.__init__)[0]
+    return [p for p in new if p not in std]
 
 
 PROFILES = dict([(k.__name__.replace('WindProfile', '').lower(), k)
@@ -1155,3 +1408,11 @@ PROFILES = dict([(k.__name__.replace('WindProfile', '').lower(), k)
 
 FIELDS = dict([(k.__name__.replace('WindField', '').lower(), k)
                for k in allSubclasses(vars()['WindFieldModel'])])
+
+# The constructor parameters are resolved once, rather than on every
+# call to `profileParams` and `fieldParams`:
+PROFILE_PARAMS = dict([(name, extraParams(WindProfileModel, cls))
+                       for name, cls in PROFILES.items()])
+
+FIELD_PARAMS = dict([(name, extraParams(WindFieldModel, cls))
+                     for name, cls in FIELDS.items()])